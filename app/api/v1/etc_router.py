@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException
 
 from app.schemas import etc_schema
 from app.lib.validation_check import check_openai_api_key
+from app.langchain.chains import get_chain_pool_stats
 
 router = APIRouter(
     prefix="/api/v1/etc",
@@ -12,7 +13,7 @@ router = APIRouter(
 @router.post("/secret_key_validation", 
              description="openAI secret key를 확인하는 API입니다.")
 async def secret_key_validation(secret_key_schema: etc_schema.SecretKeyValidation):
-    api_key = check_openai_api_key(secret_key_schema.secretKey)
+    api_key = await check_openai_api_key(secret_key_schema.secretKey)
 
     if not api_key:
         raise HTTPException(status_code=404, detail="Invalid OpenAI API key.")
@@ -21,3 +22,9 @@ async def secret_key_validation(secret_key_schema: etc_schema.SecretKeyValidatio
         "message": "OpenAI API key is valid.", 
         "valid": True, 
         }
+
+
+@router.get("/llm-chain-pool", 
+            description="LLM 체인 풀의 크기와 hit/miss 횟수를 확인하는 API입니다.")
+async def llm_chain_pool_stats():
+    return get_chain_pool_stats()
@@ -1,4 +1,6 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, List
 
 from app.services import scenario_service
@@ -12,8 +14,8 @@ router = APIRouter(
 )
 
 
-def validate_request_data(secret_key: str, murderer_name: Optional[str] = None, living_characters: Optional[List[str]] = None):
-    api_key = check_openai_api_key(secret_key)
+async def validate_request_data(secret_key: str, murderer_name: Optional[str] = None, living_characters: Optional[List[str]] = None):
+    api_key = await check_openai_api_key(secret_key)
     if not api_key:
         raise HTTPException(status_code=404, detail="Invalid OpenAI API key.")
 
@@ -30,7 +32,7 @@ def validate_request_data(secret_key: str, murderer_name: Optional[str] = None,
              description="게임의 intro를 생성해 주는 API입니다.", 
              response_model=scenario_router_schema.GenerateIntroOutput)
 async def generate_intro(generator_intro_schema: scenario_router_schema.GenerateIntroInput):
-    api_key = validate_request_data(generator_intro_schema.secretKey)
+    api_key = await validate_request_data(generator_intro_schema.secretKey)
 
     prompt = f"\n"
     
@@ -50,7 +52,7 @@ async def generate_intro(generator_intro_schema: scenario_router_schema.Generate
 async def generate_victim(generate_victim_schema: scenario_router_schema.GenerateVictimInput):
     # previousStory 이용 안함
 
-    api_key = validate_request_data(generate_victim_schema.secretKey, 
+    api_key = await validate_request_data(generate_victim_schema.secretKey, 
                                     murderer_name = generate_victim_schema.murderer, 
                                     living_characters = generate_victim_schema.livingCharacters)
 
@@ -73,25 +75,24 @@ async def generate_victim(generate_victim_schema: scenario_router_schema.Generat
 async def generate_victim_backup_plan(generate_victim_schema: scenario_router_schema.GenerateVictimInput):
     # previousStory 이용 안함
 
-    api_key = validate_request_data(generate_victim_schema.secretKey, 
+    api_key = await validate_request_data(generate_victim_schema.secretKey, 
                                     murderer_name = generate_victim_schema.murderer, 
                                     living_characters = generate_victim_schema.livingCharacters)
 
-    # plan A
-    input_data_json, input_data_pydantic = scenario_service.generate_victim_input(generate_victim_schema)
-
-    answer_a, tokens_a, execution_time_a = generator.generate_victim(api_key, input_data_pydantic)
-
-    result_a = scenario_service.generate_victim_output(answer_a, input_data_pydantic, generate_victim_schema)
+    # plan A, plan B의 피해자를 미리 선택하고 두 체인을 동시에 실행
+    plan_inputs = scenario_service.generate_victim_plan_inputs(generate_victim_schema, plan_count=2)
+    if not plan_inputs:
+        raise HTTPException(status_code=404, detail="Not enough livingCharacters for secondary options.")
 
-    # plan B
-    generate_victim_schema.livingCharacters = [character for character in generate_victim_schema.livingCharacters if character.name != input_data_pydantic.information.victim]
-
-    input_data_json, input_data_pydantic = scenario_service.generate_victim_input(generate_victim_schema)
+    (plan_a_data, _, input_data_a), (plan_b_data, _, input_data_b) = plan_inputs
 
-    answer_b, tokens_b, execution_time_b = generator.generate_victim(api_key, input_data_pydantic)
+    (answer_a, tokens_a, execution_time_a), (answer_b, tokens_b, execution_time_b) = await asyncio.gather(
+        run_in_threadpool(generator.generate_victim, api_key, input_data_a),
+        run_in_threadpool(generator.generate_victim, api_key, input_data_b)
+    )
 
-    result_b = scenario_service.generate_victim_output(answer_b, input_data_pydantic, generate_victim_schema)
+    result_a = scenario_service.generate_victim_output(answer_a, input_data_a, plan_a_data)
+    result_b = scenario_service.generate_victim_output(answer_b, input_data_b, plan_b_data)
 
     # result
     tokens = {key: tokens_a.get(key, 0) + tokens_b.get(key, 0) for key in set(tokens_a) | set(tokens_b)}
@@ -113,7 +114,7 @@ async def generate_victim_backup_plan(generate_victim_schema: scenario_router_sc
 async def generate_final_words(generator_final_words_schema: scenario_router_schema.GenerateFinalWordsInput):
     # previousStory 이용 안함
 
-    api_key = validate_request_data(generator_final_words_schema.secretKey, 
+    api_key = await validate_request_data(generator_final_words_schema.secretKey, 
                                     murderer_name = generator_final_words_schema.murderer)
     
     if not scenario_service.get_character_info(generator_final_words_schema.murderer):
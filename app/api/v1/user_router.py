@@ -13,8 +13,8 @@ router = APIRouter(
 )
 
 
-def validate_request_data(secret_key: str, receiver_name: Optional[str] = None, npc_names: Optional[List[str]] = None):
-    api_key = check_openai_api_key(secret_key)
+async def validate_request_data(secret_key: str, receiver_name: Optional[str] = None, npc_names: Optional[List[str]] = None):
+    api_key = await check_openai_api_key(secret_key)
     if not api_key:
         raise HTTPException(status_code=404, detail="Invalid OpenAI API key.")
 
@@ -31,7 +31,7 @@ def validate_request_data(secret_key: str, receiver_name: Optional[str] = None,
              description="npc와 user간의 대화를 위한 API입니다.", 
              response_model=user_router_schema.ConversationUserOutput)
 async def conversation_with_user(conversation_user_schema: user_router_schema.ConversationUserInput):
-    api_key = validate_request_data(conversation_user_schema.secretKey, 
+    api_key = await validate_request_data(conversation_user_schema.secretKey, 
                                     receiver_name = conversation_user_schema.receiver.name)
     
     input_data_json, input_data_pydantic = user_service.conversation_with_user_input(conversation_user_schema)
@@ -51,7 +51,7 @@ async def conversation_between_npc(conversation_npc_schema: user_router_schema.C
     print(conversation_npc_schema.model_dump_json(indent=2))
     # chatDay, previousStory 이용 안함
 
-    api_key = validate_request_data(conversation_npc_schema.secretKey, 
+    api_key = await validate_request_data(conversation_npc_schema.secretKey, 
                                     npc_names = [conversation_npc_schema.npcName1.name, conversation_npc_schema.npcName2.name])
     
     input_data_json, input_data_pydantic = user_service.conversation_between_npc_input(conversation_npc_schema)
@@ -71,7 +71,7 @@ async def conversation_between_npc(conversation_npc_schema: user_router_schema.C
 async def conversation_between_npcs_each(conversation_npcs_each_schema: user_router_schema.ConversationNPCEachInput):
     # chatDay, previousStory 이용 안함
 
-    api_key = validate_request_data(conversation_npcs_each_schema.secretKey, 
+    api_key = await validate_request_data(conversation_npcs_each_schema.secretKey, 
                                     npc_names = [conversation_npcs_each_schema.npcName1.name, conversation_npcs_each_schema.npcName2.name])
     
     input_data_json, input_data_pydantic = user_service.conversation_between_npc_each_input(conversation_npcs_each_schema)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Request
 
 from app.schemas import game_schema 
 from app.services.game_service import GameService
+from app.utils.state_store import StaleStateError
 
 
 router = APIRouter(
@@ -15,13 +16,15 @@ router = APIRouter(
 async def generate_questions(request: Request, question_data: game_schema.QuestionRequest):
     game_service: GameService = request.app.state.game_service
     try:
-        questions = game_service.generate_npc_questions(
+        questions = await game_service.generate_npc_questions(
             question_data.gameNo, 
             question_data.npcName, 
             question_data.keyWord, 
             question_data.keyWordType
         )
         return {"questions": questions}
+    except StaleStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -33,7 +36,7 @@ async def generate_questions(request: Request, question_data: game_schema.Questi
 async def talk_to_npc(request: Request, answer_data: game_schema.AnswerRequest):
     game_service: GameService = request.app.state.game_service
     try:
-        response = game_service.talk_to_npc(
+        response = await game_service.talk_to_npc(
             answer_data.gameNo, 
             answer_data.npcName, 
             answer_data.questionIndex, 
@@ -41,7 +44,31 @@ async def talk_to_npc(request: Request, answer_data: game_schema.AnswerRequest):
             answer_data.keyWordType
         )
         return {"response": response}
+    except StaleStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# 무기/장소/생존 여부 조건으로 용의자를 필터링하는 라우터
+@router.post("/filter-suspects",
+            description="여러 무기와 장소, 생존 여부, 제외할 NPC 조건으로 용의자를 필터링하는 API 입니다.")
+async def filter_suspects(request: Request, filter_data: game_schema.SuspectFilterRequest):
+    game_service: GameService = request.app.state.game_service
+    try:
+        async with game_service.locks(filter_data.gameNo):
+            suspects = await game_service.run_sync(
+                game_service.filter_game_suspects_by,
+                filter_data.gameNo,
+                filter_data.weapons,
+                filter_data.locations,
+                filter_data.aliveOnly,
+                filter_data.excludedNpcs
+            )
+        return {"suspects": suspects}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
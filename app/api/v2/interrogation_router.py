@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Request, HTTPException
 
 from app.services.game_service import GameService
+from app.utils.state_store import StaleStateError
 
 router = APIRouter(
     prefix="/api/v2/interrogation",
@@ -31,7 +32,13 @@ class ConversationResponse(BaseModel):
             )
 async def new_interrogation(request: Request, input: NewInterRequest):
     game_service: GameService = request.app.state.game_service
-    game_service.new_interrogation(input.gameNo, input.npcName, input.weapon)
+    try:
+        async with game_service.locks(input.gameNo):
+            await game_service.run_sync(game_service.new_interrogation, input.gameNo, input.npcName, input.weapon)
+    except StaleStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {"message": "New interrogation started"}
 
@@ -42,7 +49,12 @@ async def new_interrogation(request: Request, input: NewInterRequest):
 async def interrogation(request: Request, input: ConversationRequest):
     game_service: GameService = request.app.state.game_service
     try:
-        response = game_service.generation_interrogation_response(input.gameNo, input.npcName, input.content)
-    except TypeError as e:
+        response = await game_service.generation_interrogation_response(input.gameNo, input.npcName, input.content)
+    except StaleStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (TypeError, AttributeError) as e:
+        # 취조를 시작하지 않은 상태 (game_state['interrogation']이 None)
         raise HTTPException(status_code=404, detail=f"interrogation not found: {e}")
     return response
\ No newline at end of file
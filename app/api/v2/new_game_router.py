@@ -1,7 +1,12 @@
+import json
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 
 from app.schemas import game_schema 
 from app.services.game_service import GameService
+from app.services.game_state import dumps
+from app.services.status_view import etag_matches
+from app.utils.state_store import StaleStateError
 
 
 router = APIRouter(
@@ -17,8 +22,25 @@ async def start_game(request: Request, game_data: game_schema.GameStartRequest):
     if game_data.language not in ["en", "ko"]:
         raise HTTPException(status_code=400, detail="Invalid language. Choose 'en' or 'ko'.")
     try:
-        game_state = game_service.initialize_new_game(game_data)
+        async with game_service.locks(game_data.gameNo):
+            game_state = await game_service.run_sync(game_service.initialize_new_game, game_data)
         return {"answer": game_state['first_blood']}
+    except StaleStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+# 여러 게임을 한 번에 시작하는 라우터
+@router.post("/start-batch", 
+            description="여러 게임을 한 번에 시작하는 API 입니다. 게임별 결과(answer 또는 error)를 요청 순서대로 반환합니다.")
+async def start_games(request: Request, batch: game_schema.GameStartBatchRequest):
+    game_service: GameService = request.app.state.game_service
+    shard = request.app.state.shard
+    try:
+        results = await game_service.initialize_new_games(batch.games, shard.owns if shard is not None else None)
+        return {"games": results}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -27,58 +49,138 @@ async def start_game(request: Request, game_data: game_schema.GameStartRequest):
 # 시나리오를 생성하는 라우터
 @router.post("/generate-scenario", 
             description="해당 게임의 상태에 따라 시나리오를 생성하는 API 입니다.")
-def generate_scenario(request: Request, game_data: game_schema.GameRequest):
+async def generate_scenario(request: Request, game_data: game_schema.GameRequest):
     game_service: GameService = request.app.state.game_service
     try:
-        scenario = game_service.generate_game_scenario(game_data.gameNo)
+        scenario = await game_service.generate_game_scenario(game_data.gameNo)
         return {"scenario": scenario}
+    except StaleStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 촌장의 편지를 생성하는 라우터
 @router.post("/generate-chief-letter", 
             description="해당 게임의 상태에 따라 촌장의 편지를 생성하는 API 입니다.")
-def generate_chief_letter(request: Request, game_data: game_schema.GameRequest):
+async def generate_chief_letter(request: Request, game_data: game_schema.GameRequest):
     game_service: GameService = request.app.state.game_service
     try:
-        chief_letter = game_service.generate_chief_letter(game_data.gameNo)
+        chief_letter = await game_service.generate_chief_letter(game_data.gameNo)
         return {"answer": chief_letter}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 게임 상태를 확인하는 라우터
 @router.post("/status", 
-            description="해당 게임의 상태를 확인하는 API 입니다.")
-def get_game_status(request: Request, game_data: game_schema.GameRequest):
+            description="해당 게임의 상태를 확인하는 API 입니다. 응답의 ETag를 If-None-Match로 보내면 상태가 바뀌지 않은 경우 304를 반환합니다.")
+async def get_game_status(request: Request, game_data: game_schema.GameRequest):
+    game_service: GameService = request.app.state.game_service
+    try:
+        # 게시된 상태만 읽으므로 게임 락을 잡지 않음 (다음 날 진행 중에도 바로 응답)
+        status_view = await game_service.run_sync(game_service.get_status_view, game_data.gameNo)
+        version, _, body = status_view.published()
+        etag = status_view.etag(game_data.gameNo, version)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(body, media_type="application/json", headers={"ETag": etag})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# 여러 게임의 상태를 한 번에 확인하는 라우터
+@router.post("/status-batch", 
+            description="여러 게임의 상태를 한 번에 확인하는 API 입니다. 게임별 결과(status 또는 error)를 요청 순서대로 반환합니다.")
+async def get_game_statuses(request: Request, batch: game_schema.GameBatchRequest):
+    game_service: GameService = request.app.state.game_service
+    shard = request.app.state.shard
+    try:
+        results = await game_service.get_status_bodies(batch.gameNos, shard.owns if shard is not None else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # 캐시된 게임별 상태 JSON을 다시 인코딩하지 않고 이어 붙임
+    games = [
+        b'{"gameNo":%d,"status":%s}' % (gameNo, body) if error is None else dumps({"gameNo": gameNo, "error": error})
+        for gameNo, body, error in results
+    ]
+    return Response(b'{"games":[' + b",".join(games) + b"]}", media_type="application/json")
+
+# 마지막으로 받은 버전 이후 바뀐 게임 상태만 확인하는 라우터
+@router.post("/status/changes", 
+            description="since 버전 이후 바뀐 생존 여부, 새 살인, 알리바이, 목격자 정보만 반환하는 API 입니다. since가 너무 오래되었으면 전체 상태(full)를 반환합니다.")
+async def get_status_changes(request: Request, game_data: game_schema.GameRequest, since: int):
     game_service: GameService = request.app.state.game_service
     try:
-        status = game_service.get_game_status(game_data.gameNo)
-        return status
+        changes = await game_service.run_sync(game_service.get_status_changes, game_data.gameNo, since)
+        return Response(dumps(changes), media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 # 게임 진행을 다음 날로 넘기는 라우터
 @router.post("/next_day", 
             description="해당 게임의 상태를 다음 날로 넘기는 API 입니다.")
-def next_day(request: Request, game_data: game_schema.NextDayRequest):
+async def next_day(request: Request, game_data: game_schema.NextDayRequest):
     game_service: GameService = request.app.state.game_service
     try:
-        result = game_service.proceed_to_next_day(game_data.gameNo, game_data.livingCharacters)
+        result = await game_service.proceed_to_next_day(game_data.gameNo, game_data.livingCharacters)
         return result
+    except StaleStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 게임 진행 상황을 저장하는 라우터
-# @router.post("/save-progress", 
-#             description="해당 게임의 상태를 저장하는 API 입니다.")
-def save_progress(request: Request, game_data: game_schema.GameRequest):
+@router.post("/save-progress", 
+            description="해당 게임의 상태를 스냅샷 파일로 저장하는 API 입니다. 서버가 재시작되어도 첫 접근 시 스냅샷에서 복원됩니다.")
+async def save_progress(request: Request, game_data: game_schema.GameRequest):
     game_service: GameService = request.app.state.game_service
     try:
-        game_state = game_service.get_game_status(game_data.gameNo)
-        result = game_service.save_game_progress(game_data.gameNo, game_state)
+        async with game_service.locks(game_data.gameNo):
+            result = await game_service.run_sync(game_service.save_game_progress, game_data.gameNo)
         return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 모든 게임을 스냅샷으로 저장하는 라우터
+@router.post("/snapshot-all", 
+            description="메모리에 있는 모든 게임의 상태를 스냅샷 파일로 저장하는 API 입니다.")
+async def snapshot_all(request: Request):
+    game_service: GameService = request.app.state.game_service
+    try:
+        return await game_service.snapshot_all()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 스냅샷에서 모든 게임을 복원하는 라우터
+@router.post("/restore-all", 
+            description="스냅샷 파일이 있는 모든 게임을 미리 메모리로 복원하는 API 입니다.")
+async def restore_all(request: Request):
+    game_service: GameService = request.app.state.game_service
+    try:
+        return await game_service.restore_all()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 샤드 재분배 시 담당하지 않게 된 게임을 넘기는 라우터 (샤드 디스패처가 호출)
+@router.post("/shard-handoff", 
+            description="워커 목록이 바뀌었을 때 이 워커가 더 이상 담당하지 않는 게임을 스냅샷으로 넘기는 API 입니다.")
+async def shard_handoff(request: Request, handoff: game_schema.ShardHandoffRequest):
+    game_service: GameService = request.app.state.game_service
+    shard = request.app.state.shard
+    if shard is None:
+        raise HTTPException(status_code=400, detail="Sharding is not enabled (set GAME_SHARD_NODES)")
+    try:
+        shard.update(handoff.nodes)
+        moved = await game_service.hand_off(shard.owns)
+        return {"moved": moved, "games": len(game_service.sessions)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -88,22 +190,54 @@ def save_progress(request: Request, game_data: game_schema.GameRequest):
 async def generate_alibis_and_witness(request: Request, game_data: game_schema.GameRequest):
     game_service: GameService = request.app.state.game_service
     try:
-        alibis_and_witness = game_service.generate_alibis_and_witness(game_data.gameNo)
+        alibis_and_witness = await game_service.generate_alibis_and_witness(game_data.gameNo)
         return alibis_and_witness
+    except StaleStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# 알리바이 생성 방식별 통계를 확인하는 라우터
+@router.get("/alibi-stats", 
+            description="알리바이 생성 방식(parallel/batch)별 요청 수, 토큰 수, 지연 시간을 확인하는 API입니다.")
+def get_alibi_generation_stats(request: Request):
+    game_service: GameService = request.app.state.game_service
+    return game_service.get_alibi_generation_stats()
+
+# 게임 세션 수와 제거 횟수를 확인하는 라우터
+@router.get("/session-stats", 
+            description="메모리에 유지 중인 게임 세션 수와 유휴 시간/최대 개수 초과로 제거된 세션 수를 확인하는 API입니다.")
+def get_session_stats(request: Request):
+    game_service: GameService = request.app.state.game_service
+    return game_service.get_session_stats()
+
 # 게임을 종료하고 편지를 생성하는 라우터
 @router.post("/end_game", 
             description="게임을 종료하고 결과에 따른 편지를 생성하는 API입니다.")
 async def end_game(request: Request, game_data: game_schema.GameEndRequest):
     game_service: GameService = request.app.state.game_service
     try:
-        result = game_service.end_game(game_data.gameNo, game_data.gameResult)
+        result = await game_service.end_game(game_data.gameNo, game_data.gameResult)
         return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+# 게임을 종료하고 완성되는 편지부터 NDJSON으로 스트리밍하는 라우터
+@router.post("/end_game/stream", 
+            description="게임을 종료하고 결과에 따른 편지를 완성되는 순서대로 NDJSON으로 스트리밍하는 API입니다.")
+async def end_game_stream(request: Request, game_data: game_schema.GameEndRequest):
+    game_service: GameService = request.app.state.game_service
+    try:
+        events = await game_service.run_sync(game_service.stream_end_game, game_data.gameNo, game_data.gameResult)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def ndjson():
+        async for event in events:
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
@@ -0,0 +1,411 @@
+"""
+Game-affinity sharding across worker processes.
+
+Every gameNo is owned by exactly one worker, chosen on a consistent hash ring
+(app.utils.hash_ring) of the worker URLs, so a game's state stays in that
+worker's memory for the whole game.
+
+    GAME_SHARD_NODES: comma separated worker base URLs (the ring; unset disables sharding)
+    GAME_SHARD_SELF: this worker's base URL (one of GAME_SHARD_NODES)
+    GAME_SHARD_REPLICAS: virtual nodes per worker on the ring
+
+Routing:
+    - ShardDispatcher is a small ASGI front that forwards /api/v2/* requests to
+      the owning worker (other requests round-robin) and streams the response back.
+      Batch requests (start-batch, status-batch) are split by owner, sent to the
+      workers concurrently and merged back in request order.
+    - ShardAffinityMiddleware runs in each worker. It reads the gameNo from the
+      X-Game-No header (set by the dispatcher, or by a load balancer/client that
+      hashes on it) or from the JSON body, answers 421 with the owner in the
+      X-Game-Shard header when the game belongs to another worker, and adds
+      X-Game-Shard to every game response so a load balancer can pin the game.
+
+Adding or removing a worker (POST /shards on the dispatcher) pauses forwarding,
+asks every worker to hand off the games it no longer owns (snapshot, then drop
+from memory; the new owner restores them on first access, see
+GameService.hand_off), switches the ring and resumes.
+
+Run N workers behind a dispatcher:
+    LLM_PROVIDER=stub python -m app.core.sharding --workers 4 --port 7777
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.utils.hash_ring import DEFAULT_REPLICAS, HashRing
+
+from app.core.logger_config import setup_logger
+logger = setup_logger()
+
+GAME_SHARD_NODES = os.environ.get("GAME_SHARD_NODES", "")
+GAME_SHARD_SELF = os.environ.get("GAME_SHARD_SELF", "")
+GAME_SHARD_REPLICAS = int(os.environ.get("GAME_SHARD_REPLICAS", DEFAULT_REPLICAS))
+
+GAME_NO_HEADER = b"x-game-no"
+SHARD_HEADER = b"x-game-shard"
+# 요청과 응답을 전달할 때 다시 계산되거나 연결마다 다른 헤더
+HOP_BY_HOP_HEADERS = {"host", "connection", "keep-alive", "transfer-encoding", "content-length", "upgrade"}
+# 담당 워커별로 나눠서 전달하는 배치 요청 (경로 -> 게임 목록 필드)
+BATCH_PATHS = {"/api/v2/new-game/start-batch": "games", "/api/v2/new-game/status-batch": "gameNos"}
+
+
+def parse_nodes(value):
+    return [node.strip().rstrip("/") for node in value.split(",") if node.strip()]
+
+
+class ShardConfig:
+    """
+    This worker's view of the ring. update() is called by the hand-off
+    endpoint when workers are added or removed.
+    """
+
+    def __init__(self, self_node, nodes, replicas=GAME_SHARD_REPLICAS):
+        self.self_node = self_node.rstrip("/")
+        self.replicas = replicas
+        self.ring = HashRing(nodes, replicas)
+
+    def update(self, nodes):
+        self.ring = HashRing(nodes, self.replicas)
+
+    def owner(self, game_no):
+        return self.ring.node_for(game_no)
+
+    def owns(self, game_no):
+        return self.owner(game_no) == self.self_node
+
+
+def create_shard_config():
+    if not GAME_SHARD_NODES:
+        return None
+    nodes = parse_nodes(GAME_SHARD_NODES)
+    if GAME_SHARD_SELF.rstrip("/") not in nodes:
+        raise ValueError("GAME_SHARD_SELF must be one of GAME_SHARD_NODES")
+    return ShardConfig(GAME_SHARD_SELF, nodes)
+
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def replay_body(body, receive):
+    sent = False
+
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+# 헤더를 우선 사용하고, 없으면 JSON 본문의 gameNo를 사용
+def game_no_from(headers, body):
+    for name, value in headers:
+        if name.lower() == GAME_NO_HEADER:
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    if not body:
+        return None
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    game_no = data.get("gameNo") if isinstance(data, dict) else None
+    return game_no if isinstance(game_no, int) else None
+
+
+async def send_json(send, status, content, headers=()):
+    body = json.dumps(content, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class ShardAffinityMiddleware:
+    def __init__(self, app, shard: ShardConfig):
+        self.app = app
+        self.shard = shard
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/v2/") or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        game_no = game_no_from(scope["headers"], b"")
+        if game_no is None:
+            body = await read_body(receive)
+            receive = replay_body(body, receive)
+            game_no = game_no_from((), body)
+        if game_no is None:
+            await self.app(scope, receive, send)
+            return
+
+        owner = self.shard.owner(game_no)
+        if owner != self.shard.self_node:
+            await send_json(send, 421, {"detail": f"Game {game_no} is owned by {owner}", "owner": owner},
+                            [(SHARD_HEADER, owner.encode())])
+            return
+
+        async def send_with_shard(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (SHARD_HEADER, owner.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_shard)
+
+
+class ShardDispatcher:
+    """
+    ASGI front that forwards each game's requests to its owning worker.
+
+    GET /shards returns the ring; POST /shards {"add": url} or {"remove": url}
+    changes it (the new worker must already be running). Worker processes
+    passed as workers are stopped when the dispatcher shuts down.
+    """
+
+    def __init__(self, nodes, replicas=GAME_SHARD_REPLICAS, timeout=120.0, workers=()):
+        self.ring = HashRing(nodes, replicas)
+        self.workers = list(workers)
+        self.replicas = replicas
+        self.client = httpx.AsyncClient(timeout=timeout, limits=httpx.Limits(max_connections=1000, max_keepalive_connections=200))
+        self._next_node = itertools.cycle(list(self.ring.nodes))
+        # 재분배 중에는 새 요청을 멈추고 진행 중인 요청이 끝나기를 기다림
+        self._open = asyncio.Event()
+        self._open.set()
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.forwarded = 0
+        self.misdirected = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        if scope["path"] == "/shards":
+            await self._admin(scope, receive, send)
+            return
+
+        body = await read_body(receive)
+        await self._open.wait()
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            if scope["path"] in BATCH_PATHS and scope["method"] == "POST":
+                await self._forward_batch(scope, body, send)
+            else:
+                await self._forward(scope, body, send)
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    async def _forward(self, scope, body, send):
+        game_no = game_no_from(scope["headers"], body) if scope["path"].startswith("/api/v2/") else None
+        node = self.ring.node_for(game_no) if game_no is not None else next(self._next_node)
+        headers = [(name, value) for name, value in scope["headers"] if name.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS]
+        if game_no is not None:
+            headers.append((GAME_NO_HEADER, str(game_no).encode()))
+        url = node + scope["path"] + ("?" + scope["query_string"].decode("latin-1") if scope["query_string"] else "")
+        request = self.client.build_request(scope["method"], url, headers=headers, content=body)
+        try:
+            response = await self.client.send(request, stream=True)
+        except httpx.HTTPError as e:
+            logger.error(f"Shard {node} unavailable: {e}")
+            await send_json(send, 502, {"detail": f"Shard {node} unavailable"})
+            return
+        try:
+            if response.status_code == 421:
+                self.misdirected += 1
+            self.forwarded += 1
+            response_headers = [
+                (name, value) for name, value in response.headers.raw
+                if name.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS
+            ]
+            await send({"type": "http.response.start", "status": response.status_code, "headers": response_headers})
+            # NDJSON 스트리밍 응답도 받은 순서대로 바로 전달
+            async for chunk in response.aiter_raw():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await response.aclose()
+
+    async def _forward_batch(self, scope, body, send):
+        key = BATCH_PATHS[scope["path"]]
+        try:
+            items = json.loads(body)[key]
+            game_nos = [item.get("gameNo", 0) if isinstance(item, dict) else item for item in items]
+            groups = {}
+            for index, game_no in enumerate(game_nos):
+                groups.setdefault(self.ring.node_for(game_no), []).append(index)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # 형식이 잘못된 요청은 그대로 전달해 워커가 검증 오류를 반환하게 함
+            await self._forward(scope, body, send)
+            return
+
+        results = [None] * len(items)
+
+        async def forward_group(node, indices):
+            try:
+                response = await self.client.post(node + scope["path"], json={key: [items[index] for index in indices]})
+                response.raise_for_status()
+                games = response.json()["games"]
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                logger.error(f"Shard {node} failed a batch of {len(indices)} games: {e}")
+                games = [{"gameNo": game_nos[index], "error": f"Shard {node} failed: {e}"} for index in indices]
+            for index, game in zip(indices, games):
+                results[index] = game
+
+        await asyncio.gather(*(forward_group(node, indices) for node, indices in groups.items()))
+        self.forwarded += len(groups)
+        await send_json(send, 200, {"games": results})
+
+    async def _admin(self, scope, receive, send):
+        if scope["method"] == "GET":
+            await send_json(send, 200, self.stats())
+            return
+        try:
+            change = json.loads(await read_body(receive) or b"{}")
+            if "add" in change:
+                nodes = self.ring.nodes + [change["add"].rstrip("/")]
+            elif "remove" in change:
+                nodes = [node for node in self.ring.nodes if node != change["remove"].rstrip("/")]
+            else:
+                raise ValueError('Expected {"add": url} or {"remove": url}')
+            if not nodes:
+                raise ValueError("At least one shard is required")
+            result = await self.rebalance(nodes)
+        except ValueError as e:
+            await send_json(send, 400, {"detail": str(e)})
+            return
+        except httpx.HTTPError as e:
+            await send_json(send, 502, {"detail": f"Hand-off failed: {e}"})
+            return
+        await send_json(send, 200, result)
+
+    async def rebalance(self, nodes):
+        start = time.perf_counter()
+        old_nodes = list(self.ring.nodes)
+        self._open.clear()
+        try:
+            await self._idle.wait()
+            moved = {}
+            # 기존 워커는 담당하지 않게 된 게임을 넘기고, 새 워커는 링만 갱신
+            for node in dict.fromkeys(old_nodes + nodes):
+                response = await self.client.post(f"{node}/api/v2/new-game/shard-handoff", json={"nodes": nodes})
+                response.raise_for_status()
+                moved[node] = response.json()["moved"]
+            self.ring = HashRing(nodes, self.replicas)
+            self._next_node = itertools.cycle(list(nodes))
+        finally:
+            self._open.set()
+        logger.info(f"Shards {old_nodes} -> {nodes}, moved {moved}")
+        return {"nodes": nodes, "moved": moved, "seconds": time.perf_counter() - start}
+
+    def stats(self):
+        return {"nodes": list(self.ring.nodes), "forwarded": self.forwarded, "misdirected": self.misdirected}
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.client.aclose()
+                # uvicorn은 종료 후 받은 시그널을 다시 발생시키므로 여기서 워커를 정리
+                await asyncio.to_thread(stop_workers, self.workers)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def start_worker(node, nodes, index, env=None):
+    """
+    Starts one uvicorn worker (app.main:app) for node. Workers share the
+    snapshot directory and, when GAME_JOURNAL_PATH is set, keep one journal each.
+    """
+    worker_env = {**os.environ, **(env or {}), "GAME_SHARD_NODES": ",".join(nodes), "GAME_SHARD_SELF": node}
+    # 저장소가 없으면 게임을 넘기기 위해 공유 스냅샷 디렉터리가 필요
+    snapshot_dir = worker_env.get("GAME_SNAPSHOT_DIR") or ("" if worker_env.get("GAME_STATE_STORE") else "snapshots")
+    worker_env["GAME_SNAPSHOT_DIR"] = snapshot_dir
+    # 저널을 사용하면 워커마다 따로 기록 (journal.log -> journal-0.log, ...)
+    journal_path = worker_env.get("GAME_JOURNAL_PATH")
+    if journal_path:
+        root, extension = os.path.splitext(journal_path)
+        worker_env["GAME_JOURNAL_PATH"] = f"{root}-{index}{extension}"
+    port = node.rsplit(":", 1)[1]
+    host = node.split("//", 1)[1].rsplit(":", 1)[0]
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", host, "--port", port, "--log-level", "warning"],
+        env=worker_env,
+    )
+
+
+def start_workers(count, host="127.0.0.1", base_port=7780, env=None):
+    nodes = [f"http://{host}:{base_port + index}" for index in range(count)]
+    return nodes, [start_worker(node, nodes, index, env) for index, node in enumerate(nodes)]
+
+
+def wait_until_ready(urls, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    for url in urls:
+        while True:
+            try:
+                if httpx.get(f"{url}/openapi.json", timeout=2).status_code < 500:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{url} did not start")
+            time.sleep(0.2)
+
+
+def stop_workers(processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0", help="dispatcher host")
+    parser.add_argument("--port", type=int, default=7777, help="dispatcher port")
+    parser.add_argument("--worker-port", type=int, default=7780, help="port of the first worker")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    nodes, processes = start_workers(args.workers, base_port=args.worker_port)
+    try:
+        wait_until_ready(nodes)
+        uvicorn.run(ShardDispatcher(nodes, workers=processes), host=args.host, port=args.port, log_level="warning")
+    finally:
+        stop_workers(processes)
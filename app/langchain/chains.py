@@ -1,14 +1,107 @@
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+
 from langchain.chains import LLMChain
 from langchain_openai import ChatOpenAI
 
+from app.utils.llm_backend import get_llm_backend, get_sync_http_client
+
 MODEL = "gpt-4o"
 # MODEL = "gpt-4-1106-preview"
 
+# 재사용할 LLM 체인 최대 개수 (LRU로 제거)
+CHAIN_POOL_SIZE = int(os.environ.get("LLM_CHAIN_POOL_SIZE", 64))
+# 체인 실행 내용을 stdout에 출력할지 여부 (디버깅용)
+CHAIN_VERBOSE = os.environ.get("LLM_CHAIN_VERBOSE", "false").lower() == "true"
+
+
+class LLMChainPool:
+    """
+    (API 키 해시, 프롬프트 템플릿, 모델, LLM 백엔드) 별로 ChatOpenAI 클라이언트와 LLMChain을 재사용하는 LRU 풀.
+
+    같은 키로 들어오는 요청은 이미 만들어진 체인과 HTTP 커넥션을 재사용하므로
+    요청마다 클라이언트 생성과 TLS 연결 비용을 지불하지 않습니다.
+    """
+
+    def __init__(self, max_size=CHAIN_POOL_SIZE):
+        self.max_size = max_size
+        self._chains = OrderedDict()
+        self._prompt_hashes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, key, prompt, model, base_url=None):
+        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        return key_hash, self.prompt_fingerprint(prompt), model, base_url
+
+    # 프롬프트 템플릿 내용의 해시 (프롬프트 객체별로 캐시, 객체를 함께 보관하여 id 재사용 방지)
+    def prompt_fingerprint(self, prompt):
+        cached = self._prompt_hashes.get(id(prompt))
+        if cached is not None and cached[0] is prompt:
+            return cached[1]
+        prompt_hash = hashlib.sha256(repr(prompt).encode()).hexdigest()
+        with self._lock:
+            if len(self._prompt_hashes) >= 4 * self.max_size:
+                self._prompt_hashes.clear()
+            self._prompt_hashes[id(prompt)] = (prompt, prompt_hash)
+        return prompt_hash
+
+    def get(self, key, prompt, model=MODEL):
+        backend = get_llm_backend()
+        pool_key = self.make_key(key, prompt, model, backend.base_url)
+        with self._lock:
+            chain = self._chains.get(pool_key)
+            if chain is not None:
+                self._chains.move_to_end(pool_key)
+                self.hits += 1
+                return chain
+            self.misses += 1
+
+        # 체인 생성은 락 밖에서 수행하고, 동시에 만들어진 경우 먼저 등록된 체인을 사용
+        llm = ChatOpenAI(
+            model=model,
+            openai_api_key=key,
+            openai_api_base=backend.base_url,
+            http_client=get_sync_http_client(),
+        )
+        chain = LLMChain(
+            prompt=prompt,
+            llm=llm,
+            verbose=CHAIN_VERBOSE,
+        )
+        with self._lock:
+            chain = self._chains.setdefault(pool_key, chain)
+            self._chains.move_to_end(pool_key)
+            while len(self._chains) > self.max_size:
+                self._chains.popitem(last=False)
+                self.evictions += 1
+        return chain
+
+    def clear(self):
+        with self._lock:
+            self._chains.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._chains),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+chain_pool = LLMChainPool()
+
 
 def define_llm_chain(key, prompt):
-    llm = ChatOpenAI(model=MODEL, openai_api_key=key)
-    return LLMChain(
-        prompt=prompt,
-        llm=llm,
-        verbose=True,
-    )
\ No newline at end of file
+    return chain_pool.get(key, prompt)
+
+
+def get_chain_pool_stats():
+    return chain_pool.stats()
@@ -1,7 +1,9 @@
 from langchain_community.callbacks import get_openai_callback
+import openai
 import time
 
 from app.lib import const
+from app.lib.validation_check import invalidate_openai_api_key
 
 
 def execute_conversation(chain_function, format_check_function, schema, inputs):
@@ -38,6 +40,11 @@ def execute_conversation(chain_function, format_check_function, schema, inputs):
             
             if answer:
                 return answer, tokens, execution_time
+        except openai.AuthenticationError:
+            # 키가 폐기된 경우 검증 캐시를 지우고 재시도하지 않음
+            print("Authentication with OpenAI failed, invalidating cached key validation.")
+            invalidate_openai_api_key(chain_function.llm.openai_api_key.get_secret_value())
+            break
         except:
             print("#"*10 + "I got Error...Try again!" + "#"*10)
             retry_attempts += 1
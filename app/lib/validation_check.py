@@ -1,7 +1,15 @@
+import asyncio
 import openai
+from collections import OrderedDict
 from pathlib import Path
 import os, json, dotenv
+import hashlib
+import hmac
 import re
+import threading
+import time
+
+from app.utils.llm_backend import get_llm_backend, get_sync_http_client
 
 env_path = Path('.') / '.env'
 if env_path.exists():
@@ -10,6 +18,19 @@ if env_path.exists():
 MY_KEY = os.getenv("MY_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# API 키 검증 결과 캐시 설정 (초 단위)
+KEY_VALIDATION_TTL = float(os.getenv("KEY_VALIDATION_TTL", 600))
+KEY_VALIDATION_NEGATIVE_TTL = float(os.getenv("KEY_VALIDATION_NEGATIVE_TTL", 30))
+KEY_VALIDATION_CACHE_SIZE = int(os.getenv("KEY_VALIDATION_CACHE_SIZE", 1024))
+# 캐시 키는 salt를 넣은 해시로만 저장 (원본 키는 저장하지 않음)
+KEY_VALIDATION_SALT = os.getenv("KEY_VALIDATION_SALT", "").encode() or os.urandom(32)
+
+_validation_cache = OrderedDict()
+# 검증 중인 키 (key hash -> asyncio.Future, 이벤트 루프 안에서만 사용)
+_validation_in_flight = {}
+# 캐시는 스레드에서 실행되는 invalidate_openai_api_key와도 공유
+_validation_lock = threading.Lock()
+
 
 def remove_zero_width_spaces(text):
     """
@@ -43,10 +64,45 @@ def response_format(answer):
     except:
         return None
 
-def check_openai_api_key(input_api_key):
+def hash_api_key(api_key):
+    """
+    Returns a salted hash of the API key used as the validation cache key.
+    """
+    return hmac.new(KEY_VALIDATION_SALT, api_key.encode("utf-8", "surrogatepass"), hashlib.sha256).hexdigest()
+
+
+def validate_openai_api_key(api_key):
+    """
+    Validates the API key by listing OpenAI models.
+    
+    Returns:
+        bool or None: True if valid, False if rejected, None if the result should not be cached.
+    """
+    try:
+        # Attempt to use the API key to list OpenAI models as a validation step
+        openai.OpenAI(
+            api_key=api_key,
+            base_url=get_llm_backend().base_url,
+            http_client=get_sync_http_client(),
+        ).models.list()
+        return True
+    except openai.AuthenticationError:
+        return False  # Authentication with OpenAI failed
+    except openai.APIConnectionError:
+        return None  # Connection to OpenAI API failed (일시적인 오류이므로 캐시하지 않음)
+    except UnicodeEncodeError:
+        return False  # Issue with encoding the API key
+
+
+async def check_openai_api_key(input_api_key):
     """
     Validates an input API key against the stored API key or attempts to use it with OpenAI.
     
+    Results are cached by a salted hash of the key (KEY_VALIDATION_TTL for valid keys,
+    KEY_VALIDATION_NEGATIVE_TTL for rejected keys). The OpenAI call runs in a worker
+    thread, and concurrent validations of the same key await a single call (and
+    get its exception if it fails, or validate again if it is cancelled).
+    
     Args:
         input_api_key (str): The API key to validate.
     
@@ -59,13 +115,60 @@ def check_openai_api_key(input_api_key):
     else:
         api_key = input_api_key
 
+    key_hash = hash_api_key(api_key)
+    now = time.monotonic()
+    with _validation_lock:
+        cached = _validation_cache.get(key_hash)
+        if cached is not None and cached[1] > now:
+            _validation_cache.move_to_end(key_hash)
+            return api_key if cached[0] else None
+
+    # 같은 키를 검증 중인 요청이 있으면 그 결과를 기다림
+    # (검증이 실패하면 같은 예외를 받고, 검증한 요청이 취소되었으면 직접 다시 검증)
+    while True:
+        future = _validation_in_flight.get(key_hash)
+        if future is None:
+            break
+        try:
+            return api_key if await asyncio.shield(future) else None
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+
+    future = _validation_in_flight[key_hash] = asyncio.get_running_loop().create_future()
     try:
-        # Attempt to use the API key to list OpenAI models as a validation step
-        openai.OpenAI(api_key=api_key).models.list()
-        return api_key  # Return the valid API key
-    except openai.AuthenticationError:
-        return None  # Authentication with OpenAI failed
-    except openai.APIConnectionError:
-        return None  # Connection to OpenAI API failed
-    except UnicodeEncodeError:
-        return None  # Issue with encoding the API key
+        valid = await asyncio.to_thread(validate_openai_api_key, api_key)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # 기다리는 요청이 없어도 "exception was never retrieved" 경고가 남지 않도록 함
+        future.exception()
+        raise
+    else:
+        with _validation_lock:
+            ttl = KEY_VALIDATION_TTL if valid else KEY_VALIDATION_NEGATIVE_TTL
+            _validation_cache[key_hash] = (valid, time.monotonic() + ttl)
+            _validation_cache.move_to_end(key_hash)
+            while len(_validation_cache) > KEY_VALIDATION_CACHE_SIZE:
+                _validation_cache.popitem(last=False)
+        future.set_result(valid)
+    finally:
+        del _validation_in_flight[key_hash]
+
+    return api_key if valid else None
+
+
+def invalidate_openai_api_key(api_key):
+    """
+    Removes the cached validation result of the API key
+    (e.g. when a downstream OpenAI call fails with an authentication error).
+    """
+    with _validation_lock:
+        _validation_cache.pop(hash_api_key(api_key), None)
+
+
+def clear_key_validation_cache():
+    with _validation_lock:
+        _validation_cache.clear()
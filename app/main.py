@@ -3,8 +3,15 @@ from contextlib import asynccontextmanager
 
 from app.api.v1 import user_router, scenario_router, etc_router
 from app.api.v2 import in_game_router, new_game_router, interrogation_router
+from app.core.sharding import ShardAffinityMiddleware, create_shard_config
 from app.core.swagger_config import SwaggerConfig
+from app.services.game_journal import create_game_journal
 from app.services.game_service import GameService
+from app.utils.catalog import get_catalog
+from app.utils.gpt_helper import close_client
+
+from app.core.logger_config import setup_logger
+logger = setup_logger()
 
 swagger_config = SwaggerConfig()
 config = swagger_config.get_config()
@@ -12,7 +19,25 @@ config = swagger_config.get_config()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.game_service = game_service
+    # 게임 카탈로그를 시작 시점에 한 번 읽어 둠
+    get_catalog()
+    # 비정상 종료로 스냅샷에 반영되지 않은 변경을 저널에서 복구
+    if game_service.journal is not None:
+        result = game_service.recover_journal()
+        logger.info(f"Recovered {result['games']} games from the journal in {result['seconds']:.2f}s")
     yield
+    # 진행 중인 저널 압축이 끝난 뒤
+    if game_service.compaction is not None:
+        await game_service.compaction
+    # 메모리에 있는 게임을 스냅샷으로 남겨 재시작 후 첫 접근 시 복원
+    if game_service.snapshots is not None:
+        result = await game_service.snapshot_all()
+        logger.info(f"Saved {result['games']} game snapshots ({result['bytes']} bytes) in {result['seconds']:.2f}s")
+    # 모든 게임이 스냅샷에 저장되었으므로 저널을 비움
+    if game_service.journal is not None:
+        game_service.journal.truncate()
+        game_service.journal.close()
+    await close_client()
 
 app = FastAPI(
     title=config["title"],
@@ -32,8 +57,14 @@ app.include_router(new_game_router.router)
 
 app.include_router(interrogation_router.router)
 
+# 샤드 모드: 이 워커가 담당하는 gameNo의 요청만 처리 (GAME_SHARD_NODES가 없으면 사용하지 않음)
+shard = create_shard_config()
+if shard is not None:
+    app.add_middleware(ShardAffinityMiddleware, shard=shard)
+app.state.shard = shard
+
 # 전역 GameService 인스턴스 생성
-game_service = GameService()
+game_service = GameService(journal=create_game_journal())
 
 # 모든 라우터에서 game_service에 접근할 수 있도록 설정
 app.state.game_service = game_service
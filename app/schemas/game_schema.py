@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Dict
+from pydantic import BaseModel, field_validator
+from typing import List, Dict, Any
 
 class NPC(BaseModel):
     name: str
@@ -90,6 +90,13 @@ class AnswerRequest(BaseModel):
     keyWord: str
     keyWordType: str = "weapon"
 
+class SuspectFilterRequest(BaseModel):
+    gameNo: int
+    weapons: List[str] = []
+    locations: List[str] = []
+    aliveOnly: bool = True
+    excludedNpcs: List[str] = []
+
 class LivingNPCInfo(BaseModel):
     name: str
     job: str
@@ -147,4 +154,26 @@ class NextDayRequest(BaseModel):
 
 class GameEndRequest(BaseModel):
     gameNo: int
-    gameResult: str = "WIN"
\ No newline at end of file
+    gameResult: str = "WIN"
+
+# 여러 게임을 한 번에 시작하는 요청
+class GameStartBatchRequest(BaseModel):
+    games: List[GameStartRequest]
+
+# 여러 게임의 상태를 한 번에 확인하는 요청
+class GameBatchRequest(BaseModel):
+    gameNos: List[int]
+
+# 샤드 재분배 요청 (변경 후 전체 워커 URL 목록)
+class ShardHandoffRequest(BaseModel):
+    nodes: List[str]
+
+# 배치 알리바이 생성 응답 스키마 (NPC 이름 -> 알리바이, 목격자는 목격 진술)
+class BatchAlibisSchema(BaseModel):
+    alibis: Dict[str, Any]
+
+    # 비어 있거나 문자열이 아닌 항목은 버리고 개별 재생성 대상으로 남김
+    @field_validator("alibis")
+    @classmethod
+    def drop_malformed_entries(cls, alibis):
+        return {name: alibi.strip() for name, alibi in alibis.items() if isinstance(alibi, str) and alibi.strip()}
@@ -0,0 +1,331 @@
+"""
+Append-only journal of game-state mutations (crash recovery between snapshots).
+
+    GAME_JOURNAL_PATH: journal file ("" by default: the journal is disabled; needs GAME_SNAPSHOT_DIR)
+    GAME_JOURNAL_FSYNC_INTERVAL: seconds between fsyncs of the journal (0 fsyncs every record)
+    GAME_JOURNAL_COMPACT_BYTES: journal size that triggers compaction into snapshots
+
+Each mutation (game start, next day, alibis, NPC answers, interrogation turns)
+appends one JSON line with the top-level GameState fields it changed:
+
+    {"game":1,"op":"talk_to_npc","set":{"conversations_left":3},"append":{"conversations":[...]}}
+
+Lists that only grew are written as "append" (only the new items), any other
+changed field as "set", and the first record of a session ("full") carries the
+whole state. Records are written to the OS on append, so a worker crash loses
+nothing; fsyncs are batched every GAME_JOURNAL_FSYNC_INTERVAL seconds.
+
+On startup the journal is replayed on top of the game snapshots, the recovered
+games are snapshotted and the journal is truncated. When the journal reaches
+GAME_JOURNAL_COMPACT_BYTES it is compacted in the background: the records so
+far are moved aside (new records go to a new file), every game in them is
+snapshotted under its game lock and a "snapshot" record marks where later
+records continue from that snapshot; the moved file is then deleted.
+
+Offline check of a journal file:
+    python -m app.services.game_journal --path snapshots/journal.log
+"""
+import argparse
+import os
+import shutil
+import threading
+
+from app.services.game_state import dumps, loads
+
+from app.core.logger_config import setup_logger
+logger = setup_logger()
+
+GAME_JOURNAL_PATH = os.environ.get("GAME_JOURNAL_PATH", "")
+GAME_JOURNAL_FSYNC_INTERVAL = float(os.environ.get("GAME_JOURNAL_FSYNC_INTERVAL", 0.05))
+GAME_JOURNAL_COMPACT_BYTES = int(os.environ.get("GAME_JOURNAL_COMPACT_BYTES", 16 * 1024 * 1024))
+
+
+def encode_fields(state):
+    """
+    Encodes each top-level field of a GameState.to_dict() separately, so the
+    next mutation can be diffed against it without keeping a deep copy.
+    """
+    return {key: dumps(value) for key, value in state.items()}
+
+
+def mutation_record(game_no, op, previous, fields):
+    """
+    Returns the encoded journal line for the change from previous to fields
+    (both from encode_fields), or None if nothing changed. previous=None
+    writes the full state.
+    """
+    if previous is None:
+        return _record(game_no, op, fields, {}, full=True)
+    changed = {}
+    appended = {}
+    for key, value in fields.items():
+        old = previous.get(key)
+        if value == old:
+            continue
+        # 인코딩된 이전 리스트가 새 리스트의 앞부분이면 추가된 항목만 기록
+        if old is not None and old[:1] == b"[" and value[:1] == b"[":
+            if old == b"[]":
+                appended[key] = value
+                continue
+            if value.startswith(old[:-1]) and value[len(old) - 1:len(old)] == b",":
+                appended[key] = b"[" + value[len(old):]
+                continue
+        changed[key] = value
+    if not changed and not appended:
+        return None
+    return _record(game_no, op, changed, appended)
+
+
+# 필드 값은 이미 JSON으로 인코딩되어 있으므로 다시 인코딩하지 않고 이어 붙임
+def _record(game_no, op, changed, appended, full=False):
+    parts = [b'{"game":', str(int(game_no)).encode(), b',"op":', dumps(op)]
+    if full:
+        parts.append(b',"full":true')
+    for name, values in (("set", changed), ("append", appended)):
+        if values:
+            parts.append(b',"' + name.encode() + b'":{')
+            parts.append(b",".join(dumps(key) + b":" + value for key, value in values.items()))
+            parts.append(b"}")
+    parts.append(b"}\n")
+    return b"".join(parts)
+
+
+def end_record(game_no):
+    return _record(game_no, "end", {}, {})
+
+
+# 게임을 스냅샷으로 저장한 뒤 기록: 복구 시 이후 기록은 이 스냅샷 위에 적용
+def snapshot_record(game_no):
+    return _record(game_no, "snapshot", {}, {})
+
+
+def apply_record(state, record):
+    """
+    Applies one journal record to a GameState.to_dict() style dict and returns
+    it (a new dict for "full" records).
+    """
+    if record.get("full"):
+        state = {}
+    state.update(record.get("set", {}))
+    for key, items in record.get("append", {}).items():
+        state.setdefault(key, []).extend(items)
+    return state
+
+
+def replay(records, load_state):
+    """
+    Rebuilds game states from journal records.
+
+    load_state(game_no) returns the snapshotted state dict of a game (or None)
+    and is called for games whose first record (or first record after a
+    "snapshot" record) is not a full one. Returns
+    {game_no: state dict} for the games that were not ended, and the numbers
+    of games that had to be skipped because no base state was found.
+    """
+    states = {}
+    ended = set()
+    skipped = set()
+    for record in records:
+        game_no = record["game"]
+        if record["op"] == "end":
+            states.pop(game_no, None)
+            ended.add(game_no)
+            skipped.discard(game_no)
+            continue
+        if record["op"] == "snapshot":
+            # 이전 기록은 모두 스냅샷에 들어 있음
+            states.pop(game_no, None)
+            skipped.discard(game_no)
+            continue
+        state = states.get(game_no)
+        if state is None and not record.get("full"):
+            state = None if game_no in ended else load_state(game_no)
+            if state is None:
+                skipped.add(game_no)
+                continue
+        ended.discard(game_no)
+        states[game_no] = apply_record(state, record)
+    return states, sorted(skipped)
+
+
+class GameJournal:
+    """
+    Append-only journal file. The file is opened on first use; a background
+    thread fsyncs the appended records every fsync_interval seconds (group
+    commit), or every append is fsynced if fsync_interval is 0.
+    """
+
+    def __init__(self, path=GAME_JOURNAL_PATH, fsync_interval=GAME_JOURNAL_FSYNC_INTERVAL,
+                 compact_bytes=GAME_JOURNAL_COMPACT_BYTES):
+        self.path = path
+        # 압축 중인 이전 기록 (압축이 끝나면 삭제, 그 전에 종료되면 복구 때 먼저 읽음)
+        self.compacting_path = path + ".compacting"
+        self.compacting_games = set()
+        self.fsync_interval = fsync_interval
+        self.compact_bytes = compact_bytes
+        # 마지막 압축 이후 기록이 있는 게임
+        self.games = set()
+        self.size = 0
+        self.records_written = 0
+        self.fsyncs = 0
+        self._file = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = None
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self.size = self._file.tell()
+        if self.fsync_interval > 0 and self._flusher is None:
+            self._closed.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name="game-journal-fsync", daemon=True)
+            self._flusher.start()
+
+    def append(self, game_no, line):
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(line)
+            # 프로세스가 죽어도 남도록 매번 OS에 넘김 (fsync는 모아서)
+            self._file.flush()
+            self.size += len(line)
+            self.records_written += 1
+            self.games.add(game_no)
+            self._dirty = True
+            if self.fsync_interval <= 0:
+                self._sync_locked()
+
+    def _sync_locked(self):
+        if self._dirty and self._file is not None:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+            self.fsyncs += 1
+
+    def sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.fsync_interval):
+            try:
+                self.sync()
+            except (OSError, ValueError) as e:
+                logger.error(f"Game journal fsync failed: {e}")
+
+    def records(self):
+        """
+        Yields the decoded records. A torn last line (crash during a write)
+        and other unreadable lines are skipped.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+        for path in (self.compacting_path, self.path):
+            try:
+                file = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            with file:
+                for number, line in enumerate(file, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield loads(line)
+                    except ValueError:
+                        logger.warning(f"Skipping unreadable game journal record at {path}:{number}")
+
+    def rotate(self):
+        """
+        Starts a compaction: moves the records written so far to
+        compacting_path and continues in a new file. Returns the games with
+        records in the moved file (also those of an unfinished compaction).
+        """
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._sync_locked()
+            self._file.close()
+            self._file = None
+            if os.path.exists(self.compacting_path):
+                # 이전 압축이 끝나지 않았으면 그 파일 뒤에 이어 붙임
+                with open(self.path, "rb") as source, open(self.compacting_path, "ab") as target:
+                    shutil.copyfileobj(source, target)
+                    target.flush()
+                    os.fsync(target.fileno())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.compacting_path)
+            self.compacting_games |= self.games
+            self.games = set()
+            self._open()
+            return set(self.compacting_games)
+
+    # 압축 완료 후 호출: 옮긴 기록의 게임이 모두 스냅샷에 저장됨
+    def discard_compacted(self):
+        with self._lock:
+            self._remove_compacted()
+
+    def _remove_compacted(self):
+        try:
+            os.remove(self.compacting_path)
+        except FileNotFoundError:
+            pass
+        self.compacting_games.clear()
+
+    # 압축 후 호출: 모든 기록이 스냅샷에 반영되었으므로 파일을 비움
+    def truncate(self):
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.truncate(0)
+            self._file.seek(0)
+            os.fsync(self._file.fileno())
+            self.size = 0
+            self.games.clear()
+            self._dirty = False
+            self._remove_compacted()
+
+    def close(self):
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            if self._file is not None:
+                self._sync_locked()
+                self._file.close()
+                self._file = None
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "bytes": self.size,
+            "records": self.records_written,
+            "fsyncs": self.fsyncs,
+            "games": len(self.games),
+            "compactingGames": len(self.compacting_games),
+        }
+
+
+def create_game_journal(path=None):
+    path = GAME_JOURNAL_PATH if path is None else path
+    return GameJournal(path) if path else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=GAME_JOURNAL_PATH or None, required=not GAME_JOURNAL_PATH)
+    args = parser.parse_args()
+
+    ops = {}
+    games = set()
+    for record in GameJournal(args.path).records():
+        ops[record["op"]] = ops.get(record["op"], 0) + 1
+        games.add(record["game"])
+    print(f"{sum(ops.values())} records for {len(games)} games in {args.path}")
+    for op, count in sorted(ops.items()):
+        print(f"  {op}: {count}")
@@ -1,44 +1,39 @@
 import random
-from app.utils.data_loader import (
-    load_npcs_data,
-    load_features_data,
-    load_personalities_data,
-    load_places_data,
-    load_weapons_data,
-    load_names_data,
-    load_wealth_data,
-    load_scenarios_data
-)
-from app.utils.game_utils import get_name, get_weapon_name, get_location_name, get_personality_detail, get_feature_detail
+from app.services.game_state import GameState, NPCOverlay
+from app.utils.catalog import get_catalog
+from app.utils.game_utils import get_name, get_npc_id, get_weapon_name, get_location_name, get_personality_detail, get_feature_detail
 
 # 개별 게임 상태 관리
+# 카탈로그 데이터는 모든 게임이 공유하는 읽기 전용 스냅샷이며, 게임별로 변경되는 NPC 항목은 NPCOverlay에 저장
 class GameManagement:
-    def __init__(self):
-        self.npcs = load_npcs_data()["npcs"]
-        self.features = load_features_data()["features"]
-        self.personalities = load_personalities_data()["personalities"]
-        self.places = load_places_data()["places"]
-        self.weapons = load_weapons_data()["weapons"]
-        self.names = load_names_data()["names"]
-        self.wealth = load_wealth_data()["wealth"]
-        self.scenarios = load_scenarios_data()["scenarios"]
+    def __init__(self, catalog=None):
+        self.catalog = catalog or get_catalog()
+        self.npcs = self.catalog.npcs
+        self.features = self.catalog.features
+        self.personalities = self.catalog.personalities
+        self.places = self.catalog.places
+        self.weapons = self.catalog.weapons
+        self.names = self.catalog.names
+        self.wealth = self.catalog.wealth
+        self.scenarios = self.catalog.scenarios
         self.game_state = None
 
     # 새로운 게임을 초기화하는 메서드
     def initialize_game(self, language, characters, murderer):
         # NPC 이름 사전 생성 (한글 이름 -> id 매핑)
-        npc_name_dict = {name["name"]["ko"]: name["id"] for name in self.names}
+        npc_name_dict = {char: get_npc_id(char, "ko", self.names) for char in characters}
         
         # 유효성 검사
-        invalid_chars = [char for char in characters if char not in npc_name_dict]
+        invalid_chars = [char for char in characters if npc_name_dict[char] is None]
         if invalid_chars:
             raise ValueError(f"Invalid characters: {', '.join(invalid_chars)}")
         
         if murderer not in characters:
             raise ValueError(f"Murderer {murderer} is not in the character list")
 
-        # 선택된 NPC 목록 생성
-        selected_npcs = [npc for npc in self.npcs if npc["name"] in [npc_name_dict[char] for char in characters]]
+        # 선택된 NPC 목록 생성 (카탈로그 레코드는 공유하고 게임별 변경은 오버레이에 저장)
+        selected_ids = {npc_name_dict[char] for char in characters}
+        selected_npcs = [NPCOverlay(npc) for npc in self.npcs if npc["name"] in selected_ids]
         murderer_npc = next((npc for npc in selected_npcs if npc["name"] == npc_name_dict[murderer]), None)
         
         if murderer_npc is None:
@@ -52,35 +47,27 @@ class GameManagement:
         murdered_npc = random.choice(potential_victims)
 
         # 무기를 랜덤으로 할당
-        weapons = load_weapons_data()["weapons"]
+        weapon_ids = [weapon["id"] for weapon in self.weapons]
         for npc in selected_npcs:
-            npc["preferredWeapons"] = random.sample([weapon["id"] for weapon in weapons], min(3, len(weapons)))
+            npc["preferredWeapons"] = tuple(random.sample(weapon_ids, min(3, len(weapon_ids))))
 
         # 장소를 랜덤으로 할당
-        places = load_places_data()["places"]
+        place_ids = [place["id"] for place in self.places]
         for npc in selected_npcs:
-            npc["preferredLocations"] = random.sample([place["id"] for place in places], min(3, len(places)))
+            npc["preferredLocations"] = tuple(random.sample(place_ids, min(3, len(place_ids))))
 
         murder_weapon = random.choice(murderer_npc["preferredWeapons"])
         murder_location = random.choice(murderer_npc["preferredLocations"])
 
-        self.game_state = {
-            "language": language,
-            "suspects": selected_npcs,
-            "murderer": murderer_npc,
-            "murdered_npc": murdered_npc,
-            "murder_weapon": murder_weapon,
-            "murder_location": murder_location,
-            "conversations_left": 5,
-            "npcs": selected_npcs,
-            "places": self.places,
-            "weapons": self.weapons,
-            "conversations": [],
-            "current_day": 1,
-            "alive": {npc["name"]: (npc != murdered_npc) for npc in selected_npcs},
-            "murdered_npcs": [{"name": murdered_npc["name"], "day": 1}],
-            "interrogation": None
-        }
+        self.game_state = GameState(
+            language,
+            selected_npcs,
+            selected_npcs.index(murderer_npc),
+            selected_npcs.index(murdered_npc),
+            murder_weapon,
+            murder_location,
+            catalog=self.catalog
+        )
 
         return self.game_state
 
@@ -0,0 +1,112 @@
+from app.utils.game_utils import get_by_id, get_location_id, get_weapon_id
+
+# 게임별 표시 이름 -> NPC / 장소 / 무기 인덱스
+class GameResolver:
+    """
+    Resolves player-supplied display names to the records of one game.
+
+    Built once per game in GameService.initialize_new_game and shared by that
+    game's QuestionGeneration, HintInvestigation, ScenarioGeneration and
+    Interrogation. NPC deaths go through set_alive so that the game state's alive
+    bitset, the NPC record and living_npcs() always agree.
+
+    NPC preferences are also kept as inverted indexes (weapon id -> NPCs,
+    location id -> NPCs) stored as int bitsets over the NPC's position in
+    game_state["npcs"], so suspect filters are a few bitwise ANDs.
+    """
+
+    def __init__(self, game_state, names=(), places=(), weapons=()):
+        self.game_state = game_state
+        self.names = names
+        self.places = places
+        self.weapons = weapons
+        self.rebuild()
+
+    # game_state["npcs"]가 교체된 경우 인덱스를 다시 생성
+    def rebuild(self):
+        self._npcs = self.game_state["npcs"]
+        self.npcs_by_id = {}
+        self.npcs_by_name = {}
+        self.npc_bits = {}
+        self.weapon_bits = {}
+        self.location_bits = {}
+        for ordinal, npc in enumerate(self._npcs):
+            bit = 1 << ordinal
+            self.npcs_by_id.setdefault(npc["name"], npc)
+            self.npc_bits.setdefault(npc["name"], bit)
+            entry = get_by_id(npc["name"], self.names)
+            if entry is not None:
+                for lang, label in entry["name"].items():
+                    self.npcs_by_name.setdefault((lang, label), npc)
+            for weapon_id in npc.get("preferredWeapons", ()):
+                self.weapon_bits[weapon_id] = self.weapon_bits.get(weapon_id, 0) | bit
+            for location_id in npc.get("preferredLocations", ()):
+                self.location_bits[location_id] = self.location_bits.get(location_id, 0) | bit
+        self.all_bits = (1 << len(self._npcs)) - 1
+
+    def _sync(self):
+        if self.game_state["npcs"] is not self._npcs:
+            self.rebuild()
+
+    @property
+    def language(self):
+        return self.game_state["language"]
+
+    def npc(self, display_name, lang=None):
+        self._sync()
+        return self.npcs_by_name.get((lang or self.language, display_name))
+
+    def npc_by_id(self, npc_id):
+        self._sync()
+        return self.npcs_by_id.get(npc_id)
+
+    def place(self, display_name, lang=None):
+        return get_by_id(get_location_id(display_name, lang or self.language, self.places), self.places)
+
+    def weapon(self, display_name, lang=None):
+        return get_by_id(get_weapon_id(display_name, lang or self.language, self.weapons), self.weapons)
+
+    def is_alive(self, npc_id):
+        self._sync()
+        return bool(self.game_state.alive_bits & self.npc_bits.get(npc_id, 0))
+
+    def living_npcs(self):
+        self._sync()
+        return self.npcs_in(self.game_state.alive_bits)
+
+    def set_alive(self, npc_id, alive):
+        self._sync()
+        if npc_id not in self.npcs_by_id:
+            return None
+        return self.game_state.set_alive(npc_id, alive)
+
+    def npcs_in(self, bits):
+        npcs = []
+        while bits:
+            low = bits & -bits
+            npcs.append(self._npcs[low.bit_length() - 1])
+            bits ^= low
+        return npcs
+
+    def filter_npcs(self, weapon_ids=(), location_ids=(), alive_only=False, excluded_ids=()):
+        """
+        Returns the NPCs (in game order) that prefer any of weapon_ids and any of
+        location_ids. Empty criteria do not filter.
+        """
+        self._sync()
+        bits = self.all_bits
+        if weapon_ids:
+            weapon_bits = 0
+            for weapon_id in weapon_ids:
+                weapon_bits |= self.weapon_bits.get(weapon_id, 0)
+            bits &= weapon_bits
+        if location_ids:
+            location_bits = 0
+            for location_id in location_ids:
+                location_bits |= self.location_bits.get(location_id, 0)
+            bits &= location_bits
+        if alive_only:
+            bits &= self.game_state.alive_bits
+        for npc_id in excluded_ids:
+            bits &= ~self.npc_bits.get(npc_id, 0)
+        return self.npcs_in(bits)
@@ -1,197 +1,568 @@
+import asyncio
+import os
 import random
+import time
 from typing import List
 from app.schemas import game_schema
 from app.services.game_management import GameManagement
 from app.services.question_generation import QuestionGeneration
 from app.services.hint_investigation import HintInvestigation
-from app.services.scenario_generation import ScenarioGeneration
+from app.services.game_resolver import GameResolver
+from app.services.scenario_generation import ScenarioGeneration, get_alibi_generation_stats
 
 from app.services.interrogation import Interrogation
+from app.services.game_journal import GameJournal, encode_fields, end_record, mutation_record, replay, snapshot_record
+from app.services.game_snapshot import SnapshotDirectory, create_snapshot_directory
+from app.services.game_state import GameState
+from app.services.session_registry import GameSession, SessionRegistry
+from app.services.status_view import STATUS_OPS, GameStatusView
+from app.utils.catalog import get_catalog
+from app.utils.game_utils import get_name
+from app.utils.keyed_lock import KeyedLock
+from app.utils.state_store import StaleStateError, StateStore, create_state_store
+
+from app.core.logger_config import setup_logger
+logger = setup_logger()
+
+# start-batch / status-batch 요청 하나에 담을 수 있는 최대 게임 수
+GAME_BATCH_MAX_SIZE = int(os.environ.get("GAME_BATCH_MAX_SIZE", 1000))
+
+
+def check_batch_size(items):
+    if len(items) > GAME_BATCH_MAX_SIZE:
+        raise ValueError(f"A batch can contain at most {GAME_BATCH_MAX_SIZE} games (got {len(items)})")
+
 
 # 여러 게임 상태 관리
 class GameService:
-    def __init__(self):
-        self.game_managements: dict[int, GameManagement] = {}
-        self.question_generations: dict[int, QuestionGeneration] = {}
-        self.hint_investigations: dict[int, HintInvestigation] = {}
-        self.scenario_generations: dict[int, ScenarioGeneration] = {}
-        self.game_states: dict[int, dict] = {}
+    def __init__(self, sessions: SessionRegistry = None, store: StateStore = None, snapshots: SnapshotDirectory = None,
+                 journal: GameJournal = None):
+        # gameNo별 게임 상태와 서비스 객체 (유휴 시간/최대 개수를 넘으면 제거)
+        self.sessions = sessions if sessions is not None else SessionRegistry()
+        # 여러 워커가 공유하는 게임 상태 저장소 (없으면 이 프로세스의 메모리에만 유지)
+        self.store = store if store is not None else create_state_store()
+        # 게임별 스냅샷 파일 (메모리에 없는 게임은 첫 접근 시 스냅샷에서 복원)
+        self.snapshots = snapshots if snapshots is not None else create_snapshot_directory()
+        if self.snapshots is not None and self.store is None:
+            # 저장소가 없으면 제거되는 세션을 스냅샷으로 보존
+            self.sessions.add_eviction_hook(lambda session, reason: self.snapshot_session(session))
+        # 스냅샷 사이의 변경 기록 (외부 저장소를 사용하면 상태가 이미 저장소에 남으므로 사용하지 않음)
+        self.journal = journal if self.store is None else None
+        if self.journal is not None and self.snapshots is None:
+            raise ValueError("The game journal needs a snapshot directory (set GAME_SNAPSHOT_DIR)")
+        # gameNo별 asyncio 락: 같은 게임의 요청은 도착 순서대로 하나씩, 다른 게임은 서로 기다리지 않음
+        # 비동기 메서드는 내부에서 잡고, 동기 메서드는 라우터가 locks(gameNo)로 감싸서 호출
+        # 상태 조회(/status, /status/changes, /status-batch)는 저장할 때 게시된 상태만 읽으므로 락을 잡지 않음
+        self.locks = KeyedLock()
+        # 락을 잡고 있는 게임(LLM 응답 대기 등)의 세션은 작업이 끝날 때까지 제거하지 않음
+        self.sessions.set_in_use_check(self.locks.locked)
+        # 실행 중인 저널 압축 작업
+        self.compaction = None
 
-        self.interrogations: dict[int, Interrogation] = {}
+    # 게임 세션을 반환하는 메서드 (없거나 제거된 게임이면 ValueError)
+    # 저장소를 사용하는 경우 다른 워커가 더 새로운 버전을 저장했으면 저장소에서 다시 읽음
+    def get_session(self, gameNo) -> GameSession:
+        session = self.sessions.get(gameNo)
+        if self.store is not None:
+            version = self.store.version(gameNo)
+            if version is None:
+                if session is not None:
+                    self.sessions.remove(gameNo)
+                session = None
+            elif session is None or session.version != version:
+                session = self.restore_session(gameNo)
+        if session is None and self.snapshots is not None:
+            session = self.restore_snapshot(gameNo)
+        if session is None:
+            raise ValueError(f"Game ID {gameNo} not found")
+        return session
 
-    # 새로운 게임을 시작하고 초기화하는 메서드
-    def initialize_new_game(self, game_data: game_schema.GameStartRequest):
+    # 동기 메서드를 실행하는 메서드
+    # 저장소(sqlite, Redis)를 사용하면 저장소 I/O가 이벤트 루프를 막지 않도록 스레드에서 실행하고,
+    # 저장소가 없으면 메모리와 로컬 파일만 다루므로 바로 실행
+    async def run_sync(self, method, *args):
+        if self.store is None:
+            return method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    # 저장소에서 게임 상태를 읽어 세션을 다시 만드는 메서드
+    def restore_session(self, gameNo):
+        entry = self.store.load(gameNo)
+        if entry is None:
+            return None
+        version, data = entry
+        session = self.session_from_bytes(gameNo, data)
+        session.version = version
+        return self.sessions.add(session)
+
+    # 스냅샷 파일에서 세션을 복원하는 메서드 (저장소를 사용하면 저장소에도 저장)
+    def restore_snapshot(self, gameNo):
+        data = self.snapshots.read(gameNo)
+        if data is None:
+            return None
+        session = self.session_from_bytes(gameNo, data)
+        if self.store is not None:
+            session.version = self.store.version(gameNo) or 0
+            self.save_session(session)
+        logger.info(f"Game {gameNo} restored from snapshot ({len(data)} bytes)")
+        return self.sessions.add(session)
+
+    def session_from_bytes(self, gameNo, data):
         game_management = GameManagement()
-        characters = [char.npcName for char in game_data.characters]
-        murderer = next(char.npcName for char in game_data.characters if char.npcJob == "Murderer")
-        
-        game_state = game_management.initialize_game(game_data.language, characters, murderer)
-        
-        self.game_managements[game_data.gameNo] = game_management
-        self.game_states[game_data.gameNo] = game_state
-        self.question_generations[game_data.gameNo] = QuestionGeneration(
-            game_state,
-            game_management.personalities,
-            game_management.features,
-            game_management.weapons,
-            game_management.places,
-            game_management.names
-        )
-        self.hint_investigations[game_data.gameNo] = HintInvestigation(
-            game_state,
-            game_management.places,
-            game_management.weapons
-        )
-        self.scenario_generations[game_data.gameNo] = ScenarioGeneration(
-            game_state,
-            game_management.personalities,
-            game_management.features,
-            game_management.weapons,
-            game_management.places,
-            game_management.names
-        )
+        game_management.game_state = GameState.from_bytes(data, game_management.catalog)
+        session = self.build_session(gameNo, game_management, game_management.game_state)
+        # 복원한 상태는 이미 저장된 상태이므로 바로 상태 응답으로 게시
+        session.status_view.publish()
+        return session
+
+    # 변경된 게임 상태를 저장소에 저장하는 메서드 (다른 워커가 먼저 저장했으면 StaleStateError)
+    # 저장소가 없으면 저널에 변경 내용을 기록
+    # 상태 응답을 바꾸는 작업이면 status_version을 올리고 변경 내용을 기록한 뒤 새 상태 응답과 ETag를 게시
+    def save_session(self, session: GameSession, op="update"):
+        if op in STATUS_OPS:
+            session.game_state.status_version += 1
+            session.status_view.record_change()
+        if self.store is None:
+            self.journal_session(session, op)
+            return
+        try:
+            session.version = self.store.save(session.game_no, session.game_state.to_bytes(), session.version)
+        except StaleStateError:
+            # 이 워커의 변경은 버리고 다음 요청에서 저장소의 최신 상태를 사용
+            self.sessions.remove(session.game_no)
+            raise
+
+    # 마지막으로 기록한 뒤 바뀐 필드만 저널에 추가하는 메서드 (세션의 첫 기록은 전체 상태)
+    def journal_session(self, session: GameSession, op):
+        if self.journal is None:
+            return
+        fields = encode_fields(session.game_state.to_dict())
+        record = mutation_record(session.game_no, op, session.journaled, fields)
+        session.journaled = fields
+        if record is None:
+            return
+        self.journal.append(session.game_no, record)
+        if self.journal.size >= self.journal.compact_bytes:
+            self.schedule_compaction()
+
+    # 저널 압축을 시작하는 메서드
+    # 다른 게임을 저장하는 중에 불리므로 이벤트 루프에서는 백그라운드 작업으로 실행 (이미 실행 중이면 건너뜀)
+    def schedule_compaction(self):
+        if self.compaction is not None and not self.compaction.done():
+            return
 
-        self.interrogations[game_data.gameNo] = Interrogation(
+        async def compact():
+            try:
+                result = await self.compact_journal()
+                logger.info(f"Compacted game journal into {result['games']} snapshots in {result['seconds']:.2f}s")
+            except Exception as e:
+                logger.error(f"Game journal compaction failed: {e}")
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 이벤트 루프 밖에서 저장한 경우 (스크립트, 테스트)
+            asyncio.run(compact())
+            return
+        self.compaction = loop.create_task(compact())
+
+    # 저널에 기록된 게임을 스냅샷으로 저장하는 메서드
+    # 지금까지의 기록을 옮겨 두고 (새 기록은 새 파일에) 게임마다 락을 잡고 저장하므로 작업 중인 게임은
+    # 작업이 끝난 뒤의 상태로 저장됨. 옮긴 기록은 모든 게임을 저장한 뒤 삭제
+    # (메모리에서 제거된 게임은 eviction hook이 이미 스냅샷으로 저장함)
+    async def compact_journal(self):
+        start = time.perf_counter()
+        count = 0
+        for gameNo in self.journal.rotate():
+            async with self.locks(gameNo):
+                session = self.sessions.peek(gameNo)
+                if session is None:
+                    continue
+                await asyncio.to_thread(self.snapshot_session, session)
+                count += 1
+        self.journal.discard_compacted()
+        return {"games": count, "seconds": time.perf_counter() - start}
+
+    # 시작 시 스냅샷 위에 저널을 다시 적용해 비정상 종료 전의 게임 상태를 복구하는 메서드
+    # 복구한 게임은 스냅샷으로 저장하고 (첫 접근 시 복원) 저널을 비움
+    def recover_journal(self):
+        start = time.perf_counter()
+        catalog = GameManagement().catalog
+
+        def load_state(gameNo):
+            data = self.snapshots.read(gameNo)
+            if data is None:
+                return None
+            try:
+                return GameState.from_bytes(data, catalog).to_dict()
+            except ValueError as e:
+                logger.error(f"Game {gameNo} snapshot could not be loaded: {e}")
+                return None
+
+        states, skipped = replay(self.journal.records(), load_state)
+        for gameNo, state in states.items():
+            try:
+                self.snapshots.write(gameNo, GameState.from_dict(state, catalog).to_bytes())
+            except ValueError as e:
+                # 저장한 뒤 카탈로그에서 빠진 NPC가 있는 게임 등
+                logger.error(f"Game {gameNo} could not be recovered from the journal: {e}")
+                skipped.append(gameNo)
+        for gameNo in skipped:
+            logger.error(f"Game {gameNo} could not be recovered from the journal (no start record or snapshot)")
+        self.journal.truncate()
+        return {"games": len(states), "skipped": len(skipped), "seconds": time.perf_counter() - start}
+
+    # 게임 상태 하나에 대한 서비스 객체를 만드는 메서드 (모든 서비스 객체가 이름 인덱스를 공유)
+    def build_session(self, gameNo, game_management: GameManagement, game_state):
+        resolver = GameResolver(game_state, game_management.names, game_management.places, game_management.weapons)
+        return GameSession(
+            gameNo,
+            game_management,
             game_state,
-            game_management.personalities,
-            game_management.features,
-            game_management.weapons,
-            game_management.places,
-            game_management.names
+            resolver,
+            QuestionGeneration(
+                game_state,
+                game_management.personalities,
+                game_management.features,
+                game_management.weapons,
+                game_management.places,
+                game_management.names,
+                resolver
+            ),
+            HintInvestigation(
+                game_state,
+                game_management.weapons,
+                game_management.places,
+                resolver
+            ),
+            ScenarioGeneration(
+                game_state,
+                game_management.personalities,
+                game_management.features,
+                game_management.weapons,
+                game_management.places,
+                game_management.names,
+                resolver
+            ),
+            Interrogation(
+                game_state,
+                game_management.personalities,
+                game_management.features,
+                game_management.weapons,
+                game_management.places,
+                game_management.names,
+                resolver
+            ),
+            GameStatusView(game_management)
         )
 
-        first_blood = self.scenario_generations[game_data.gameNo].get_first_blood()
+    # 새로운 게임을 시작하고 초기화하는 메서드
+    def initialize_new_game(self, game_data: game_schema.GameStartRequest, catalog=None):
+        game_management = GameManagement(catalog)
+        characters = [char.npcName for char in game_data.characters]
+        murderer = next((char.npcName for char in game_data.characters if char.npcJob == "Murderer"), None)
+        if murderer is None:
+            raise ValueError("No character has the Murderer job")
+        
+        game_state = game_management.initialize_game(game_data.language, characters, murderer)
+        session = self.build_session(game_data.gameNo, game_management, game_state)
+
+        first_blood = session.scenario_generation.get_first_blood()
         game_state['first_blood'] = first_blood
 
+        # 같은 gameNo로 다시 시작하는 경우 저장된 이전 게임을 덮어씀
+        if self.store is not None:
+            session.version = self.store.version(game_data.gameNo) or 0
+        self.sessions.add(session)
+        self.save_session(session, "initialize_game")
+
         return game_state
 
-    # 게임 상태를 반환하는 메서드
+    # 여러 게임을 한 번에 시작하는 메서드 (카탈로그는 한 번만 가져오고 게임별 오류는 결과에 따로 기록)
+    # owns가 주어지면 이 워커가 담당하지 않는 게임은 시작하지 않음
+    async def initialize_new_games(self, games: List[game_schema.GameStartRequest], owns=None):
+        check_batch_size(games)
+        catalog = get_catalog()
+        results = []
+        started = set()
+        for game_data in games:
+            gameNo = game_data.gameNo
+            try:
+                if gameNo in started:
+                    raise ValueError(f"Game ID {gameNo} appears more than once in the batch")
+                if game_data.language not in ["en", "ko"]:
+                    raise ValueError("Invalid language. Choose 'en' or 'ko'.")
+                if owns is not None and not owns(gameNo):
+                    raise ValueError(f"Game ID {gameNo} is owned by another shard")
+                async with self.locks(gameNo):
+                    game_state = await self.run_sync(self.initialize_new_game, game_data, catalog)
+                started.add(gameNo)
+                results.append({"gameNo": gameNo, "answer": game_state['first_blood']})
+            except (ValueError, StaleStateError) as e:
+                results.append({"gameNo": gameNo, "error": str(e)})
+        return results
+
+    # 여러 게임의 인코딩된 상태 응답을 반환하는 메서드 ((gameNo, 상태 JSON 또는 None, 오류 또는 None) 목록)
+    async def get_status_bodies(self, gameNos: List[int], owns=None):
+        check_batch_size(gameNos)
+        results = []
+        for gameNo in gameNos:
+            try:
+                if owns is not None and not owns(gameNo):
+                    raise ValueError(f"Game ID {gameNo} is owned by another shard")
+                status_view = await self.run_sync(self.get_status_view, gameNo)
+                body = status_view.body()
+                results.append((gameNo, body, None))
+            except ValueError as e:
+                results.append((gameNo, None, str(e)))
+        return results
+
+    # 마지막으로 저장된 게임 상태를 반환하는 메서드 (상태를 바꾸는 작업을 저장할 때만 다시 만듦)
     def get_game_status(self, gameNo):
-        game_state = self.game_states.get(gameNo)
-        if not game_state:
-            raise ValueError("Game ID not found")
-        game_management = self.game_managements[gameNo]
-        status = game_management.get_game_status()
-        status['current_day'] = game_state['current_day']
-        status['alive'] = game_state['alive']
-        status['murdered_npcs'] = game_state['murdered_npcs']
-        return status
-
-    # 게임 진행 상황을 저장하는 메서드
-    def save_game_progress(self, gameNo, game_state):
-        self.game_states[gameNo] = game_state
-        return {"message": "Progress saved successfully"}
+        return self.get_session(gameNo).status_view.status()
+
+    # 게임 상태 응답의 캐시를 반환하는 메서드 (라우터가 ETag와 인코딩된 본문을 사용)
+    # 게시된 상태만 읽으므로 게임 락 없이 호출해도 LLM 호출 중인 작업을 기다리거나 반쯤 바뀐 상태를 보지 않음
+    def get_status_view(self, gameNo) -> GameStatusView:
+        return self.get_session(gameNo).status_view
+
+    # 클라이언트가 마지막으로 받은 버전 이후 바뀐 상태만 반환하는 메서드
+    def get_status_changes(self, gameNo, since):
+        return self.get_session(gameNo).status_view.changes(since)
+
+    # 게임 진행 상황을 스냅샷 파일로 저장하는 메서드
+    def save_game_progress(self, gameNo):
+        if self.snapshots is None:
+            raise ValueError("Game snapshots are disabled (set GAME_SNAPSHOT_DIR)")
+        size = self.snapshot_session(self.get_session(gameNo))
+        return {"message": "Progress saved successfully", "bytes": size}
+
+    # 게임 상태를 스냅샷으로 저장하는 메서드
+    # 저널을 사용하면 스냅샷 표시를 기록하고, 세션의 다음 기록은 스냅샷에 저장한 상태와 비교
+    def snapshot_session(self, session: GameSession):
+        size = self.snapshots.write(session.game_no, session.game_state.to_bytes())
+        if self.journal is not None:
+            self.journal.append(session.game_no, snapshot_record(session.game_no))
+            session.journaled = encode_fields(session.game_state.to_dict())
+        return size
+
+    # 메모리에 있는 모든 게임을 스냅샷으로 저장하는 메서드 (서버 종료 시에도 호출)
+    # /save-progress처럼 게임마다 락을 잡으므로 진행 중인 작업은 끝난 뒤의 상태로 저장됨
+    async def snapshot_all(self):
+        if self.snapshots is None:
+            raise ValueError("Game snapshots are disabled (set GAME_SNAPSHOT_DIR)")
+        start = time.perf_counter()
+        count = total_bytes = 0
+        for gameNo in [session.game_no for session in self.sessions.values()]:
+            async with self.locks(gameNo):
+                session = self.sessions.peek(gameNo)
+                if session is None:
+                    continue
+                total_bytes += await asyncio.to_thread(self.snapshot_session, session)
+                count += 1
+        return {"games": count, "bytes": total_bytes, "seconds": time.perf_counter() - start}
+
+    # 스냅샷이 있는 모든 게임을 미리 메모리로 복원하는 메서드 (평소에는 첫 접근 시 복원)
+    # 게임마다 락을 잡으므로 같은 게임의 첫 요청과 겹쳐도 한 번만 복원됨
+    async def restore_all(self):
+        if self.snapshots is None:
+            raise ValueError("Game snapshots are disabled (set GAME_SNAPSHOT_DIR)")
+        start = time.perf_counter()
+        restored = failed = 0
+        for gameNo in await asyncio.to_thread(self.snapshots.game_numbers):
+            async with self.locks(gameNo):
+                try:
+                    if await asyncio.to_thread(self.restore_missing, gameNo):
+                        restored += 1
+                except (ValueError, KeyError) as e:
+                    failed += 1
+                    logger.error(f"Game {gameNo} snapshot could not be restored: {e}")
+        return {"games": restored, "failed": failed, "seconds": time.perf_counter() - start}
+
+    # 메모리와 저장소에 없는 게임만 스냅샷에서 복원하는 메서드 (복원했으면 True)
+    def restore_missing(self, gameNo):
+        if gameNo in self.sessions or (self.store is not None and self.store.version(gameNo) is not None):
+            return False
+        return self.restore_snapshot(gameNo) is not None
+
+    # 샤드 재분배 시 이 워커가 더 이상 담당하지 않는 게임을 넘기는 메서드
+    # 스냅샷(또는 외부 저장소)에 남긴 뒤 메모리에서 제거하면 새 담당 워커가 첫 접근 시 복원함
+    # 게임마다 락을 잡으므로 진행 중인 작업은 끝난 뒤의 상태로 넘어감
+    # (저널을 사용하면 스냅샷 표시가 기록되므로 넘긴 게임이 이 워커의 저널 복구 때 다시 저장되지 않음)
+    async def hand_off(self, owns):
+        if self.store is None and self.snapshots is None:
+            raise ValueError("Handing off games needs a snapshot directory or a state store")
+        moved = 0
+        for gameNo in [session.game_no for session in self.sessions.values()]:
+            if owns(gameNo):
+                continue
+            async with self.locks(gameNo):
+                # 락을 기다리는 동안 끝났거나 저장소에서 다시 읽은 게임은 지금 등록된 세션 기준
+                session = self.sessions.peek(gameNo)
+                if session is None:
+                    continue
+                if self.store is None:
+                    await asyncio.to_thread(self.snapshot_session, session)
+                self.sessions.remove(gameNo)
+                moved += 1
+        return moved
+
+    # 게임 세션 수와 제거 횟수를 반환하는 메서드
+    def get_session_stats(self):
+        stats = self.sessions.stats()
+        stats["locks"] = self.locks.stats()
+        if self.journal is not None:
+            stats["journal"] = self.journal.stats()
+        return stats
 
     # 초기 게임 시나리오를 생성하는 메서드
-    def generate_game_scenario(self, gameNo):
-        return self.scenario_generations[gameNo].create_initial_scenario()
+    async def generate_game_scenario(self, gameNo):
+        async with self.locks(gameNo):
+            session = await self.run_sync(self.get_session, gameNo)
+            scenario = await session.scenario_generation.create_initial_scenario()
+            await self.run_sync(self.save_session, session, "generate_scenario")
+            return scenario
 
     # 촌장의 편지를 생성하는 메서드
-    def generate_chief_letter(self, gameNo):
-        return self.scenario_generations[gameNo].generate_chief_letter()
+    async def generate_chief_letter(self, gameNo):
+        async with self.locks(gameNo):
+            session = await self.run_sync(self.get_session, gameNo)
+            return await session.scenario_generation.generate_chief_letter()
 
     # 질문을 생성하는 메서드
-    def generate_npc_questions(self, gameNo, npcName, keyWord, keyWordType):
-        if gameNo not in self.question_generations:
-            raise ValueError(f"Game ID {gameNo} not found in question generations.")
-        return self.question_generations[gameNo].generate_questions(npcName, keyWord, keyWordType)
+    async def generate_npc_questions(self, gameNo, npcName, keyWord, keyWordType):
+        async with self.locks(gameNo):
+            session = await self.run_sync(self.get_session, gameNo)
+            questions = await session.question_generation.generate_questions(npcName, keyWord, keyWordType)
+            await self.run_sync(self.save_session, session, "generate_questions")
+            return questions
 
     # NPC와 대화를 진행하는 메서드
-    def talk_to_npc(self, gameNo, npcName, questionIndex, keyWord, keyWordType):
-        if gameNo not in self.question_generations:
-            raise ValueError(f"Game ID {gameNo} not found in question generations.")
-        return self.question_generations[gameNo].talk_to_npc(npcName, questionIndex, keyWord, keyWordType)
+    async def talk_to_npc(self, gameNo, npcName, questionIndex, keyWord, keyWordType):
+        async with self.locks(gameNo):
+            session = await self.run_sync(self.get_session, gameNo)
+            answer = await session.question_generation.talk_to_npc(npcName, questionIndex, keyWord, keyWordType)
+            await self.run_sync(self.save_session, session, "talk_to_npc")
+            return answer
 
     # 범행 장소를 조사하는 메서드
     def investigate_location(self, gameNo, location_name):
-        if gameNo not in self.hint_investigations:
-            raise ValueError(f"Game ID {gameNo} not found in hint investigations.")
-        return self.hint_investigations[gameNo].investigate_location(location_name)
+        return self.get_session(gameNo).hint_investigation.investigate_location(location_name)
 
     # 범행 도구를 조사하는 메서드
     def find_game_item(self, gameNo, item_name):
-        if gameNo not in self.hint_investigations:
-            raise ValueError(f"Game ID {gameNo} not found in hint investigations.")
-        return self.hint_investigations[gameNo].find_item(item_name)
+        return self.get_session(gameNo).hint_investigation.find_item(item_name)
 
     # 용의자를 필터링하는 메서드
     def filter_game_suspects(self, gameNo, weapon, location):
-        if gameNo not in self.hint_investigations:
-            raise ValueError(f"Game ID {gameNo} not found in hint investigations.")
-        return self.hint_investigations[gameNo].filter_suspects(weapon, location)
-
-    # 다음 날로 넘어가는 메서드
-    def proceed_to_next_day(self, gameNo: int, livingCharacters: List[game_schema.LivingNPCInfo]):
-        if gameNo not in self.game_states:
-            raise ValueError("Game ID not found")
+        return self.get_session(gameNo).hint_investigation.filter_suspects(weapon, location)
 
-        game_state = self.game_states[gameNo]
-        scenario_generation = self.scenario_generations[gameNo]
+    # 여러 조건으로 용의자를 필터링하고 표시 이름 목록을 반환하는 메서드
+    def filter_game_suspects_by(self, gameNo, weapons, locations, alive_only=True, excluded_npcs=()):
+        hint_investigation = self.get_session(gameNo).hint_investigation
+        suspects = hint_investigation.filter_suspects_by(weapons, locations, alive_only, excluded_npcs)
+        resolver = hint_investigation.resolver
+        return [get_name(npc["name"], resolver.language, resolver.names) for npc in suspects]
 
+    # 다음 날로 넘어가는 메서드
+    async def proceed_to_next_day(self, gameNo: int, livingCharacters: List[game_schema.LivingNPCInfo]):
         # LivingNPCInfo 객체를 딕셔너리로 변환
         living_characters_dict = [
             {"name": npc.name, "status": npc.status, "job": npc.job}
             for npc in livingCharacters
         ]
 
-        # ScenarioGeneration 클래스의 메서드를 호출하여 게임 상태 업데이트 및 새로운 시나리오 생성
-        murder_summary = scenario_generation.proceed_to_next_day(living_characters_dict)
+        async with self.locks(gameNo):
+            session = await self.run_sync(self.get_session, gameNo)
+            scenario_generation = session.scenario_generation
 
-        # 업데이트된 게임 상태 저장
-        self.game_states[gameNo] = scenario_generation.game_state
+            # ScenarioGeneration 클래스의 메서드를 호출하여 게임 상태 업데이트 및 새로운 시나리오 생성
+            murder_summary = await scenario_generation.proceed_to_next_day(living_characters_dict)
 
-        return murder_summary
+            # 업데이트된 게임 상태 저장
+            session.game_state = scenario_generation.game_state
+            await self.run_sync(self.save_session, session, "proceed_to_next_day")
+
+            return murder_summary
     
     # 알리바이와 목격자 정보를 생성하는 메서드
-    def generate_alibis_and_witness(self, gameNo):
-        if gameNo not in self.scenario_generations:
-            raise ValueError(f"Game ID {gameNo} not found in scenario generations.")
-        
-        alibis_and_witness = self.scenario_generations[gameNo].generate_alibis_and_witness()
-        self.game_states[gameNo].update(alibis_and_witness)
-        
-        return alibis_and_witness
+    async def generate_alibis_and_witness(self, gameNo):
+        async with self.locks(gameNo):
+            session = await self.run_sync(self.get_session, gameNo)
+            alibis_and_witness = await session.scenario_generation.generate_alibis_and_witness()
+            session.game_state.update(alibis_and_witness)
+            await self.run_sync(self.save_session, session, "generate_alibis_and_witness")
+            
+            return alibis_and_witness
+
+    # 알리바이 생성 방식별 요청 수, 토큰 수, 지연 시간을 반환하는 메서드
+    def get_alibi_generation_stats(self):
+        return get_alibi_generation_stats()
     
-    def end_game(self, gameNo, game_result):
-        if gameNo not in self.game_states:
-            raise ValueError("Game ID not found")
-        
-        game_state = self.game_states[gameNo]
-        scenario_generation = self.scenario_generations[gameNo]
-        lang = game_state["language"]
-        
-        if game_result == "WIN":
-            chief_letter = scenario_generation.generate_chief_win_letter()
-            murderer_letter = scenario_generation.generate_murderer_win_letter()
-            survivors_letters = scenario_generation.generate_survivors_letter()
-            return {
-                "result": "WIN",
-                "chiefLetter": chief_letter,
-                "murdererLetter": murderer_letter,
-                "survivorsLetters": survivors_letters
-            }
-        elif game_result == "LOSE":
-            chief_letter = scenario_generation.generate_chief_lose_letter()
-            murderer_letter = scenario_generation.generate_murderer_lose_letter()
-            return {
-                "result": "LOSE",
-                "chiefLetter": chief_letter,
-                "murdererLetter": murderer_letter
-            }
-        else:
+    # 게임을 종료하고 결과에 따른 편지들을 동시에 생성하는 메서드 (편지 생성 후 게임 세션 제거)
+    async def end_game(self, gameNo, game_result):
+        async with self.locks(gameNo):
+            session = await self.run_sync(self.get_session, gameNo)
+            letters = await session.scenario_generation.generate_end_game_letters(game_result)
+            await self.run_sync(self.remove_game, gameNo)
+            return letters
+
+    # 게임을 종료하고 완성되는 편지부터 하나씩 반환하는 메서드 (NDJSON 스트리밍용, 모든 편지 전송 후 게임 세션 제거)
+    # 없는 게임이나 잘못된 결과는 스트리밍을 시작하기 전에 ValueError
+    def stream_end_game(self, gameNo, game_result):
+        self.get_session(gameNo)
+        if game_result not in ("WIN", "LOSE"):
             raise ValueError("Invalid game result")
+
+        # 스트리밍이 끝날 때까지 같은 게임의 다른 요청은 대기
+        # 세션 조회와 편지 구성은 락을 잡은 뒤에 해야 앞선 요청이 바꾼 상태(생존자 등)가 반영됨
+        async def events():
+            async with self.locks(gameNo):
+                try:
+                    session = await self.run_sync(self.get_session, gameNo)
+                except ValueError as e:
+                    # 락을 기다리는 동안 게임이 종료되거나 제거된 경우
+                    yield {"type": "error", "error": str(e)}
+                    return
+                scenario_generation = session.scenario_generation
+                letters = scenario_generation.build_end_game_letters(game_result)
+                yield {"type": "result", "result": game_result, "letters": len(letters)}
+                async for letter_type, index, job, letter, fallback in scenario_generation.stream_letters(letters):
+                    event = {"type": letter_type, "letter": letter, "fallback": fallback}
+                    if letter_type == "survivorsLetters":
+                        event["index"] = index
+                        event["name"] = job["sender"]
+                    yield event
+                await self.run_sync(self.remove_game, gameNo)
+
+        return events()
     
 
+    # 종료된 게임을 메모리와 저장소에서 제거하는 메서드
+    def remove_game(self, gameNo):
+        self.sessions.remove(gameNo)
+        if self.journal is not None:
+            self.journal.append(gameNo, end_record(gameNo))
+        if self.store is not None:
+            self.store.delete(gameNo)
+        if self.snapshots is not None:
+            self.snapshots.delete(gameNo)
+
     #========================================================================================
 
     # 취조를 시작하는 메서드(증거 제공)
     def new_interrogation(self, gameNo, npc_name, weapon):
-        interrogation: Interrogation = self.interrogations[gameNo]
+        session = self.get_session(gameNo)
+        interrogation: Interrogation = session.interrogation
         interrogation.start_interrogation(npc_name, weapon)
+        self.save_session(session, "new_interrogation")
 
     # 취조 시 자유 대화하는 메서드
-    def generation_interrogation_response(self, gameNo, npc_name, content):
-        interrogation: Interrogation = self.interrogations[gameNo]
+    async def generation_interrogation_response(self, gameNo, npc_name, content):
+        async with self.locks(gameNo):
+            session = await self.run_sync(self.get_session, gameNo)
+            interrogation: Interrogation = session.interrogation
 
-        response = interrogation.generate_interrogation_response(npc_name, content)
-        return response
\ No newline at end of file
+            response = await interrogation.generate_interrogation_response(npc_name, content)
+            await self.run_sync(self.save_session, session, "generate_interrogation_response")
+            return response
@@ -0,0 +1,117 @@
+"""
+On-disk game snapshots (one file per game, written by GameState.to_bytes).
+
+    GAME_SNAPSHOT_DIR: directory for the snapshot files ("" by default: snapshots are disabled)
+
+Snapshots are written by POST /api/v2/new-game/save-progress, for sessions
+evicted from the session registry, and for every live game at shutdown. A game
+that is no longer in memory is restored from its snapshot on first access.
+
+Bulk commands against a running server, and an offline check of the files:
+    python -m app.services.game_snapshot snapshot --base-url http://localhost:7777
+    python -m app.services.game_snapshot restore --base-url http://localhost:7777
+    python -m app.services.game_snapshot inspect --dir snapshots
+"""
+import argparse
+import os
+import tempfile
+import time
+
+GAME_SNAPSHOT_DIR = os.environ.get("GAME_SNAPSHOT_DIR", "")
+SNAPSHOT_SUFFIX = ".snap"
+
+
+class SnapshotDirectory:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, game_no):
+        return os.path.join(self.directory, f"{int(game_no)}{SNAPSHOT_SUFFIX}")
+
+    # 임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 이전 또는 새 스냅샷을 봄
+    def write(self, game_no, data):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, self.path(game_no))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        return len(data)
+
+    def read(self, game_no):
+        try:
+            with open(self.path(game_no), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, game_no):
+        try:
+            os.unlink(self.path(game_no))
+        except FileNotFoundError:
+            pass
+
+    def game_numbers(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            int(name[:-len(SNAPSHOT_SUFFIX)])
+            for name in names
+            if name.endswith(SNAPSHOT_SUFFIX) and name[:-len(SNAPSHOT_SUFFIX)].lstrip("-").isdigit()
+        )
+
+
+def create_snapshot_directory(directory=None):
+    directory = GAME_SNAPSHOT_DIR if directory is None else directory
+    return SnapshotDirectory(directory) if directory else None
+
+
+def inspect(directory):
+    from app.services.game_state import GameState
+    from app.utils.catalog import get_catalog
+
+    snapshots = SnapshotDirectory(directory)
+    catalog = get_catalog()
+    total_bytes = 0
+    failed = 0
+    start = time.perf_counter()
+    game_numbers = snapshots.game_numbers()
+    for game_no in game_numbers:
+        data = snapshots.read(game_no)
+        try:
+            game_state = GameState.from_bytes(data, catalog)
+        except Exception as e:
+            failed += 1
+            print(f"{game_no}: unreadable ({e})")
+            continue
+        total_bytes += len(data)
+        print(f"{game_no}: {len(data)} bytes, day {game_state.current_day}, language {game_state.language}")
+    elapsed = time.perf_counter() - start
+    count = len(game_numbers) - failed
+    if count:
+        print(f"{count} snapshots, {total_bytes / count:.0f} bytes/game, {elapsed / count * 1e6:.0f} us/game to decode")
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["snapshot", "restore", "inspect"])
+    parser.add_argument("--base-url", default="http://localhost:7777")
+    parser.add_argument("--dir", default=GAME_SNAPSHOT_DIR or "snapshots", help="snapshot directory (inspect)")
+    args = parser.parse_args()
+
+    if args.command == "inspect":
+        raise SystemExit(1 if inspect(args.dir) else 0)
+
+    import httpx
+    response = httpx.post(f"{args.base_url}/api/v2/new-game/{args.command}-all", timeout=600)
+    response.raise_for_status()
+    print(response.json())
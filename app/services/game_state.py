@@ -0,0 +1,357 @@
+from collections.abc import Mapping
+import json
+import os
+import struct
+import time
+from types import MappingProxyType
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from app.utils.catalog import get_catalog
+
+# 스냅샷 형식: 4바이트 매직, 형식 버전(1바이트), 플래그(1바이트), 본문(JSON, 압축 가능)
+SNAPSHOT_MAGIC = b"BMGS"
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_FLAG_ZLIB = 0x01
+SNAPSHOT_HEADER = struct.Struct(">4sBB")
+# zlib 압축 수준 (0이면 압축하지 않음)
+SNAPSHOT_COMPRESSION_LEVEL = int(os.environ.get("GAME_SNAPSHOT_COMPRESSION_LEVEL", 1))
+
+
+# orjson이 설치되어 있으면 사용 (출력은 같은 JSON이므로 어느 쪽으로 저장해도 서로 읽을 수 있음)
+def dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+# 값이 아직 설정되지 않은 선택 항목 ('scenario' not in game_state 같은 검사에 사용)
+_MISSING = object()
+
+
+class NPCOverlay(Mapping):
+    """
+    One game's view of a catalog NPC.
+
+    Reads fall through to the shared, read-only catalog record (base); the
+    per-game fields (preferredWeapons, preferredLocations, alive) are stored in
+    the overlay and take precedence. Writing any other key raises TypeError, so
+    a game can never modify the catalog or another game's NPCs.
+
+    Overlays compare by identity, like the per-game NPC dicts they replace.
+    """
+    __slots__ = ("base", "preferredWeapons", "preferredLocations", "alive")
+    OVERLAY_FIELDS = ("preferredWeapons", "preferredLocations", "alive")
+
+    def __init__(self, base, preferredWeapons=_MISSING, preferredLocations=_MISSING, alive=_MISSING):
+        self.base = base
+        self.preferredWeapons = preferredWeapons
+        self.preferredLocations = preferredLocations
+        self.alive = alive
+
+    def __getitem__(self, key):
+        if key in self.OVERLAY_FIELDS:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        return self.base[key]
+
+    def __setitem__(self, key, value):
+        if key not in self.OVERLAY_FIELDS:
+            raise TypeError(f"NPC field {key!r} is read-only")
+        setattr(self, key, value)
+
+    def __iter__(self):
+        yield from self.base
+        for key in self.OVERLAY_FIELDS:
+            if key not in self.base and getattr(self, key) is not _MISSING:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    # 직렬화 (카탈로그 레코드는 id만 저장)
+
+    def to_dict(self):
+        data = {"name": self.base["name"]}
+        for key in self.OVERLAY_FIELDS:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                data[key] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data, base):
+        overlay = cls(base)
+        for key in cls.OVERLAY_FIELDS:
+            if key in data:
+                value = data[key]
+                setattr(overlay, key, tuple(value) if isinstance(value, list) else value)
+        return overlay
+
+
+# 취조 진행 상태
+class InterrogationState:
+    __slots__ = ("heart_rate", "suspect_name", "weapon", "weapon_name", "conversation_history")
+
+    def __init__(self, heart_rate, suspect_name, weapon=None, weapon_name=None, conversation_history=None):
+        self.heart_rate = heart_rate
+        self.suspect_name = suspect_name
+        self.weapon = weapon
+        self.weapon_name = weapon_name
+        self.conversation_history = conversation_history if conversation_history is not None else []
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class GameState:
+    """
+    Per-game mutable state.
+
+    Catalog data (places, weapons, NPC records) is not copied: it is read from
+    the shared GameCatalog, NPCs through per-game NPCOverlay objects. The
+    murderer and the current victim are stored as ordinals into npcs, alive
+    flags as one int bitset over the same ordinals, and murder weapons and
+    locations as catalog ids.
+
+    The services still use the original dict keys (game_state["murderer"],
+    game_state["alive"], 'scenario' in game_state, ...); they are mapped onto
+    the slots below. "alive" is a read-only view, deaths go through set_alive.
+    """
+    __slots__ = (
+        "catalog", "language", "npcs", "murderer_index", "victim_index",
+        "murder_weapon", "murder_location", "conversations_left", "current_day",
+        "alive_bits", "murdered_npcs", "conversations", "interrogation", "status_version",
+        # 게임 진행 중에 추가되는 선택 항목
+        "murder_weapons", "murder_locations", "scenario", "scenarios",
+        "current_questions", "witness", "alibis", "first_blood",
+    )
+
+    OPTIONAL_FIELDS = (
+        "murder_weapons", "murder_locations", "scenario", "scenarios",
+        "current_questions", "witness", "alibis", "first_blood",
+    )
+
+    def __init__(self, language, npcs, murderer_index, victim_index, murder_weapon, murder_location,
+                 catalog=None, conversations_left=5, current_day=1, alive_bits=None,
+                 murdered_npcs=None, conversations=None, interrogation=None, status_version=None):
+        self.catalog = catalog or get_catalog()
+        self.language = language
+        self.npcs = npcs
+        self.murderer_index = murderer_index
+        self.victim_index = victim_index
+        self.murder_weapon = murder_weapon
+        self.murder_location = murder_location
+        self.conversations_left = conversations_left
+        self.current_day = current_day
+        self.alive_bits = ((1 << len(npcs)) - 1) & ~(1 << victim_index) if alive_bits is None else alive_bits
+        self.murdered_npcs = murdered_npcs if murdered_npcs is not None else [{"name": npcs[victim_index]["name"], "day": 1}]
+        self.conversations = conversations if conversations is not None else []
+        self.interrogation = interrogation
+        # /status 응답의 버전 (같은 gameNo로 다시 시작해도 줄어들지 않도록 시작 시각(us)에서 시작)
+        self.status_version = time.time_ns() // 1000 if status_version is None else status_version
+        for name in self.OPTIONAL_FIELDS:
+            setattr(self, name, _MISSING)
+
+    # NPC 참조
+
+    @property
+    def murderer(self):
+        return self.npcs[self.murderer_index]
+
+    @murderer.setter
+    def murderer(self, npc):
+        self.murderer_index = self.index_of(npc["name"])
+
+    @property
+    def murdered_npc(self):
+        return self.npcs[self.victim_index]
+
+    @murdered_npc.setter
+    def murdered_npc(self, npc):
+        self.victim_index = self.index_of(npc["name"])
+
+    @property
+    def places(self):
+        return self.catalog.places
+
+    @property
+    def weapons(self):
+        return self.catalog.weapons
+
+    def index_of(self, npc_id):
+        for index, npc in enumerate(self.npcs):
+            if npc["name"] == npc_id:
+                return index
+        raise ValueError(f"NPC {npc_id} is not in this game")
+
+    # 생존 여부
+
+    @property
+    def alive(self):
+        return MappingProxyType({npc["name"]: bool(self.alive_bits >> index & 1) for index, npc in enumerate(self.npcs)})
+
+    def is_alive(self, npc_id):
+        for index, npc in enumerate(self.npcs):
+            if npc["name"] == npc_id:
+                return bool(self.alive_bits >> index & 1)
+        return False
+
+    def set_alive(self, npc_id, alive):
+        index = self.index_of(npc_id)
+        if alive:
+            self.alive_bits |= 1 << index
+        else:
+            self.alive_bits &= ~(1 << index)
+        self.npcs[index]["alive"] = alive
+        return self.npcs[index]
+
+    # 기존 dict 형태의 접근 (game_state["key"])
+
+    _ALIASES = {"suspects": "npcs"}
+    _READ_ONLY = frozenset(("suspects", "npcs", "places", "weapons", "alive", "catalog"))
+    _KEYS = frozenset(__slots__) | {"suspects", "murderer", "murdered_npc", "places", "weapons", "alive"}
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        value = getattr(self, self._ALIASES.get(key, key))
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        if key in self._READ_ONLY:
+            raise TypeError(f"game_state[{key!r}] is read-only")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._KEYS and getattr(self, self._ALIASES.get(key, key)) is not _MISSING
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, values):
+        for key, value in values.items():
+            self[key] = value
+
+    # 직렬화
+
+    def to_dict(self):
+        """
+        Returns a JSON-compatible dict of the game's own data (no catalog data).
+        """
+        data = {
+            "catalogVersion": self.catalog.version,
+            "language": self.language,
+            "npcs": [npc.to_dict() for npc in self.npcs],
+            "murderer_index": self.murderer_index,
+            "victim_index": self.victim_index,
+            "murder_weapon": self.murder_weapon,
+            "murder_location": self.murder_location,
+            "conversations_left": self.conversations_left,
+            "current_day": self.current_day,
+            "alive_bits": self.alive_bits,
+            "murdered_npcs": self.murdered_npcs,
+            "conversations": self.conversations,
+            "interrogation": self.interrogation.to_dict() if self.interrogation is not None else None,
+            "status_version": self.status_version,
+        }
+        for name in self.OPTIONAL_FIELDS:
+            value = getattr(self, name)
+            if value is not _MISSING:
+                data[name] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data, catalog=None):
+        """
+        Rebuilds a game from to_dict() data on top of the catalog. Raises
+        ValueError when the game refers to NPCs that the catalog no longer has
+        (e.g. removed or renamed by a catalog reload after the game was saved).
+        """
+        catalog = catalog or get_catalog()
+        bases = {npc["name"]: npc for npc in catalog.npcs}
+        missing = [npc["name"] for npc in data["npcs"] if npc["name"] not in bases]
+        if missing:
+            raise ValueError(
+                f"Game was saved with catalog version {data.get('catalogVersion')} and its NPCs "
+                f"{', '.join(missing)} are not in catalog version {catalog.version}"
+            )
+        game_state = cls(
+            data["language"],
+            [NPCOverlay.from_dict(npc, bases[npc["name"]]) for npc in data["npcs"]],
+            data["murderer_index"],
+            data["victim_index"],
+            data["murder_weapon"],
+            data["murder_location"],
+            catalog=catalog,
+            conversations_left=data["conversations_left"],
+            current_day=data["current_day"],
+            alive_bits=data["alive_bits"],
+            murdered_npcs=data["murdered_npcs"],
+            conversations=data["conversations"],
+            interrogation=InterrogationState.from_dict(data["interrogation"]) if data.get("interrogation") else None,
+            status_version=data.get("status_version", 0),
+        )
+        for name in cls.OPTIONAL_FIELDS:
+            if name in data:
+                setattr(game_state, name, data[name])
+        return game_state
+
+    def to_bytes(self, compression_level=SNAPSHOT_COMPRESSION_LEVEL):
+        """
+        Encodes the game as a snapshot: SNAPSHOT_MAGIC, format version, flags,
+        then the to_dict() JSON, zlib-compressed unless compression_level is 0.
+        """
+        payload = dumps(self.to_dict())
+        flags = 0
+        if compression_level:
+            payload = zlib.compress(payload, compression_level)
+            flags |= SNAPSHOT_FLAG_ZLIB
+        return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, flags) + payload
+
+    @classmethod
+    def from_bytes(cls, data, catalog=None):
+        if len(data) < SNAPSHOT_HEADER.size:
+            raise ValueError("Game snapshot is truncated")
+        magic, version, flags = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a game snapshot")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported game snapshot version {version}")
+        payload = memoryview(data)[SNAPSHOT_HEADER.size:]
+        if flags & SNAPSHOT_FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return cls.from_dict(loads(payload), catalog)
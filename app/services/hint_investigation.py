@@ -1,15 +1,16 @@
-from app.utils.game_utils import get_weapon_name, get_location_name
+from app.services.game_resolver import GameResolver
 
 # 게임 진행 중 힌트 조사
 class HintInvestigation:
-    def __init__(self, game_state, weapons, places):
+    def __init__(self, game_state, weapons, places, resolver=None):
         self.game_state = game_state
         self.weapons = weapons
         self.places = places
+        self.resolver = resolver or GameResolver(game_state, places=places, weapons=weapons)
 
     # 주어진 장소를 조사하여 단서를 찾는 메서드
     def investigate_location(self, location_name):
-        location = next((loc for loc in self.places if get_location_name(loc["id"], self.places, self.game_state["language"]) == location_name), None)
+        location = self.resolver.place(location_name)
         if not location:
             raise ValueError("Location not found")
 
@@ -18,7 +19,7 @@ class HintInvestigation:
 
     # 주어진 아이템을 찾아 설명을 제공하는 메서드
     def find_item(self, item_name):
-        item = next((itm for itm in self.weapons if get_weapon_name(itm["id"], self.weapons, self.game_state["language"]) == item_name), None)
+        item = self.resolver.weapon(item_name)
         if not item:
             raise ValueError("Item not found")
 
@@ -27,8 +28,34 @@ class HintInvestigation:
 
     # 주어진 무기와 장소를 기준으로 용의자를 필터링하는 메서드
     def filter_suspects(self, weapon, location):
-        suspects = []
-        for npc in self.game_state["npcs"]:
-            if any(get_weapon_name(wpn, self.weapons, self.game_state["language"]) == weapon for wpn in npc["preferredWeapons"]) and any(get_location_name(loc, self.places, self.game_state["language"]) == location for loc in npc["preferredLocations"]):
-                suspects.append(npc)
-        return suspects
+        weapon_record = self.resolver.weapon(weapon)
+        location_record = self.resolver.place(location)
+        if weapon_record is None or location_record is None:
+            return []
+        return self.resolver.filter_npcs([weapon_record["id"]], [location_record["id"]])
+
+    # 여러 무기/장소, 생존 여부, 제외할 NPC 조건으로 용의자를 필터링하는 메서드
+    # (같은 종류의 조건은 하나라도 선호하면 포함, 서로 다른 종류의 조건은 모두 만족해야 함)
+    def filter_suspects_by(self, weapons=(), locations=(), alive_only=True, excluded_npcs=()):
+        weapon_ids = []
+        for weapon in weapons:
+            weapon_record = self.resolver.weapon(weapon)
+            if weapon_record is None:
+                raise ValueError(f"Weapon {weapon} not found")
+            weapon_ids.append(weapon_record["id"])
+
+        location_ids = []
+        for location in locations:
+            location_record = self.resolver.place(location)
+            if location_record is None:
+                raise ValueError(f"Location {location} not found")
+            location_ids.append(location_record["id"])
+
+        excluded_ids = []
+        for npc_name in excluded_npcs:
+            npc = self.resolver.npc(npc_name)
+            if npc is None:
+                raise ValueError(f"NPC {npc_name} not found")
+            excluded_ids.append(npc["name"])
+
+        return self.resolver.filter_npcs(weapon_ids, location_ids, alive_only, excluded_ids)
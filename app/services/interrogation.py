@@ -3,8 +3,11 @@ import json
 import re
 from app.utils.gpt_helper import get_gpt_response
 from app.utils.memory import add_conversation, get_conversation_chain
+from app.services.game_resolver import GameResolver
+from app.services.game_state import InterrogationState
 from app.utils.game_utils import (
     create_context,
+    get_by_id,
     get_name,
     get_personality_detail,
     get_feature_detail,
@@ -15,21 +18,22 @@ from app.core.logger_config import setup_logger
 logger = setup_logger()
 
 class Interrogation:
-    def __init__(self, game_state, personalities, features, weapons, places, names):
+    def __init__(self, game_state, personalities, features, weapons, places, names, resolver=None):
         self.game_state = game_state
         self.personalities = personalities
         self.features = features
         self.weapons = weapons
         self.places = places
         self.names = names
+        self.resolver = resolver or GameResolver(game_state, names, places, weapons)
 
     def start_interrogation(self, npc_name, weapon_id):
-        npc = next((npc for npc in self.game_state["npcs"] if get_name(npc["name"], self.game_state["language"], self.names) == npc_name), None)
+        npc = self.resolver.npc(npc_name)
         
         if npc is None:
             raise ValueError(f"NPC with name {npc_name} not found")
 
-        weapon = next((w for w in self.weapons if w['id'] == weapon_id), None) if weapon_id else None
+        weapon = get_by_id(weapon_id, self.weapons) if weapon_id else None
         
         weapon_name = weapon['weapon'][self.game_state["language"]] if weapon_id else None
         # if weapon is None:
@@ -39,23 +43,22 @@ class Interrogation:
         if weapon_id in npc['preferredWeapons']:
             heart_rate = 80
 
-        self.game_state['interrogation'] = {
-            "heart_rate": heart_rate,
-            "suspect_name": npc_name,
-            "weapon": weapon_id,  # 무기의 ID를 저장
-            "weapon_name": weapon_name,  # 현재 언어로 된 무기 이름 저장
-            "conversation_history": []
-        }
+        self.game_state['interrogation'] = InterrogationState(
+            heart_rate,
+            npc_name,
+            weapon_id,  # 무기의 ID를 저장
+            weapon_name  # 현재 언어로 된 무기 이름 저장
+        )
 
-    def generate_interrogation_response(self, npc_name: str, content: str):
+    async def generate_interrogation_response(self, npc_name: str, content: str):
         logger.info(f"▶️  User message received: npc_name: {npc_name}, contents: {content}")
 
-        npc = next((npc for npc in self.game_state["npcs"] if get_name(npc["name"], self.game_state["language"], self.names) == npc_name), None)
+        npc = self.resolver.npc(npc_name)
 
-        conversation_history = self.game_state['interrogation']['conversation_history']
+        conversation_history = self.game_state['interrogation'].conversation_history
         formatted_conversation_history = "\n".join([f"{entry['role']}: {entry['content']}" for entry in conversation_history])
 
-        current_heart_rate = self.game_state['interrogation']['heart_rate']
+        current_heart_rate = self.game_state['interrogation'].heart_rate
         # print(f"current_heart_rate: {current_heart_rate}")
 
         response_prompt = (
@@ -75,7 +78,7 @@ class Interrogation:
             f"The NPC is asked: '{content}'"
         )
 
-        response_content = get_gpt_response(response_prompt, max_tokens=150)
+        response_content = await get_gpt_response(response_prompt, max_tokens=150)
     
         # JSON 파싱 시도
         try:
@@ -100,7 +103,7 @@ class Interrogation:
         # 심박수 변화 적용
         current_heart_rate += int(response['heartRateDelta'])
         current_heart_rate = min(max(current_heart_rate, 60), 130)
-        self.game_state['interrogation']['heart_rate'] = current_heart_rate
+        self.game_state['interrogation'].heart_rate = current_heart_rate
 
         # 대화 기록 추가
         conversation_history.append({"role": "user", "content": content})
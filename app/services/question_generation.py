@@ -1,41 +1,62 @@
+import asyncio
 import random
 import re
+from app.lib import const
 from app.utils.gpt_helper import get_gpt_response
 from app.utils.memory import add_conversation, get_conversation_chain
+from app.services.game_resolver import GameResolver
 from app.utils.game_utils import (
     create_context,
+    get_by_id,
     get_name,
     get_personality_detail,
     get_feature_detail,
     get_weapon_name,
     get_location_name
 )
+from app.core.logger_config import setup_logger
+logger = setup_logger()
+
+# 질문 생성에 끝내 실패한 슬롯에 사용하는 기본 질문 (alibi, weapon, location 순서)
+FALLBACK_QUESTIONS = {
+    "ko": [
+        "사건이 일어난 시간에 어디에서 무엇을 하고 있었나요?",
+        "평소에 어떤 도구를 즐겨 사용하나요?",
+        "평소에 자주 가는 장소는 어디인가요?"
+    ],
+    "en": [
+        "Where were you and what were you doing at the time of the murder?",
+        "What tools do you usually like to use?",
+        "Which places do you visit often?"
+    ]
+}
 
 # NPC 대화 생성
 class QuestionGeneration:
-    def __init__(self, game_state, personalities, features, weapons, places, names):
+    def __init__(self, game_state, personalities, features, weapons, places, names, resolver=None):
         self.game_state = game_state
         self.personalities = personalities
         self.features = features
         self.weapons = weapons
         self.places = places
         self.names = names
+        self.resolver = resolver or GameResolver(game_state, names, places, weapons)
 
     # NPC에게 질문을 생성하는 메서드
-    def generate_questions(self, npc_name, keyword=None, keyword_type=None):
+    async def generate_questions(self, npc_name, keyword=None, keyword_type=None, concurrent=True):
         if 'scenario' not in self.game_state:
             self.game_state['scenario'] = {}
 
         lang = self.game_state["language"]
-        npc = next((npc for npc in self.game_state["npcs"] if get_name(npc["name"], lang, self.names) == npc_name), None)
+        npc = self.resolver.npc(npc_name, lang)
         if not npc:
             raise ValueError("NPC not found")
 
         personality_key = npc["personality"]
         feature_key = npc["feature"]
 
-        personality = next((p for p in self.personalities if p["id"] == personality_key), None)
-        feature = next((f for f in self.features if f["id"] == feature_key), None)
+        personality = get_by_id(personality_key, self.personalities)
+        feature = get_by_id(feature_key, self.features)
 
         if personality is None or feature is None:
             raise ValueError("Personality or feature not found in NPC data")
@@ -90,21 +111,50 @@ class QuestionGeneration:
                 f"Ask them about their preferred locations."
             )
 
-        alibi_question = self.clean_response(get_gpt_response(alibi_question_prompt, max_tokens=80))
-        weapon_question = self.clean_response(get_gpt_response(weapon_question_prompt, max_tokens=80))
-        location_question = self.clean_response(get_gpt_response(location_question_prompt, max_tokens=80))
+        prompts = [alibi_question_prompt, weapon_question_prompt, location_question_prompt]
 
-        questions = [
-            {"number": 1, "question": alibi_question},
-            {"number": 2, "question": weapon_question},
-            {"number": 3, "question": location_question}
-        ]
+        # 세 질문을 동시에 생성 (결과는 프롬프트 순서대로 모음)
+        if concurrent:
+            results = await asyncio.gather(
+                *(self.generate_question(prompt) for prompt in prompts),
+                return_exceptions=True
+            )
+        else:
+            results = []
+            for prompt in prompts:
+                try:
+                    results.append(await self.generate_question(prompt))
+                except Exception as e:
+                    results.append(e)
+
+        failures = [result for result in results if isinstance(result, Exception)]
+        if len(failures) == len(results):
+            raise failures[0]
+
+        # 실패한 슬롯만 기본 질문으로 채워 부분 결과를 반환
+        fallback_questions = FALLBACK_QUESTIONS.get(lang, FALLBACK_QUESTIONS["en"])
+        questions = []
+        for number, result in enumerate(results, start=1):
+            if isinstance(result, Exception):
+                logger.warning(f"Question {number} for {npc_name} failed, using fallback question: {result!r}")
+                result = fallback_questions[number - 1]
+            questions.append({"number": number, "question": result})
 
         self.game_state["current_questions"] = questions
         return questions
 
+    # 질문 하나를 생성하는 메서드 (실패한 슬롯만 재시도)
+    async def generate_question(self, prompt, max_attempts=const.MAX_RETRY_LIMIT):
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return self.clean_response(await get_gpt_response(prompt, max_tokens=80))
+            except Exception as e:
+                if attempt >= max_attempts:
+                    raise
+                logger.warning(f"Question generation failed (attempt {attempt}/{max_attempts}), retrying: {e!r}")
+
     # NPC와 대화를 진행하는 메서드
-    def talk_to_npc(self, npc_name, question_index, keyword=None, keyword_type=None):
+    async def talk_to_npc(self, npc_name, question_index, keyword=None, keyword_type=None):
         if "current_questions" not in self.game_state:
             raise ValueError("No questions generated")
 
@@ -112,7 +162,7 @@ class QuestionGeneration:
         conversation_chain = get_conversation_chain()
 
         lang = self.game_state["language"]
-        npc = next((npc for npc in self.game_state["npcs"] if get_name(npc["name"], lang, self.names) == npc_name), None)
+        npc = self.resolver.npc(npc_name, lang)
         if not npc:
             raise ValueError("NPC not found")
 
@@ -177,7 +227,7 @@ class QuestionGeneration:
                     f"and feature '{npc['feature']}'. The NPC is asked: '{question}'. The response should clearly indicate their personality and feature."
                 )
 
-        response_content = self.clean_response(get_gpt_response(response_prompt, max_tokens=150))
+        response_content = self.clean_response(await get_gpt_response(response_prompt, max_tokens=150))
 
         add_conversation(question, response_content)
         self.game_state["conversations_left"] -= 1
@@ -1,29 +1,102 @@
+import asyncio
+import os
 import random
 import json
 import re
-from app.utils.gpt_helper import get_gpt_response
+import time
+from pydantic import ValidationError
+from app.schemas import game_schema
+from app.utils.gpt_helper import get_gpt_response, gpt_usage
+from app.services.game_resolver import GameResolver
 from app.utils.game_utils import (
     create_context,
     get_feature_detail,
     get_name,
+    get_npc_id,
     get_weapon_name,
     get_location_name,
     get_personality_detail,
     get_feature_detail
 )
+from app.core.logger_config import setup_logger
+logger = setup_logger()
+
+# 알리바이 생성 시 NPC별 동시 요청 수 상한
+ALIBI_CONCURRENCY = int(os.environ.get('ALIBI_CONCURRENCY', 9))
+
+# 알리바이 생성 방식 (parallel: NPC별 요청, batch: 한 번의 JSON 요청 후 누락분만 재생성)
+ALIBI_GENERATION_MODE = os.environ.get('ALIBI_GENERATION_MODE', "parallel")
+
+# 엔딩 편지 전체 생성 마감 시간(초), 이후 끝나지 않은 편지는 기본 편지로 대체
+END_GAME_LETTER_DEADLINE = float(os.environ.get('END_GAME_LETTER_DEADLINE', 20))
+
+# 엔딩 편지 생성이 마감 시간을 넘기거나 실패했을 때 사용하는 기본 편지 내용
+FALLBACK_LETTERS = {
+    "chief_win": {
+        "ko": "사건을 해결해 주셔서 진심으로 감사드립니다.\n마을 사람들 모두 다시 웃음을 되찾았습니다.\n좋은 날에 꼭 다시 베어타운을 찾아 주세요.",
+        "en": "Thank you from the bottom of our hearts for solving the case.\nThe whole village is smiling again.\nPlease visit Bear Town again on a happier day."
+    },
+    "chief_lose": {
+        "ko": "우리는 당신을 믿었지만 마을은 여전히 두려움에 떨고 있습니다.\n이 비극의 책임은 당신에게도 있습니다.",
+        "en": "We trusted you, yet the village still lives in fear.\nPart of this tragedy is on your hands."
+    },
+    "murderer_win": {
+        "ko": "운이 좋았군요, 탐정님.\n하지만 이게 끝이라고 생각하지 마세요.",
+        "en": "You got lucky, detective.\nDon't think this is over."
+    },
+    "murderer_lose": {
+        "ko": "수고 많으셨어요, 탐정님. 결국 아무것도 찾지 못했네요.\n다음에도 저를 잡을 수 없을 거예요.",
+        "en": "Nice try, detective. You found nothing in the end.\nYou won't catch me next time either."
+    },
+    "survivor_thanks": {
+        "ko": "탐정님 덕분에 다시 편히 잠들 수 있게 되었어요.\n정말 고마워요.",
+        "en": "Thanks to you, I can sleep peacefully again.\nThank you so much."
+    },
+    "survivor_grief": {
+        "ko": "{receiver}, 네가 너무 그리워.\n너와 함께한 날들을 영원히 잊지 않을게.",
+        "en": "{receiver}, I miss you so much.\nI will never forget the days we shared."
+    }
+}
+
+# 생성 방식별 누적 요청 수, 토큰 수, 지연 시간
+alibi_generation_stats = {
+    mode: {"runs": 0, "requests": 0, "promptTokens": 0, "completionTokens": 0, "totalTokens": 0, "latency": 0.0, "regenerated": 0}
+    for mode in ("parallel", "batch")
+}
+
+
+def record_alibi_generation(mode, usage, latency, regenerated=0):
+    stats = alibi_generation_stats[mode]
+    stats["runs"] += 1
+    stats["requests"] += usage.requests
+    stats["promptTokens"] += usage.prompt_tokens
+    stats["completionTokens"] += usage.completion_tokens
+    stats["totalTokens"] += usage.total_tokens
+    stats["latency"] += latency
+    stats["regenerated"] += regenerated
+    logger.info(f"Alibi generation ({mode}): {usage.requests} requests, {usage.total_tokens} tokens, {latency:.3f}s, {regenerated} regenerated")
+
+
+def get_alibi_generation_stats():
+    return {
+        mode: {**stats, "avgLatency": round(stats["latency"] / stats["runs"], 3) if stats["runs"] else 0.0}
+        for mode, stats in alibi_generation_stats.items()
+    }
+
 
 # 게임 시나리오 생성
 class ScenarioGeneration:
-    def __init__(self, game_state, personalities, features, weapons, places, names):
+    def __init__(self, game_state, personalities, features, weapons, places, names, resolver=None):
         self.game_state = game_state
         self.personalities = personalities
         self.features = features
         self.weapons = weapons
         self.places = places
         self.names = names
+        self.resolver = resolver or GameResolver(game_state, names, places, weapons)
 
     # 초기 게임 시나리오를 생성하는 메서드
-    def create_initial_scenario(self):
+    async def create_initial_scenario(self):
         lang = self.game_state["language"]
         context = create_context(self.game_state, self.personalities, self.features, self.weapons, self.places, self.names)
         
@@ -43,14 +116,14 @@ class ScenarioGeneration:
             f"Write the story in {lang}."
         )
 
-        scenario_description = get_gpt_response(prompt, max_tokens=1000)
+        scenario_description = await get_gpt_response(prompt, max_tokens=1000)
 
         return {
             "description": scenario_description
         }
 
     # 게임 진행 중 시나리오를 생성하는 메서드
-    def create_progress_scenario(self):
+    async def create_progress_scenario(self):
         lang = self.game_state["language"]
         previous_scenarios = self.game_state.get('scenarios', [])
         previous_scenarios_text = "\n".join(previous_scenarios)
@@ -75,7 +148,7 @@ class ScenarioGeneration:
             f"Write the story in {lang}."
         )
 
-        scenario_description = get_gpt_response(prompt, max_tokens=1000)
+        scenario_description = await get_gpt_response(prompt, max_tokens=1000)
         self.game_state.setdefault('scenarios', []).append(scenario_description)
 
         return {
@@ -93,7 +166,7 @@ class ScenarioGeneration:
             return f"the {day_descriptions_en[day - 1]} morning"
 
     # 촌장의 편지를 생성하는 메서드
-    def generate_chief_letter(self):
+    async def generate_chief_letter(self):
         lang = self.game_state["language"]
         context = create_context(self.game_state, self.personalities, self.features, self.weapons, self.places, self.names)
 
@@ -126,7 +199,7 @@ class ScenarioGeneration:
         }}
         """
 
-        chief_letter = get_gpt_response(prompt, max_tokens=300)
+        chief_letter = await get_gpt_response(prompt, max_tokens=300)
 
         # Remove any code block formatting
         chief_letter = re.sub(r'```json\s*|\s*```', '', chief_letter)
@@ -156,72 +229,34 @@ class ScenarioGeneration:
         return letter_parts
 
     # 알리바이와 목격자 정보를 생성하는 메서드
-    def generate_alibis_and_witness(self):
+    async def generate_alibis_and_witness(self, max_concurrency=None, mode=None):
+        mode = mode or ALIBI_GENERATION_MODE
+        if mode not in alibi_generation_stats:
+            raise ValueError(f"Invalid alibi generation mode: {mode}")
+
         lang = self.game_state["language"]
-        alive_npcs = [npc for npc in self.game_state["npcs"] if self.game_state['alive'][npc['name']]]
+        alive_npcs = self.resolver.living_npcs()
         victim_name = get_name(self.game_state["murdered_npc"]["name"], lang, self.names)
         murder_location = get_location_name(self.game_state["murder_location"], self.places, lang)
-        murder_weapon = get_weapon_name(self.game_state["murder_weapon"], self.weapons, lang)
 
         # 목격자 선택 (범인 제외)
         potential_witnesses = [npc for npc in alive_npcs if npc['name'] != self.game_state['murderer']['name']]
         witness = random.choice(potential_witnesses)
         witness_name = get_name(witness['name'], lang, self.names)
-        
-        alibis = {}
-        for npc in alive_npcs:
-            npc_name = get_name(npc['name'], lang, self.names)
-            personality = get_personality_detail(npc['personality'], self.personalities, lang)
-            feature = get_feature_detail(npc['feature'], self.features, lang)
-            
-            if npc == witness:
-                prompt = f"""
-                As an eyewitness in a murder mystery game set in Bear Town, create a brief account in {lang}.
-                You are {npc_name}, with the personality trait of being {personality} and the feature of {feature}.
-                You witnessed the murder of {victim_name} at {murder_location}.
-                Your account should:
-                1. Be vague about the killer's identity
-                2. Mention something unusual you noticed
-                3. Reflect your personality and feature in your statement
-                4. Be no longer than 3 sentences
-
-                Respond only with the eyewitness account, without any additional text.
-                """
-                eyewitness_info = get_gpt_response(prompt, max_tokens=150)
-                self.game_state['witness'] = {
-                    'name': npc_name,
-                    'information': eyewitness_info
-                }
-                alibis[npc_name] = f"{eyewitness_info}"
-            elif npc['name'] == self.game_state['murderer']['name']:
-                prompt = f"""
-                Create a convincing alibi in {lang} for the murderer {npc_name} in a murder mystery game set in Bear Town.
-                {npc_name} has the personality trait of being {personality} and the feature of {feature}.
-                The alibi should:
-                1. Be plausible and avoid any connection to the crime scene ({murder_location})
-                2. Reflect the NPC's personality and feature
-                3. Be detailed enough to seem credible
-                4. Be no longer than 3 sentences
-
-                Respond only with the alibi, without any additional text.
-                """
+
+        start_time = time.perf_counter()
+        regenerated = 0
+        with gpt_usage() as usage:
+            if mode == "batch":
+                alibis, regenerated = await self.generate_alibis_batch(alive_npcs, witness, victim_name, murder_location, max_concurrency)
             else:
-                prompt = f"""
-                Create a brief alibi in {lang} for an NPC named {npc_name} in a murder mystery game set in Bear Town.
-                {npc_name} has the personality trait of being {personality} and the feature of {feature}.
-                The alibi should:
-                1. Be plausible and can be related to any location or activity
-                2. Not necessarily provide a solid alibi for the time of the murder
-                3. Reflect the NPC's personality and feature
-                4. Be no longer than 2 sentences
-
-                Respond only with the alibi, without any additional text.
-                """
-            
-            if npc != witness:
-                alibi = get_gpt_response(prompt, max_tokens=100)
-                alibis[npc_name] = alibi
+                alibis = await self.generate_alibis_parallel(alive_npcs, witness, victim_name, murder_location, max_concurrency)
+        record_alibi_generation(mode, usage, time.perf_counter() - start_time, regenerated)
 
+        self.game_state['witness'] = {
+            'name': witness_name,
+            'information': alibis[witness_name]
+        }
         self.game_state['alibis'] = alibis
 
         return {
@@ -229,23 +264,149 @@ class ScenarioGeneration:
             "alibis": alibis
         }
 
+    # NPC마다 요청을 하나씩 동시에 보내 알리바이를 생성하는 메서드
+    async def generate_alibis_parallel(self, npcs, witness, victim_name, murder_location, max_concurrency=None):
+        lang = self.game_state["language"]
+
+        # NPC별 요청을 동시에 보내되 동시 요청 수는 제한
+        semaphore = asyncio.Semaphore(max_concurrency or ALIBI_CONCURRENCY)
+
+        async def generate(npc):
+            prompt, max_tokens = self.build_alibi_prompt(npc, witness, victim_name, murder_location)
+            async with semaphore:
+                return await get_gpt_response(prompt, max_tokens=max_tokens)
+
+        results = await asyncio.gather(*(generate(npc) for npc in npcs))
+
+        # 결과는 NPC 순서대로 정리
+        return {get_name(npc['name'], lang, self.names): result for npc, result in zip(npcs, results)}
+
+    # 한 번의 요청으로 모든 NPC의 알리바이를 JSON으로 생성하고, 누락되거나 잘못된 항목만 개별 재생성하는 메서드
+    async def generate_alibis_batch(self, npcs, witness, victim_name, murder_location, max_concurrency=None):
+        lang = self.game_state["language"]
+        npc_names = [get_name(npc['name'], lang, self.names) for npc in npcs]
+
+        prompt = self.build_batch_alibi_prompt(npcs, witness, victim_name, murder_location)
+        response = await get_gpt_response(prompt, max_tokens=120 * len(npcs) + 50)
+        response = re.sub(r'```json\s*|\s*```', '', response)
+
+        try:
+            batch_alibis = game_schema.BatchAlibisSchema(**json.loads(response)).alibis
+        except (json.JSONDecodeError, TypeError, ValidationError):
+            batch_alibis = {}
+
+        missing_npcs = [npc for npc, npc_name in zip(npcs, npc_names) if npc_name not in batch_alibis]
+        if missing_npcs:
+            logger.warning(f"Batch alibi generation missed {len(missing_npcs)}/{len(npcs)} NPCs, regenerating individually")
+            batch_alibis.update(await self.generate_alibis_parallel(missing_npcs, witness, victim_name, murder_location, max_concurrency))
+
+        return {npc_name: batch_alibis[npc_name] for npc_name in npc_names}, len(missing_npcs)
+
+    # 배치 알리바이 생성용 프롬프트를 반환하는 메서드
+    def build_batch_alibi_prompt(self, npcs, witness, victim_name, murder_location):
+        lang = self.game_state["language"]
+
+        character_lines = []
+        for npc in npcs:
+            npc_name = get_name(npc['name'], lang, self.names)
+            personality = get_personality_detail(npc['personality'], self.personalities, lang)
+            feature = get_feature_detail(npc['feature'], self.features, lang)
+
+            if npc == witness:
+                instruction = (
+                    f"Eyewitness. Write a brief account of witnessing the murder of {victim_name} at {murder_location}. "
+                    f"Be vague about the killer's identity and mention something unusual you noticed. No longer than 3 sentences."
+                )
+            elif npc['name'] == self.game_state['murderer']['name']:
+                instruction = (
+                    f"Murderer. Write a convincing alibi that avoids any connection to the crime scene ({murder_location}) "
+                    f"and is detailed enough to seem credible. No longer than 3 sentences."
+                )
+            else:
+                instruction = (
+                    "Write a brief, plausible alibi that can be related to any location or activity "
+                    "and need not be solid for the time of the murder. No longer than 2 sentences."
+                )
+            character_lines.append(f"- {npc_name} (personality: {personality}, feature: {feature}): {instruction}")
+        characters = "\n".join(character_lines)
+
+        prompt = f"""
+        Create statements in {lang} for the residents of Bear Town in a murder mystery game.
+        {victim_name} was murdered last night at {murder_location}.
+        Write one statement for each character below, following the instruction given for that character.
+        Each statement should reflect the character's personality and feature.
+
+        {characters}
+
+        Return only a JSON object in the following format, without any additional formatting or code blocks.
+        Use the character names exactly as written above as the keys.
+        {{
+            "alibis": {{"character name": "statement"}}
+        }}
+        """
+        return prompt
+
+    # NPC 역할(목격자, 범인, 그 외)에 맞는 알리바이 프롬프트와 최대 토큰 수를 반환하는 메서드
+    def build_alibi_prompt(self, npc, witness, victim_name, murder_location):
+        lang = self.game_state["language"]
+        npc_name = get_name(npc['name'], lang, self.names)
+        personality = get_personality_detail(npc['personality'], self.personalities, lang)
+        feature = get_feature_detail(npc['feature'], self.features, lang)
+
+        if npc == witness:
+            prompt = f"""
+            As an eyewitness in a murder mystery game set in Bear Town, create a brief account in {lang}.
+            You are {npc_name}, with the personality trait of being {personality} and the feature of {feature}.
+            You witnessed the murder of {victim_name} at {murder_location}.
+            Your account should:
+            1. Be vague about the killer's identity
+            2. Mention something unusual you noticed
+            3. Reflect your personality and feature in your statement
+            4. Be no longer than 3 sentences
+
+            Respond only with the eyewitness account, without any additional text.
+            """
+            return prompt, 150
+        elif npc['name'] == self.game_state['murderer']['name']:
+            prompt = f"""
+            Create a convincing alibi in {lang} for the murderer {npc_name} in a murder mystery game set in Bear Town.
+            {npc_name} has the personality trait of being {personality} and the feature of {feature}.
+            The alibi should:
+            1. Be plausible and avoid any connection to the crime scene ({murder_location})
+            2. Reflect the NPC's personality and feature
+            3. Be detailed enough to seem credible
+            4. Be no longer than 3 sentences
+
+            Respond only with the alibi, without any additional text.
+            """
+        else:
+            prompt = f"""
+            Create a brief alibi in {lang} for an NPC named {npc_name} in a murder mystery game set in Bear Town.
+            {npc_name} has the personality trait of being {personality} and the feature of {feature}.
+            The alibi should:
+            1. Be plausible and can be related to any location or activity
+            2. Not necessarily provide a solid alibi for the time of the murder
+            3. Reflect the NPC's personality and feature
+            4. Be no longer than 2 sentences
+
+            Respond only with the alibi, without any additional text.
+            """
+        return prompt, 100
+
     def update_game_state_with_murder(self):
         lang = self.game_state["language"]
         
         print("Current npcs:", [get_name(npc['name'], 'ko', self.names) for npc in self.game_state['npcs']])
         print("Current alive:", {get_name(name, 'ko', self.names): status for name, status in self.game_state['alive'].items()})
         
-        remaining_npcs = [npc for npc in self.game_state['npcs'] if self.game_state['alive'][npc['name']]]
+        remaining_npcs = self.resolver.living_npcs()
         print("Remaining NPCs:", [get_name(npc['name'], 'ko', self.names) for npc in remaining_npcs])
         
         if len(remaining_npcs) <= 2:
             raise ValueError(f"Not enough NPCs to continue the game. Only {len(remaining_npcs)} NPCs left.")
 
         new_victim = random.choice(remaining_npcs)
-        for npc in self.game_state["npcs"]:
-            if npc["name"] == new_victim["name"]:
-                self.game_state['alive'][npc['name']] = False
-                break
+        self.resolver.set_alive(new_victim["name"], False)
         self.game_state['murdered_npcs'].append({"name": new_victim['name'], "order": self.game_state['current_day'] + 1})
 
         # 새로운 범행 도구와 장소를 할당
@@ -271,7 +432,7 @@ class ScenarioGeneration:
         }
 
     # 다음 날로 넘어가는 메서드
-    def proceed_to_next_day(self, living_characters):
+    async def proceed_to_next_day(self, living_characters):
         print("Initial living_characters:", [npc['name'] for npc in living_characters])
 
         # 게임 상태 업데이트
@@ -288,7 +449,7 @@ class ScenarioGeneration:
 
         # 시나리오 생성 및 알리바이 생성
         murder_summary = self.create_murder_summary()
-        alibis_and_witness = self.generate_alibis_and_witness()
+        alibis_and_witness = await self.generate_alibis_and_witness()
 
         lang = self.game_state["language"]
         victim_name = get_name(self.game_state["murdered_npc"]["name"], lang, self.names)
@@ -312,32 +473,24 @@ class ScenarioGeneration:
         return result
 
     def update_game_state(self, living_characters):
+        # 전달받은 생존 정보에 없는 NPC는 사망 처리
+        statuses = {lc['name']: lc['status'] for lc in living_characters}
         for npc in self.game_state['npcs']:
             npc_korean_name = get_name(npc['name'], self.game_state['language'], self.names)
-            living_npc = next((lc for lc in living_characters if lc['name'] == npc_korean_name), None)
-            
-            if living_npc:
-                npc['alive'] = living_npc['status'] == "ALIVE"
-            else:
-                npc['alive'] = False
-            
-            self.game_state['alive'][npc['name']] = npc['alive']
+            self.resolver.set_alive(npc['name'], statuses.get(npc_korean_name) == "ALIVE")
 
-        # NPC 목록 업데이트
-        self.game_state['alive'][npc['name']] = npc['alive']
         print("Updated npcs:", [f"{get_name(npc['name'], self.game_state['language'], self.names)} - Alive: {npc['alive']}" for npc in self.game_state['npcs']])
         print("Updated alive:", self.game_state['alive'])
 
     def select_new_victim(self):
         murderer_id = self.game_state['murderer']['name']
-        potential_victims = [npc for npc in self.game_state['npcs'] if npc['name'] != murderer_id and npc['alive']]
+        potential_victims = [npc for npc in self.resolver.living_npcs() if npc['name'] != murderer_id]
         
         if not potential_victims:
             raise ValueError("No potential victims left")
 
         new_victim = random.choice(potential_victims)
-        new_victim['alive'] = False
-        self.game_state['alive'][new_victim['name']] = False
+        self.resolver.set_alive(new_victim['name'], False)
         self.game_state['murdered_npc'] = new_victim
         self.game_state['murdered_npcs'].append({"name": new_victim['name'], "day": self.game_state['current_day'] + 1})
 
@@ -365,16 +518,21 @@ class ScenarioGeneration:
 
     # NPC 한글 이름을 ID로 변환하는 메서드
     def get_npc_id_by_korean_name(self, korean_name):
-        for name in self.names:
-            if name['name']['ko'] == korean_name:
-                return name['id']
+        npc = self.resolver.npc(korean_name, 'ko')
+        if npc is not None:
+            return npc['name']
+        npc_id = get_npc_id(korean_name, 'ko', self.names)
+        if npc_id is not None:
+            return npc_id
         print(f"Warning: No matching ID found for Korean name '{korean_name}'")
         return None
 
     # 편지 내용을 생성하고 형식을 맞추는 메서드
-    def generate_letter(self, prompt, receiver, sender, max_tokens=300):
-        content = get_gpt_response(prompt, max_tokens=max_tokens)
-        
+    async def generate_letter(self, prompt, receiver, sender, max_tokens=300):
+        content = await get_gpt_response(prompt, max_tokens=max_tokens)
+        return self.format_letter(content, receiver, sender)
+
+    def format_letter(self, content, receiver, sender):
         letter_parts = {
             "receiver": f"{receiver}\n",
             "content": f"{content.strip()}\n",
@@ -383,8 +541,95 @@ class ScenarioGeneration:
         
         return letter_parts
 
+    # 편지 생성 작업(프롬프트, 수신자, 발신자, 마감 시 사용할 기본 편지)을 만드는 메서드
+    def letter_job(self, prompt, receiver, sender, fallback_kind, max_tokens=300):
+        lang = self.game_state["language"]
+        templates = FALLBACK_LETTERS[fallback_kind]
+        fallback_content = templates.get(lang, templates["en"]).format(receiver=receiver, sender=sender)
+        return {
+            "prompt": prompt,
+            "receiver": receiver,
+            "sender": sender,
+            "max_tokens": max_tokens,
+            "fallback": self.format_letter(fallback_content, receiver, sender)
+        }
+
+    async def generate_letter_job(self, job):
+        return await self.generate_letter(job["prompt"], job["receiver"], job["sender"], max_tokens=job["max_tokens"])
+
+    # 게임 결과에 따라 엔딩 편지 생성 작업 목록을 만드는 메서드 (type, index, job)
+    def build_end_game_letters(self, game_result):
+        if game_result == "WIN":
+            letters = [
+                ("chiefLetter", None, self.build_chief_win_letter()),
+                ("murdererLetter", None, self.build_murderer_win_letter())
+            ]
+            letters += [("survivorsLetters", index, job) for index, job in enumerate(self.build_survivors_letter())]
+            return letters
+        elif game_result == "LOSE":
+            return [
+                ("chiefLetter", None, self.build_chief_lose_letter()),
+                ("murdererLetter", None, self.build_murderer_lose_letter())
+            ]
+        else:
+            raise ValueError("Invalid game result")
+
+    # 편지들을 동시에 생성하고 완성되는 순서대로 (type, index, job, letter, fallback 여부)를 반환하는 메서드
+    # 마감 시간까지 끝나지 않았거나 실패한 편지는 기본 편지로 대체
+    async def stream_letters(self, letters, deadline=None):
+        deadline = END_GAME_LETTER_DEADLINE if deadline is None else deadline
+        loop = asyncio.get_running_loop()
+        end_time = loop.time() + deadline
+
+        tasks = {asyncio.ensure_future(self.generate_letter_job(job)): (letter_type, index, job) for letter_type, index, job in letters}
+        pending = set(tasks)
+        try:
+            while pending:
+                timeout = end_time - loop.time()
+                if timeout <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    letter_type, index, job = tasks[task]
+                    if task.exception() is not None:
+                        logger.warning(f"{letter_type} generation failed, using fallback letter: {task.exception()!r}")
+                        yield letter_type, index, job, job["fallback"], True
+                    else:
+                        yield letter_type, index, job, task.result(), False
+
+            for task in pending:
+                task.cancel()
+                letter_type, index, job = tasks[task]
+                logger.warning(f"{letter_type} generation exceeded {deadline}s deadline, using fallback letter")
+                yield letter_type, index, job, job["fallback"], True
+            pending = set()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # 엔딩 편지들을 동시에 생성하여 기존 응답 형태로 모으는 메서드
+    async def generate_end_game_letters(self, game_result, deadline=None):
+        letters = self.build_end_game_letters(game_result)
+        # 응답 키 순서는 완성 순서와 관계없이 기존 형태를 유지
+        result = {"result": game_result}
+        result.update({letter_type: None for letter_type, _, _ in letters if letter_type != "survivorsLetters"})
+        survivors_letters = [None] * sum(1 for letter_type, _, _ in letters if letter_type == "survivorsLetters")
+
+        async for letter_type, index, job, letter, _ in self.stream_letters(letters, deadline):
+            if letter_type == "survivorsLetters":
+                survivors_letters[index] = {"name": job["sender"], "letter": letter}
+            else:
+                result[letter_type] = letter
+
+        if game_result == "WIN":
+            result["survivorsLetters"] = survivors_letters
+        return result
+
     # 승리 시 촌장의 감사 편지를 생성하는 메서드
-    def generate_chief_win_letter(self):
+    async def generate_chief_win_letter(self):
+        return await self.generate_letter_job(self.build_chief_win_letter())
+
+    def build_chief_win_letter(self):
         lang = self.game_state["language"]
         receiver = "탐정" if lang == "ko" else "Detective"
         sender = "베어타운 촌장" if lang == "ko" else "Chief of Bear Town"
@@ -399,10 +644,13 @@ class ScenarioGeneration:
         5. Do not include any closing remarks like '올림' or 'Sincerely'
         """
 
-        return self.generate_letter(prompt, receiver, sender)
+        return self.letter_job(prompt, receiver, sender, "chief_win")
 
     # 패배 시 촌장의 원망 편지를 생성하는 메서드
-    def generate_chief_lose_letter(self):
+    async def generate_chief_lose_letter(self):
+        return await self.generate_letter_job(self.build_chief_lose_letter())
+
+    def build_chief_lose_letter(self):
         lang = self.game_state["language"]
         receiver = "탐정" if lang == "ko" else "Detective"
         sender = "베어타운 촌장" if lang == "ko" else "Chief of Bear Town"
@@ -426,16 +674,21 @@ class ScenarioGeneration:
         Do not include any explanations or additional text. Write only the letter content.
         """
 
-        return self.generate_letter(prompt, receiver, sender)
+        return self.letter_job(prompt, receiver, sender, "chief_lose")
 
     # 승리 시 생존자들의 감사 편지를 생성하는 메서드
-    def generate_survivors_letter(self):
+    async def generate_survivors_letter(self):
+        jobs = self.build_survivors_letter()
+        letters = await asyncio.gather(*(self.generate_letter_job(job) for job in jobs))
+        return [{"name": job["sender"], "letter": letter} for job, letter in zip(jobs, letters)]
+
+    def build_survivors_letter(self):
         lang = self.game_state["language"]
         murderer = self.game_state["murderer"]
         surviving_npcs = [npc for npc in self.game_state["npcs"] if self.game_state['alive'][npc['name']] and npc != murderer]
         dead_npcs = [npc for npc in self.game_state["npcs"] if not self.game_state['alive'][npc['name']] and npc != murderer]
         
-        letters = []
+        jobs = []
         for npc in surviving_npcs:
             npc_name = get_name(npc['name'], lang, self.names)
             personality = get_personality_detail(npc['personality'], self.personalities, lang)
@@ -463,6 +716,7 @@ class ScenarioGeneration:
 
                 The letter should make the reader feel the depth of the writer's sorrow and the impact of the loss.
                 """
+                fallback_kind = "survivor_grief"
             else:
                 receiver = "탐정" if lang == "ko" else "Detective"
                 sender = npc_name
@@ -477,14 +731,17 @@ class ScenarioGeneration:
                 5. Be about 1-2 sentences long
                 6. Do not include any closing remarks like '올림' or 'Sincerely'
                 """
+                fallback_kind = "survivor_thanks"
             
-            letter = self.generate_letter(prompt, receiver, sender, max_tokens=150)
-            letters.append({"name": sender, "letter": letter})
+            jobs.append(self.letter_job(prompt, receiver, sender, fallback_kind, max_tokens=150))
         
-        return letters
+        return jobs
 
     # 승리 시 범인의 협박 편지를 생성하는 메서드
-    def generate_murderer_win_letter(self):
+    async def generate_murderer_win_letter(self):
+        return await self.generate_letter_job(self.build_murderer_win_letter())
+
+    def build_murderer_win_letter(self):
         lang = self.game_state["language"]
         murderer = self.game_state["murderer"]
         murderer_name = get_name(murderer['name'], lang, self.names)
@@ -515,10 +772,13 @@ class ScenarioGeneration:
         Do not include any explanations or additional text. Write only the letter content.
         """
 
-        return self.generate_letter(prompt, receiver, sender, max_tokens=250)
+        return self.letter_job(prompt, receiver, sender, "murderer_win", max_tokens=250)
 
     # 패배 시 범인의 놀림 편지를 생성하는 메서드
-    def generate_murderer_lose_letter(self):
+    async def generate_murderer_lose_letter(self):
+        return await self.generate_letter_job(self.build_murderer_lose_letter())
+
+    def build_murderer_lose_letter(self):
         lang = self.game_state["language"]
         murderer = self.game_state["murderer"]
         murderer_name = get_name(murderer['name'], lang, self.names)
@@ -550,4 +810,4 @@ class ScenarioGeneration:
         Do not include any explanations or additional text. Write only the letter content.
         """
 
-        return self.generate_letter(prompt, receiver, sender, max_tokens=250)
+        return self.letter_job(prompt, receiver, sender, "murderer_lose", max_tokens=250)
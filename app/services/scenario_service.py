@@ -70,6 +70,21 @@ def select_random_character(candidates: list, excluded_characters: list):
         return random.choice(valid_characters)
     return None
 
+def select_random_characters(candidates: list, excluded_characters: list, count: int):
+    """
+    지정된 캐릭터를 제외하고 목록에서 서로 다른 캐릭터를 무작위로 여러 명 선택합니다.
+
+    Args:
+        candidates (list): 선택할 후보 캐릭터 목록.
+        excluded_characters (list): 선택에서 제외할 캐릭터 이름 목록.
+        count (int): 선택할 캐릭터 수.
+
+    Returns:
+        무작위로 선택된 Character 객체 목록. 유효한 캐릭터가 부족하면 count보다 적을 수 있습니다.
+    """
+    valid_characters = get_characters_info(candidates, excluded_characters)
+    return random.sample(valid_characters, min(count, len(valid_characters)))
+
 def get_characters_info(candidates: list, excluded_characters: list):
     """
     지정된 캐릭터를 제외하고 캐릭터 목록에 대한 정보를 가져옵니다.
@@ -124,13 +139,14 @@ def translate_place_name_ko_to_en(place_list: list, ko_name: str):
 
 
 # IO
-def generate_victim_input(victim_generation_data):
+def generate_victim_input(victim_generation_data, victim=None):
     """
     피해자 생성을 위해 필요한 입력 데이터를 JSON 형식과 Pydantic 모델 형식으로 생성합니다.
     관련된 캐릭터의 존재 여부를 확인하고 피해자와 목격자 역할을 위한 무작위 캐릭터를 선택합니다.
 
     Args:
         victim_generation_data (object): 피해자 생성에 필요한 정보를 포함하는 데이터 구조.
+        victim (object, optional): 미리 선택한 피해자 Character 객체. 없으면 무작위로 선택합니다.
 
     Returns:
         JSON 형식 및 Pydantic 모델 형식의 입력 데이터 튜플 또는 검증 실패 시 (None, None).
@@ -138,7 +154,8 @@ def generate_victim_input(victim_generation_data):
     muderer_info = get_character_criminal_scenario(victim_generation_data.murderer)
 
     crime_scene = select_crime_scene(place_data.places)
-    victim = select_random_character(victim_generation_data.livingCharacters, victim_generation_data.murderer)
+    if victim is None:
+        victim = select_random_character(victim_generation_data.livingCharacters, victim_generation_data.murderer)
 
     excluded_characters = [victim_generation_data.murderer, victim.name]
     witness = select_random_character(victim_generation_data.livingCharacters, excluded_characters)
@@ -169,6 +186,33 @@ def generate_victim_input(victim_generation_data):
     input_data_pydantic = scenario_crud_schema.VictimGenerationContainer(**input_data_json)
     return input_data_json, input_data_pydantic
 
+def generate_victim_plan_inputs(victim_generation_data, plan_count: int = 2):
+    """
+    서로 다른 피해자를 미리 선택하여 여러 피해자 계획(plan A, plan B, ...)의 입력 데이터를 한 번에 생성합니다.
+    앞선 계획의 피해자는 다음 계획의 생존 캐릭터 목록에서 제외되므로 각 계획을 동시에 생성할 수 있습니다.
+
+    Args:
+        victim_generation_data (object): 피해자 생성에 필요한 정보를 포함하는 데이터 구조.
+        plan_count (int): 생성할 계획 수.
+
+    Returns:
+        (계획별 원본 데이터, JSON 형식 입력 데이터, Pydantic 모델 형식 입력 데이터) 튜플 목록
+        또는 서로 다른 피해자를 plan_count명 선택할 수 없는 경우 None.
+    """
+    victims = select_random_characters(victim_generation_data.livingCharacters, [victim_generation_data.murderer], plan_count)
+    if len(victims) < plan_count:
+        return None
+
+    plan_inputs = []
+    plan_data = victim_generation_data
+    for victim in victims:
+        input_data_json, input_data_pydantic = generate_victim_input(plan_data, victim)
+        plan_inputs.append((plan_data, input_data_json, input_data_pydantic))
+        plan_data = plan_data.model_copy(update={
+            "livingCharacters": [character for character in plan_data.livingCharacters if character.name != victim.name]
+        })
+    return plan_inputs
+
 def generate_victim_output(answer, input_data, origin_data):
     """
     피해자 생성 시나리오 결과를 처리하여 JSON 형식의 출력 데이터를 생성합니다.
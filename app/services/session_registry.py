@@ -0,0 +1,173 @@
+from collections import OrderedDict
+import os
+import threading
+import time
+
+from app.core.logger_config import setup_logger
+logger = setup_logger()
+
+# 마지막 접근 이후 게임 세션을 유지하는 시간 (초, 0이면 만료 없음)
+SESSION_IDLE_TTL = float(os.environ.get("GAME_SESSION_IDLE_TTL", 6 * 60 * 60))
+# 동시에 유지할 최대 게임 세션 수 (초과 시 가장 오래 사용되지 않은 세션부터 제거)
+SESSION_MAX_COUNT = int(os.environ.get("GAME_SESSION_MAX_COUNT", 10000))
+
+
+# 게임 하나에 속한 상태와 서비스 객체
+class GameSession:
+    __slots__ = (
+        "game_no", "game_management", "game_state", "resolver",
+        "question_generation", "hint_investigation", "scenario_generation", "interrogation",
+        "status_view", "version", "journaled", "created_at", "last_access",
+    )
+
+    def __init__(self, game_no, game_management, game_state, resolver,
+                 question_generation, hint_investigation, scenario_generation, interrogation, status_view=None):
+        self.game_no = game_no
+        self.game_management = game_management
+        self.game_state = game_state
+        self.resolver = resolver
+        self.question_generation = question_generation
+        self.hint_investigation = hint_investigation
+        self.scenario_generation = scenario_generation
+        self.interrogation = interrogation
+        # /status 응답 캐시 (GameStatusView)
+        self.status_view = status_view
+        # 저장소에 저장된 버전 (0이면 아직 저장되지 않음)
+        self.version = 0
+        # 저널에 마지막으로 기록한 필드별 인코딩 (None이면 다음 기록은 전체 상태)
+        self.journaled = None
+        self.created_at = self.last_access = time.monotonic()
+
+
+class SessionRegistry:
+    """
+    gameNo별 게임 세션 저장소.
+
+    세션은 마지막 접근 순서로 유지되며, 접근 시점에 idle_ttl이 지난 세션과
+    max_sessions를 넘는 가장 오래된 세션을 제거합니다. 제거된 세션은 등록된
+    eviction hook(hook(session, reason), reason은 "idle" 또는 "capacity")에
+    전달되어 저장소 등에 보존될 수 있습니다. end_game처럼 명시적으로 제거하는
+    경우(remove)에는 hook을 호출하지 않습니다.
+
+    set_in_use_check(check)로 등록한 check(gameNo)가 참인 세션(예: 게임 락을 잡고
+    LLM 응답을 기다리는 작업이 있는 세션)은 제거하지 않고 건너뛰며, 작업이 끝난 뒤
+    다음 접근 시점에 제거됩니다. 진행 중인 세션을 제거하면 반쯤 바뀐 상태가 hook으로
+    보존되고 작업의 저장은 더 이상 등록되지 않은 세션에 남기 때문입니다.
+    """
+
+    def __init__(self, idle_ttl=SESSION_IDLE_TTL, max_sessions=SESSION_MAX_COUNT, clock=time.monotonic):
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._eviction_hooks = []
+        self._in_use = None
+        self.created = 0
+        self.removed = 0
+        self.evictions = {"idle": 0, "capacity": 0}
+
+    def add_eviction_hook(self, hook):
+        self._eviction_hooks.append(hook)
+
+    def set_in_use_check(self, check):
+        self._in_use = check
+
+    def add(self, session):
+        session.created_at = session.last_access = self.clock()
+        with self._lock:
+            self._sessions.pop(session.game_no, None)
+            self._sessions[session.game_no] = session
+            self.created += 1
+            evicted = self._collect_evictions(session.last_access, keep=session.game_no)
+        self._run_hooks(evicted)
+        return session
+
+    def get(self, game_no):
+        now = self.clock()
+        with self._lock:
+            evicted = self._collect_evictions(now)
+            session = self._sessions.get(game_no)
+            if session is not None:
+                session.last_access = now
+                self._sessions.move_to_end(game_no)
+        self._run_hooks(evicted)
+        return session
+
+    # 마지막 접근 시각과 순서를 바꾸지 않고 조회 (저널 압축 등 백그라운드 작업용)
+    def peek(self, game_no):
+        with self._lock:
+            return self._sessions.get(game_no)
+
+    def remove(self, game_no):
+        with self._lock:
+            session = self._sessions.pop(game_no, None)
+            if session is not None:
+                self.removed += 1
+        return session
+
+    def evict_expired(self):
+        with self._lock:
+            evicted = self._collect_evictions(self.clock())
+        self._run_hooks(evicted)
+        return len(evicted)
+
+    def values(self):
+        with self._lock:
+            return list(self._sessions.values())
+
+    def __contains__(self, game_no):
+        with self._lock:
+            return game_no in self._sessions
+
+    def __len__(self):
+        return len(self._sessions)
+
+    # 락을 잡은 상태에서 호출: 만료 세션과 용량 초과 세션을 꺼내 반환
+    # (사용 중인 세션과 방금 추가한 keep 세션은 건너뜀)
+    def _collect_evictions(self, now, keep=None):
+        in_use = self._in_use
+        evicted = []
+        if self.idle_ttl > 0:
+            for game_no, session in self._sessions.items():
+                if now - session.last_access < self.idle_ttl:
+                    break
+                if in_use is None or not in_use(game_no):
+                    evicted.append((session, "idle"))
+        excess = len(self._sessions) - len(evicted) - self.max_sessions
+        if excess > 0:
+            expired = {session.game_no for session, _ in evicted}
+            for game_no, session in self._sessions.items():
+                if excess == 0:
+                    break
+                if game_no != keep and game_no not in expired and (in_use is None or not in_use(game_no)):
+                    evicted.append((session, "capacity"))
+                    excess -= 1
+        for session, reason in evicted:
+            del self._sessions[session.game_no]
+            self.evictions[reason] += 1
+        return evicted
+
+    # hook은 락 밖에서 실행 (hook이 느리거나 예외를 던져도 다른 요청에 영향 없음)
+    def _run_hooks(self, evicted):
+        for session, reason in evicted:
+            logger.info(f"Game session {session.game_no} evicted ({reason})")
+            for hook in self._eviction_hooks:
+                try:
+                    hook(session, reason)
+                except Exception as e:
+                    logger.error(f"Eviction hook failed for game {session.game_no}: {e}")
+
+    def stats(self):
+        with self._lock:
+            now = self.clock()
+            oldest = next(iter(self._sessions.values()), None)
+            return {
+                "liveSessions": len(self._sessions),
+                "maxSessions": self.max_sessions,
+                "idleTtl": self.idle_ttl,
+                "oldestIdleSeconds": now - oldest.last_access if oldest is not None else 0.0,
+                "created": self.created,
+                "ended": self.removed,
+                "evictions": dict(self.evictions),
+            }
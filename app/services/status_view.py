@@ -0,0 +1,209 @@
+from collections import deque
+import os
+
+from app.services.game_state import dumps
+from app.utils.game_utils import get_feature_detail, get_location_name, get_name, get_personality_detail, get_weapon_name
+
+# 상태 응답을 바꾸는 작업 (GameService.save_session이 저장 전에 GameState.status_version을 올림)
+STATUS_OPS = frozenset(("initialize_game", "proceed_to_next_day", "generate_alibis_and_witness", "new_interrogation"))
+
+PROFILE_FIELDS = ("name", "age", "gender", "personality", "feature")
+# 게임별로 보관하는 상태 변경 기록 수 (더 오래된 버전을 가진 클라이언트는 전체 상태를 받음)
+STATUS_CHANGE_LOG_SIZE = int(os.environ.get("GAME_STATUS_CHANGE_LOG_SIZE", 64))
+
+
+class GameStatusView:
+    """
+    Cached /api/v2/new-game/status projection of one game.
+
+    The localized NPC profiles (name, personality and feature details,
+    preferred weapon and location names) do not change during a game and are
+    resolved once per language. The rest of the status (alive flags, alibis,
+    victim, murder weapon and location, day, witness) is rebuilt from those
+    profiles and encoded when a change is committed (GameService.save_session
+    bumps GameState.status_version and calls record_change), so polling a game
+    costs one attribute read.
+
+    Reads only see the last published (version, status, body), never the live
+    game state, so they do not need the game's lock: a next-day or
+    interrogation that is halfway through changing the state (and holds the
+    lock across its LLM call) does not block or leak into a status poll.
+
+    Each version bump also appends what it changed (alive flags, new murders,
+    alibis, witness, day) to a bounded change log, from which changes(since)
+    answers delta polls without touching the suspects list.
+    """
+    __slots__ = ("game_management", "_profiles", "_published", "_changes", "_tracked")
+
+    def __init__(self, game_management, log_size=STATUS_CHANGE_LOG_SIZE):
+        self.game_management = game_management
+        self._profiles = {}
+        # 마지막으로 게시한 (버전, 상태, 인코딩된 본문) (읽기 쪽이 한 번에 가져가도록 튜플 하나로 교체)
+        self._published = None
+        # (이전 버전, 새 버전, 바뀐 필드)
+        self._changes = deque(maxlen=log_size)
+        self._tracked = self._track()
+
+    @property
+    def game_state(self):
+        return self.game_management.game_state
+
+    @property
+    def version(self):
+        return self.published()[0]
+
+    def etag(self, game_no, version=None):
+        version = self.version if version is None else version
+        return f'"{game_no}-{self.game_state.language}-{version}"'
+
+    def profiles(self, lang):
+        profiles = self._profiles.get(lang)
+        if profiles is None:
+            game_management = self.game_management
+            profiles = self._profiles[lang] = {
+                npc["name"]: {
+                    "name": get_name(npc["name"], lang, game_management.names),
+                    "age": npc["age"],
+                    "gender": npc["gender"],
+                    "personality": get_personality_detail(npc["personality"], game_management.personalities, lang),
+                    "feature": get_feature_detail(npc["feature"], game_management.features, lang),
+                    "preferredWeapons": [get_weapon_name(weapon, game_management.weapons, lang) for weapon in npc["preferredWeapons"]],
+                    "preferredLocations": [get_location_name(location, game_management.places, lang) for location in npc["preferredLocations"]],
+                }
+                for npc in self.game_state.npcs
+            }
+        return profiles
+
+    def publish(self):
+        """
+        Rebuilds and encodes the status from the current game state. Called
+        when a change is committed and when a session is restored, i.e. only
+        while the state is consistent.
+        """
+        version = self.game_state.status_version
+        status = self._build(version)
+        self._published = (version, status, dumps(status))
+
+    def published(self):
+        # 아직 게시하지 않은 세션(시작 직후)은 현재 상태로 게시
+        if self._published is None:
+            self.publish()
+        return self._published
+
+    def status(self):
+        return self.published()[1]
+
+    def body(self):
+        return self.published()[2]
+
+    def _track(self):
+        game_state = self.game_state
+        witness_info = game_state.get("witness", {})
+        return (
+            game_state.status_version, game_state.current_day, game_state.alive_bits, len(game_state.murdered_npcs),
+            dict(game_state.get("alibis", {})), witness_info.get("name", ""), witness_info.get("information", ""),
+        )
+
+    def record_change(self):
+        """
+        Appends the status fields changed since the previous record to the
+        change log and publishes the new status. GameService.save_session
+        calls it after each version bump.
+        """
+        game_state = self.game_state
+        version, day, alive_bits, murders, alibis, witness, information = self._tracked
+        self._tracked = tracked = self._track()
+        if tracked[3] < murders:
+            # 살해 기록이 줄어들면 이어 붙일 수 없으므로 기록을 비움 (이전 버전은 전체 상태를 받음)
+            self._changes.clear()
+            self.publish()
+            return
+        changes = {}
+        if tracked[1] != day:
+            changes["current_day"] = tracked[1]
+        flipped = tracked[2] ^ alive_bits
+        if flipped:
+            changes["alive"] = {
+                npc["name"]: bool(tracked[2] >> index & 1)
+                for index, npc in enumerate(game_state.npcs) if flipped >> index & 1
+            }
+        if tracked[3] > murders:
+            changes["murdered_npcs"] = [dict(murdered) for murdered in game_state.murdered_npcs[murders:]]
+        new_alibis = {name: alibi for name, alibi in tracked[4].items() if alibis.get(name) != alibi}
+        new_alibis.update((name, "") for name in alibis if name not in tracked[4])
+        if new_alibis:
+            changes["alibis"] = new_alibis
+        if tracked[5:] != (witness, information):
+            changes["witness"], changes["eyewitnessInformation"] = tracked[5:]
+        self._changes.append((version, tracked[0], changes))
+        self.publish()
+
+    def changes(self, since):
+        """
+        Returns the status changes after version since, merged into one delta
+        ({"statusVersion", "full": False, "changes"}). When since is not
+        covered by the change log (too old, from another game or a restored
+        session), returns the whole status instead ({"full": True, "status"}).
+        """
+        version, status, _ = self.published()
+        if since == version:
+            return {"statusVersion": version, "full": False, "changes": {}}
+        # 게시된 버전보다 새 기록은 제외 (tuple()은 다른 스레드의 추가와 겹치지 않게 한 번에 복사)
+        entries = [entry for entry in tuple(self._changes) if since < entry[1] <= version]
+        contiguous = (
+            entries and entries[0][0] <= since and entries[-1][1] == version
+            and all(previous[1] == entry[0] for previous, entry in zip(entries, entries[1:]))
+        )
+        if not contiguous:
+            return {"statusVersion": version, "full": True, "status": status}
+        merged = {}
+        for _, _, changes in entries:
+            for key, value in changes.items():
+                if key in ("alive", "alibis"):
+                    merged.setdefault(key, {}).update(value)
+                elif key == "murdered_npcs":
+                    merged.setdefault(key, []).extend(value)
+                else:
+                    merged[key] = value
+        return {"statusVersion": version, "full": False, "changes": merged}
+
+    def _build(self, version):
+        game_state = self.game_state
+        lang = game_state.language
+        profiles = self.profiles(lang)
+        alibis = game_state.get("alibis", {})
+        witness_info = game_state.get("witness", {})
+        suspects = []
+        for index, npc in enumerate(game_state.npcs):
+            profile = profiles[npc["name"]]
+            suspects.append({
+                **profile,
+                "alive": bool(game_state.alive_bits >> index & 1),
+                "alibi": alibis.get(profile["name"], ""),
+            })
+        murderer = profiles[game_state.murderer["name"]]
+        murdered_npc = profiles[game_state.murdered_npc["name"]]
+        return {
+            "suspects": suspects,
+            "murderer": {field: murderer[field] for field in PROFILE_FIELDS},
+            "murdered_npc": {field: murdered_npc[field] for field in PROFILE_FIELDS},
+            "murder_weapon": get_weapon_name(game_state.murder_weapon, self.game_management.weapons, lang),
+            "murder_location": get_location_name(game_state.murder_location, self.game_management.places, lang),
+            "current_day": game_state.current_day,
+            "alive": dict(game_state.alive),
+            "murdered_npcs": [dict(murdered) for murdered in game_state.murdered_npcs],
+            "witness": witness_info.get("name", ""),
+            "eyewitnessInformation": witness_info.get("information", ""),
+            "statusVersion": version,
+        }
+
+
+# If-None-Match 헤더에 현재 ETag가 있는지 확인 ("*"와 약한 ETag "W/..." 포함)
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from types import MappingProxyType
+
+from app.utils.data_loader import load_json_file
+
+from app.core.logger_config import setup_logger
+logger = setup_logger()
+
+# 게임 카탈로그 데이터 경로와 파일 변경 확인 주기 (초, 0이면 매번 확인)
+CATALOG_DATA_DIR = os.environ.get("CATALOG_DATA_DIR", os.path.join("resources", "data"))
+CATALOG_RELOAD_INTERVAL = float(os.environ.get("CATALOG_RELOAD_INTERVAL", 5))
+
+# 카탈로그 항목 이름 -> 파일 이름 (파일 안의 최상위 키는 항목 이름과 같음)
+CATALOG_FILES = {
+    "npcs": "npcs.json",
+    "features": "features.json",
+    "personalities": "personalities.json",
+    "places": "places.json",
+    "weapons": "weapons.json",
+    "names": "names.json",
+    "wealth": "wealth.json",
+    "scenarios": "scenarios.json",
+}
+
+
+def freeze(value):
+    """
+    Recursively converts dicts to read-only mappings and lists to tuples.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """
+    Returns a mutable deep copy of a frozen catalog value.
+    """
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class GameCatalog:
+    """
+    Immutable snapshot of the game data in resources/data, shared by every game.
+
+    Each attribute (npcs, features, personalities, places, weapons, names, wealth,
+    scenarios) is a tuple of read-only mappings. Per-game data must be copied
+    (see thaw) before it is modified.
+    """
+    __slots__ = ("version", "mtimes", *CATALOG_FILES)
+
+    def __init__(self, version, mtimes, **data):
+        for name in CATALOG_FILES:
+            object.__setattr__(self, name, freeze(data[name]))
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "mtimes", mtimes)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GameCatalog is immutable")
+
+
+_catalog = None
+_catalog_checked_at = 0.0
+_catalog_lock = threading.Lock()
+
+
+def catalog_mtimes(data_dir):
+    return tuple(os.stat(os.path.join(data_dir, file_name)).st_mtime_ns for file_name in CATALOG_FILES.values())
+
+
+def load_catalog(data_dir=None, version=1):
+    data_dir = data_dir or CATALOG_DATA_DIR
+    mtimes = catalog_mtimes(data_dir)
+    data = {
+        name: load_json_file(os.path.join(data_dir, file_name))[name]
+        for name, file_name in CATALOG_FILES.items()
+    }
+    return GameCatalog(version, mtimes, **data)
+
+
+def get_catalog() -> GameCatalog:
+    """
+    Returns the process-wide catalog, loading it on first use.
+
+    At most every CATALOG_RELOAD_INTERVAL seconds the data files' modification
+    times are checked. When they changed, a new snapshot is built and swapped
+    in as a whole, so a caller always sees one consistent version; games that
+    already hold the previous snapshot keep using it.
+    """
+    global _catalog, _catalog_checked_at
+    catalog = _catalog
+    now = time.monotonic()
+    if catalog is not None and now - _catalog_checked_at < CATALOG_RELOAD_INTERVAL:
+        return catalog
+
+    with _catalog_lock:
+        catalog = _catalog
+        if catalog is None:
+            _catalog = load_catalog()
+        elif time.monotonic() - _catalog_checked_at >= CATALOG_RELOAD_INTERVAL:
+            try:
+                changed = catalog_mtimes(CATALOG_DATA_DIR) != catalog.mtimes
+            except OSError:
+                changed = False
+            if changed:
+                try:
+                    _catalog = load_catalog(version=catalog.version + 1)
+                    logger.info(f"Game catalog reloaded (version {_catalog.version})")
+                except (OSError, ValueError, KeyError) as e:
+                    # 파일이 쓰이는 도중이면 이전 카탈로그를 유지하고 다음 확인 때 다시 시도
+                    logger.warning(f"Game catalog reload failed, keeping version {catalog.version}: {e}")
+        _catalog_checked_at = time.monotonic()
+        return _catalog
+
+
+def reset_catalog():
+    global _catalog, _catalog_checked_at
+    with _catalog_lock:
+        _catalog = None
+        _catalog_checked_at = 0.0
@@ -1,22 +1,123 @@
+# 카탈로그 항목별 표시 이름 위치 (항목[경로...][언어])
+NAME_PATH = ("name",)
+WEAPON_PATH = ("weapon",)
+PLACE_PATH = ("place",)
+PERSONALITY_DETAIL_PATH = ("personality", "detail")
+FEATURE_DETAIL_PATH = ("feature", "detail")
+
+INDEX_CACHE_SIZE = 64
+
+
+class EntityIndex:
+    """
+    Lookup tables for one catalog collection:
+        by_id:  id -> entity
+        labels: (id, lang) -> display name
+        ids:    (lang, display name) -> id
+    The first entity wins on duplicates, like the linear next(...) scans did.
+    """
+    __slots__ = ("entities", "by_id", "labels", "ids")
+
+    def __init__(self, entities, path):
+        self.entities = entities
+        self.by_id = {}
+        self.labels = {}
+        self.ids = {}
+        for entity in entities:
+            entity_id = entity["id"]
+            self.by_id.setdefault(entity_id, entity)
+            localized = entity
+            for key in path:
+                localized = localized.get(key, {}) if hasattr(localized, "get") else {}
+            for lang, label in localized.items():
+                if isinstance(label, str):
+                    self.labels.setdefault((entity_id, lang), label)
+                    self.ids.setdefault((lang, label), entity_id)
+
+
+_indexes = {}
+
+
+def get_index(entities, path=()):
+    """
+    Returns the EntityIndex for an immutable collection (a catalog tuple), or None for
+    mutable lists, which fall back to linear scans. Indexes are built once per
+    collection, so all games sharing a catalog share its indexes.
+    """
+    key = (id(entities), path)
+    index = _indexes.get(key)
+    if index is not None and index.entities is entities:
+        return index
+    if not isinstance(entities, tuple):
+        return None
+    index = EntityIndex(entities, path)
+    if len(_indexes) >= INDEX_CACHE_SIZE:
+        _indexes.clear()
+    _indexes[key] = index
+    return index
+
+
+def get_by_id(entity_id, entities):
+    index = get_index(entities)
+    if index is not None:
+        return index.by_id.get(entity_id)
+    return next((entity for entity in entities if entity["id"] == entity_id), None)
+
+
+def get_label(entity_id, lang, entities, path):
+    index = _indexes.get((id(entities), path))
+    if index is None or index.entities is not entities:
+        index = get_index(entities, path)
+    if index is not None:
+        label = index.labels.get((entity_id, lang))
+        if label is not None:
+            return label
+        entity = index.by_id.get(entity_id)
+    else:
+        entity = next((entity for entity in entities if entity["id"] == entity_id), None)
+    if entity is None:
+        return entity_id
+    for key in path:
+        entity = entity[key]
+    return entity[lang]
+
+
+def get_id_by_label(label, lang, entities, path):
+    index = get_index(entities, path)
+    if index is not None:
+        return index.ids.get((lang, label))
+    for entity in entities:
+        localized = entity
+        for key in path:
+            localized = localized[key]
+        if localized.get(lang) == label:
+            return entity["id"]
+    return None
+
+
 def get_weapon_name(weapon_key, weapons, lang):
-    weapon = next((weapon for weapon in weapons if weapon["id"] == weapon_key), None)
-    return weapon["weapon"][lang] if weapon else weapon_key
+    return get_label(weapon_key, lang, weapons, WEAPON_PATH)
 
 def get_location_name(location_key, places, lang):
-    location = next((location for location in places if location["id"] == location_key), None)
-    return location["place"][lang] if location else location_key
+    return get_label(location_key, lang, places, PLACE_PATH)
 
 def get_personality_detail(personality_key, personalities, lang):
-    personality = next((p for p in personalities if p["id"] == personality_key), None)
-    return personality["personality"]["detail"][lang] if personality else personality_key
+    return get_label(personality_key, lang, personalities, PERSONALITY_DETAIL_PATH)
 
 def get_feature_detail(feature_key, features, lang):
-    feature = next((f for f in features if f["id"] == feature_key), None)
-    return feature["feature"]["detail"][lang] if feature else feature_key
+    return get_label(feature_key, lang, features, FEATURE_DETAIL_PATH)
 
 def get_name(name_data, lang, names):
-    name_info = next((n for n in names if n["id"] == name_data), None)
-    return name_info["name"][lang] if name_info else name_data
+    return get_label(name_data, lang, names, NAME_PATH)
+
+def get_npc_id(npc_name, lang, names):
+    return get_id_by_label(npc_name, lang, names, NAME_PATH)
+
+def get_weapon_id(weapon_name, lang, weapons):
+    return get_id_by_label(weapon_name, lang, weapons, WEAPON_PATH)
+
+def get_location_id(location_name, lang, places):
+    return get_id_by_label(location_name, lang, places, PLACE_PATH)
 
 def create_context(game_state, personalities, features, weapons, places, names):
     lang = game_state["language"]
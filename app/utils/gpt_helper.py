@@ -1,21 +1,160 @@
-from openai import OpenAI
+import asyncio
+import contextvars
+import httpx
+from contextlib import contextmanager
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 import os
 
+from app.utils.llm_backend import get_llm_backend
+
 load_dotenv()
 
-client = OpenAI(api_key=os.environ.get('OPENAI_API_KEY'))
+OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+
+# LLM 클라이언트 설정 (환경 변수로 조정 가능)
+LLM_MODEL = os.environ.get('LLM_MODEL', "gpt-4o-mini")
+LLM_TIMEOUT = float(os.environ.get('LLM_TIMEOUT', 30))
+LLM_CONNECT_TIMEOUT = float(os.environ.get('LLM_CONNECT_TIMEOUT', 5))
+LLM_MAX_CONNECTIONS = int(os.environ.get('LLM_MAX_CONNECTIONS', 500))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('LLM_MAX_KEEPALIVE_CONNECTIONS', 100))
+LLM_KEEPALIVE_EXPIRY = float(os.environ.get('LLM_KEEPALIVE_EXPIRY', 30))
+LLM_MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', 2))
+
+SYSTEM_PROMPT = "You are an NPC in a murder mystery game. Provide concise and relevant responses to help the player gather clues and solve the mystery."
+
+_client: AsyncOpenAI | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+# 루프가 바뀌어 닫는 중인 이전 클라이언트의 태스크 (완료 전에 가비지 컬렉션되지 않도록 보관)
+_closing: set = set()
+
+
+class GPTUsage:
+    """Token and request counters collected by gpt_usage()."""
+
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, usage):
+        self.requests += 1
+        if usage is not None:
+            self.prompt_tokens += usage.prompt_tokens
+            self.completion_tokens += usage.completion_tokens
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "totalTokens": self.total_tokens,
+            "promptTokens": self.prompt_tokens,
+            "completionTokens": self.completion_tokens,
+        }
+
+
+_usage_trackers: contextvars.ContextVar[tuple] = contextvars.ContextVar("gpt_usage_trackers", default=())
+
+
+@contextmanager
+def gpt_usage():
+    """
+    Collects token usage of every get_gpt_response call made inside the block,
+    including calls from tasks spawned inside it (e.g. asyncio.gather).
+
+    Usage:
+        with gpt_usage() as usage:
+            await get_gpt_response(prompt)
+        usage.total_tokens
+    """
+    usage = GPTUsage()
+    token = _usage_trackers.set(_usage_trackers.get() + (usage,))
+    try:
+        yield usage
+    finally:
+        _usage_trackers.reset(token)
+
+
+def get_client() -> AsyncOpenAI:
+    """
+    Returns the shared AsyncOpenAI client, creating it on first use.
+
+    The client owns one pooled httpx.AsyncClient, so every completion in the
+    worker reuses the same keep-alive connections. Pooled connections are bound
+    to the event loop that opened them, so a new client is created when called
+    from a different loop (e.g. a new TestClient portal) and the previous one
+    is closed (see _discard_client).
+
+    Requests go to the backend selected by LLM_PROVIDER / LLM_BASE_URL.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        if _client is not None:
+            _discard_client(_client, _client_loop, loop)
+        backend = get_llm_backend()
+        http_client = httpx.AsyncClient(
+            transport=backend.async_transport(),
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        )
+        _client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY or backend.api_key,
+            base_url=backend.base_url,
+            http_client=http_client,
+            max_retries=LLM_MAX_RETRIES,
+        )
+        _client_loop = loop
+    return _client
+
+
+def _discard_client(client, client_loop, loop):
+    # 이전 루프가 다른 스레드에서 아직 실행 중이면 그 루프에서 닫고, 아니면 현재 루프에서 닫음
+    if client_loop.is_running() and not client_loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.close(), client_loop)
+        return
+    task = loop.create_task(_close_stale_client(client))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+async def _close_stale_client(client):
+    try:
+        await client.close()
+    except RuntimeError:
+        # 이미 닫힌 루프에 묶인 소켓 연결은 그 루프 밖에서 닫을 수 없음 (참조를 버리면 asyncio가 소켓을 닫음)
+        pass
+
+
+async def close_client():
+    """Closes the shared client and its connection pool."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _client_loop = None
+
 
-def get_gpt_response(prompt: str, max_tokens: int = 100) -> str:
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
+async def get_gpt_response(prompt: str, max_tokens: int = 100, timeout: float | None = None) -> str:
+    response = await get_client().chat.completions.create(
+        model=LLM_MODEL,
         messages=[
-            {"role": "system", "content": "You are an NPC in a murder mystery game. Provide concise and relevant responses to help the player gather clues and solve the mystery."},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
         max_tokens=max_tokens,
         n=1,
         stop=None,
         temperature=0.7,
+        timeout=timeout if timeout is not None else LLM_TIMEOUT,
     )
+    for usage in _usage_trackers.get():
+        usage.add(response.usage)
     return response.choices[0].message.content.strip()
@@ -0,0 +1,51 @@
+from bisect import bisect
+import hashlib
+
+# 노드 하나당 링 위에 두는 가상 노드 수 (많을수록 게임이 고르게 분산)
+DEFAULT_REPLICAS = 128
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping keys (gameNo) to nodes (worker URLs).
+
+    Adding or removing a node only moves the keys between that node and its
+    neighbours on the ring (about 1/N of them); every other key keeps its owner.
+    """
+
+    def __init__(self, nodes=(), replicas=DEFAULT_REPLICAS):
+        self.replicas = replicas
+        self.nodes = []
+        self._points = []
+        self._owners = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node):
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        self._rebuild()
+
+    def remove(self, node):
+        if node in self.nodes:
+            self.nodes.remove(node)
+            self._rebuild()
+
+    def _rebuild(self):
+        points = sorted((_hash(f"{node}#{replica}"), node) for node in self.nodes for replica in range(self.replicas))
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key):
+        if not self._points:
+            raise ValueError("Hash ring has no nodes")
+        index = bisect(self._points, _hash(str(key)))
+        return self._owners[index % len(self._owners)]
+
+    def __len__(self):
+        return len(self.nodes)
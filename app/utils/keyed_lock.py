@@ -0,0 +1,62 @@
+import asyncio
+from contextlib import asynccontextmanager
+import time
+
+
+class KeyedLock:
+    """
+    One asyncio.Lock per key (gameNo).
+
+    Operations on the same key run one at a time in arrival order; different
+    keys never wait for each other. A key's lock exists only while a task holds
+    or waits for it, so finished games leave nothing behind. Must be used from
+    a single event loop.
+    """
+
+    def __init__(self):
+        # key -> [lock, 보유 또는 대기 중인 작업 수]
+        self._locks = {}
+        self.acquisitions = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def __call__(self, key):
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            lock = entry[0]
+            if lock.locked():
+                start = time.perf_counter()
+                await lock.acquire()
+                waited = time.perf_counter() - start
+                self.waits += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            else:
+                await lock.acquire()
+            self.acquisitions += 1
+            try:
+                yield
+            finally:
+                lock.release()
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
+
+    def locked(self, key):
+        entry = self._locks.get(key)
+        return entry is not None and entry[0].locked()
+
+    def stats(self):
+        return {
+            "activeKeys": len(self._locks),
+            "acquisitions": self.acquisitions,
+            "waits": self.waits,
+            "waitSeconds": self.wait_seconds,
+            "maxWaitSeconds": self.max_wait_seconds,
+        }
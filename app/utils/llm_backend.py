@@ -0,0 +1,86 @@
+"""
+LLM backend selection shared by the v2 AsyncOpenAI client, the v1 langchain
+chains and the API key validation.
+
+    LLM_PROVIDER: backend name ("openai" by default, "stub" for the in-process stub)
+    LLM_BASE_URL: overrides the backend's base URL (e.g. a standalone stub or an OpenAI-compatible proxy)
+
+Other backends can be added with register_llm_backend().
+"""
+import os
+
+import httpx
+from dotenv import load_dotenv
+
+from app.utils import llm_stub
+
+load_dotenv()
+
+LLM_PROVIDER = os.environ.get('LLM_PROVIDER', "openai")
+LLM_BASE_URL = os.environ.get('LLM_BASE_URL') or None
+
+
+class LLMBackend:
+    """
+    Describes where OpenAI-protocol requests go.
+
+    base_url None means the OpenAI default. A transport of None means the
+    regular network transport (with the caller's connection pool limits).
+    """
+    name = "openai"
+    base_url = None
+    api_key = None
+
+    def sync_transport(self) -> httpx.BaseTransport | None:
+        return None
+
+    def async_transport(self) -> httpx.AsyncBaseTransport | None:
+        return None
+
+
+class StubBackend(LLMBackend):
+    """Serves requests in-process from app.utils.llm_stub, without any network."""
+    name = "stub"
+    base_url = "http://llm-stub/v1"
+    api_key = "sk-stub"
+
+    def sync_transport(self):
+        return httpx.MockTransport(llm_stub.handle_request)
+
+    def async_transport(self):
+        return httpx.MockTransport(llm_stub.handle_request_async)
+
+
+LLM_BACKENDS = {
+    "openai": LLMBackend,
+    "stub": StubBackend,
+}
+
+
+def register_llm_backend(name, backend_class):
+    LLM_BACKENDS[name] = backend_class
+
+
+def get_llm_backend(provider=None) -> LLMBackend:
+    provider = provider or LLM_PROVIDER
+    if provider not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM provider: {provider}")
+    backend = LLM_BACKENDS[provider]()
+    if LLM_BASE_URL:
+        backend.base_url = LLM_BASE_URL
+    return backend
+
+
+_sync_http_clients = {}
+
+
+def get_sync_http_client() -> httpx.Client | None:
+    """
+    Returns the shared httpx.Client for sync OpenAI clients when the backend needs a custom transport.
+    """
+    backend = get_llm_backend()
+    key = (backend.name, backend.base_url)
+    if key not in _sync_http_clients:
+        transport = backend.sync_transport()
+        _sync_http_clients[key] = httpx.Client(transport=transport) if transport is not None else None
+    return _sync_http_clients[key]
@@ -0,0 +1,358 @@
+"""
+OpenAI-compatible stub LLM backend for offline load and latency testing.
+
+Speaks the chat-completions and models-list protocol and answers with
+schema-shaped canned payloads for the game's prompts:
+    - v1 langchain prompts: an instance of the JSON schema in the format instructions
+    - batch alibis, interrogation and chief letter prompts: the JSON shape they ask for
+    - everything else: a short canned sentence in the requested language
+
+Latency, token counts, error rates and malformed-JSON rates are configurable
+through LLM_STUB_* environment variables, configure_stub() or the CLI.
+
+In-process (no network):
+    LLM_PROVIDER=stub uvicorn app.main:app
+
+Standalone server:
+    python -m app.utils.llm_stub --port 8001 --latency lognormal:0.8,0.4 --error-rate 0.01
+    LLM_BASE_URL=http://localhost:8001/v1 uvicorn app.main:app
+"""
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+
+import httpx
+
+STUB_MODELS = ["gpt-4o", "gpt-4o-mini"]
+
+CANNED_SENTENCES = {
+    "ko": [
+        "어젯밤에는 집에서 조용히 책을 읽고 있었어.",
+        "광장 쪽에서 수상한 발소리를 들은 것 같아.",
+        "그 시간에는 이웃과 함께 차를 마시고 있었지.",
+        "잘 모르겠어, 나는 아무것도 보지 못했어.",
+    ],
+    "en": [
+        "I was reading quietly at home last night.",
+        "I think I heard suspicious footsteps near the square.",
+        "I was having tea with my neighbor at that time.",
+        "I don't know, I didn't see anything.",
+    ],
+}
+
+
+class LatencyDistribution:
+    """
+    Parses a latency spec into a sampler (seconds).
+
+    Specs: "fixed:0.5", "uniform:0.2,0.8", "normal:0.5,0.1", "lognormal:0.5,0.4" (median, sigma).
+    """
+
+    def __init__(self, spec="fixed:0"):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p] if params else []
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self, rng):
+        if self.kind == "fixed":
+            value = self.params[0] if self.params else 0.0
+        elif self.kind == "uniform":
+            value = rng.uniform(self.params[0], self.params[1])
+        elif self.kind == "normal":
+            value = rng.gauss(self.params[0], self.params[1])
+        else:
+            value = rng.lognormvariate(math.log(self.params[0]), self.params[1])
+        return max(0.0, value)
+
+
+class StubConfig:
+    def __init__(self, latency="fixed:0", error_rate=0.0, error_status=500, malformed_rate=0.0,
+                 completion_tokens=None, invalid_keys=(), seed=None):
+        self.latency = LatencyDistribution(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.malformed_rate = malformed_rate
+        self.completion_tokens = completion_tokens
+        self.invalid_keys = set(invalid_keys)
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def from_env(cls):
+        completion_tokens = os.environ.get("LLM_STUB_COMPLETION_TOKENS")
+        seed = os.environ.get("LLM_STUB_SEED")
+        return cls(
+            latency=os.environ.get("LLM_STUB_LATENCY", "fixed:0"),
+            error_rate=float(os.environ.get("LLM_STUB_ERROR_RATE", 0)),
+            error_status=int(os.environ.get("LLM_STUB_ERROR_STATUS", 500)),
+            malformed_rate=float(os.environ.get("LLM_STUB_MALFORMED_RATE", 0)),
+            completion_tokens=int(completion_tokens) if completion_tokens else None,
+            invalid_keys=[k for k in os.environ.get("LLM_STUB_INVALID_KEYS", "").split(",") if k],
+            seed=int(seed) if seed else None,
+        )
+
+
+stub_config = StubConfig.from_env()
+stub_stats = {"requests": 0, "errors": 0, "malformed": 0, "promptTokens": 0, "completionTokens": 0}
+_stats_lock = threading.Lock()
+_completion_ids = itertools.count(1)
+
+
+def configure_stub(**kwargs):
+    """Replaces the stub configuration (see StubConfig for the options)."""
+    global stub_config
+    stub_config = StubConfig(**kwargs)
+    return stub_config
+
+
+def get_stub_stats():
+    with _stats_lock:
+        return dict(stub_stats)
+
+
+def count_tokens(text):
+    # 대략적인 토큰 수 (영문 기준 4글자 = 1토큰)
+    return max(1, len(text) // 4)
+
+
+def detect_language(prompt):
+    match = re.search(r"\bin (ko|en)\b", prompt)
+    if match:
+        return match.group(1)
+    return "ko" if re.search(r"[가-힣]", prompt) else "en"
+
+
+# ---------------------------------------------------------------------------
+# 프롬프트별 응답 생성
+# ---------------------------------------------------------------------------
+
+def extract_output_schema(prompt):
+    """Returns the JSON schema embedded in langchain format instructions, if any."""
+    for block in re.findall(r"```(?:json)?\s*(\{.*?\})\s*```", prompt, re.DOTALL):
+        try:
+            schema = json.loads(block)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(schema, dict) and "properties" in schema:
+            return schema
+    return None
+
+
+def instance_from_schema(schema, root, rng, name="value"):
+    if "$ref" in schema:
+        ref = schema["$ref"].split("/")[-1]
+        definitions = root.get("definitions") or root.get("$defs") or {}
+        return instance_from_schema(definitions.get(ref, {}), root, rng, name)
+    if "allOf" in schema:
+        return instance_from_schema(schema["allOf"][0], root, rng, name)
+    schema_type = schema.get("type", "object" if "properties" in schema else "string")
+    if schema_type == "object":
+        return {key: instance_from_schema(value, root, rng, key)
+                for key, value in schema.get("properties", {}).items()}
+    if schema_type == "array":
+        return [instance_from_schema(schema.get("items", {}), root, rng, name) for _ in range(2)]
+    if schema_type == "integer":
+        return rng.randint(1, 5)
+    if schema_type == "number":
+        return round(rng.uniform(0, 1), 3)
+    if schema_type == "boolean":
+        return True
+    return f"stub {name} {rng.randint(1, 999)}"
+
+
+def generate_content(prompt, rng):
+    """
+    Returns (content, is_json) for the last user prompt.
+    """
+    lang = detect_language(prompt)
+    sentence = lambda: rng.choice(CANNED_SENTENCES[lang])
+
+    schema = extract_output_schema(prompt)
+    if schema is not None:
+        return json.dumps(instance_from_schema(schema, schema, rng), ensure_ascii=False), True
+
+    if '"alibis"' in prompt:
+        names = re.findall(r"^\s*- (.+?) \(personality:", prompt, re.MULTILINE)
+        return json.dumps({"alibis": {name: sentence() for name in names}}, ensure_ascii=False), True
+
+    if '"heartRateDelta"' in prompt:
+        delta = rng.choice([-3, -2, -1, 1, 2, 3])
+        return json.dumps({"response": sentence(), "heartRateDelta": delta}, ensure_ascii=False), True
+
+    if '"greeting"' in prompt:
+        letter = {
+            "greeting": "탐정님께,\n" if lang == "ko" else "Dear Detective,\n",
+            "content": f"{sentence()}\n{sentence()}\n",
+            "closing": "부디 도와주세요.\n촌장 드림\n" if lang == "ko" else "Please help us.\nThe Chief\n",
+        }
+        return json.dumps(letter, ensure_ascii=False), True
+
+    return sentence(), False
+
+
+def malform(content, rng):
+    # JSON 응답을 임의 위치에서 잘라 파싱 실패를 재현
+    return content[: rng.randint(1, max(1, len(content) - 2))]
+
+
+def error_payload(status, message, error_type):
+    return status, {"error": {"message": message, "type": error_type, "param": None, "code": None}}
+
+
+def chat_completion(body, config):
+    """Builds a chat.completion payload for the request body."""
+    messages = body.get("messages", [])
+    prompt = "\n".join(str(m.get("content", "")) for m in messages)
+    user_prompt = next((str(m.get("content", "")) for m in reversed(messages) if m.get("role") == "user"), prompt)
+    max_tokens = body.get("max_tokens") or 4096
+
+    choices = []
+    completion_tokens = 0
+    malformed = 0
+    for index in range(body.get("n") or 1):
+        content, is_json = generate_content(user_prompt, config.rng)
+        if is_json and config.rng.random() < config.malformed_rate:
+            content = malform(content, config.rng)
+            malformed += 1
+        tokens = config.completion_tokens or count_tokens(content)
+        finish_reason = "stop"
+        if tokens > max_tokens:
+            tokens, finish_reason = max_tokens, "length"
+            if not is_json:
+                content = content[: max_tokens * 4]
+        completion_tokens += tokens
+        choices.append({
+            "index": index,
+            "message": {"role": "assistant", "content": content},
+            "logprobs": None,
+            "finish_reason": finish_reason,
+        })
+
+    prompt_tokens = count_tokens(prompt)
+    with _stats_lock:
+        stub_stats["malformed"] += malformed
+        stub_stats["promptTokens"] += prompt_tokens
+        stub_stats["completionTokens"] += completion_tokens
+
+    return 200, {
+        "id": f"chatcmpl-stub-{next(_completion_ids)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", STUB_MODELS[0]),
+        "choices": choices,
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def route(method, path, headers, content):
+    """
+    Dispatches a stub request.
+
+    Returns:
+        (status, payload, latency) tuple. The caller sleeps for latency before responding.
+    """
+    config = stub_config
+    with _stats_lock:
+        stub_stats["requests"] += 1
+    latency = config.latency.sample(config.rng)
+
+    api_key = headers.get("authorization", "").removeprefix("Bearer ").strip()
+    if api_key in config.invalid_keys:
+        return (*error_payload(401, "Incorrect API key provided.", "invalid_request_error"), latency)
+
+    path = path.rstrip("/")
+    if method == "GET" and path.endswith("/models"):
+        data = [{"id": model, "object": "model", "created": 0, "owned_by": "llm-stub"} for model in STUB_MODELS]
+        return 200, {"object": "list", "data": data}, latency
+
+    if method == "POST" and path.endswith("/chat/completions"):
+        if config.rng.random() < config.error_rate:
+            with _stats_lock:
+                stub_stats["errors"] += 1
+            return (*error_payload(config.error_status, "Stub injected error.", "server_error"), latency)
+        try:
+            body = json.loads(content or b"{}")
+        except json.JSONDecodeError:
+            return (*error_payload(400, "Invalid JSON body.", "invalid_request_error"), latency)
+        return (*chat_completion(body, config), latency)
+
+    return (*error_payload(404, f"Unknown stub endpoint: {method} {path}", "invalid_request_error"), 0.0)
+
+
+# ---------------------------------------------------------------------------
+# httpx transport 핸들러 (프로세스 내부 stub)
+# ---------------------------------------------------------------------------
+
+def handle_request(request: httpx.Request) -> httpx.Response:
+    status, payload, latency = route(request.method, request.url.path, request.headers, request.read())
+    time.sleep(latency)
+    return httpx.Response(status, json=payload)
+
+
+async def handle_request_async(request: httpx.Request) -> httpx.Response:
+    status, payload, latency = route(request.method, request.url.path, request.headers, await request.aread())
+    await asyncio.sleep(latency)
+    return httpx.Response(status, json=payload)
+
+
+# ---------------------------------------------------------------------------
+# 독립 실행 서버
+# ---------------------------------------------------------------------------
+
+def create_stub_app():
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+
+    stub_app = FastAPI(title="LLM stub")
+
+    @stub_app.get("/stub/stats")
+    async def stats():
+        return get_stub_stats()
+
+    @stub_app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def dispatch(path: str, request: Request):
+        status, payload, latency = route(request.method, "/" + path, request.headers, await request.body())
+        await asyncio.sleep(latency)
+        return JSONResponse(payload, status_code=status)
+
+    return stub_app
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", default=os.environ.get("LLM_STUB_LATENCY", "fixed:0"))
+    parser.add_argument("--error-rate", type=float, default=stub_config.error_rate)
+    parser.add_argument("--error-status", type=int, default=stub_config.error_status)
+    parser.add_argument("--malformed-rate", type=float, default=stub_config.malformed_rate)
+    parser.add_argument("--completion-tokens", type=int, default=stub_config.completion_tokens)
+    parser.add_argument("--invalid-key", action="append", default=list(stub_config.invalid_keys))
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    configure_stub(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        malformed_rate=args.malformed_rate,
+        completion_tokens=args.completion_tokens,
+        invalid_keys=args.invalid_key,
+        seed=args.seed,
+    )
+    uvicorn.run(create_stub_app(), host=args.host, port=args.port, log_level="warning")
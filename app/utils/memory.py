@@ -4,6 +4,8 @@ from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 import os
 
+from app.utils.llm_backend import get_llm_backend, get_sync_http_client
+
 load_dotenv()
 
 OPENAI_API_KEY=os.environ.get('OPENAI_API_KEY')
@@ -11,7 +13,13 @@ OPENAI_API_KEY=os.environ.get('OPENAI_API_KEY')
 memory = ConversationBufferMemory()
 
 def get_conversation_chain():
-    llm = ChatOpenAI(openai_api_key=OPENAI_API_KEY, model="gpt-4o-mini")
+    backend = get_llm_backend()
+    llm = ChatOpenAI(
+        openai_api_key=OPENAI_API_KEY or backend.api_key,
+        openai_api_base=backend.base_url,
+        http_client=get_sync_http_client(),
+        model="gpt-4o-mini",
+    )
     conversation = ConversationChain(
         llm=llm,
         memory=memory
@@ -0,0 +1,170 @@
+"""
+In-process stand-in for a Redis server, for testing RedisStateStore without Redis.
+
+Implements the RESP2 commands the state store uses: PING, SELECT, GET, SET,
+GETRANGE, DEL, EXISTS, WATCH, UNWATCH, MULTI, EXEC and DISCARD. WATCH/EXEC
+follow Redis semantics: EXEC returns a null reply when a watched key was
+modified by another connection after WATCH.
+
+Usage:
+    python -m app.utils.resp_stub --port 6390
+    GAME_STATE_STORE=redis://127.0.0.1:6390/0 uvicorn app.main:app --workers 4
+"""
+import argparse
+import socketserver
+import threading
+
+
+class RespStubData:
+    def __init__(self):
+        self.values = {}
+        # 키별 변경 횟수 (WATCH 충돌 감지용)
+        self.revisions = {}
+        self.lock = threading.Lock()
+
+    def touch(self, key):
+        self.revisions[key] = self.revisions.get(key, 0) + 1
+
+
+def encode(value):
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode(item) for item in value)
+    if isinstance(value, Exception):
+        return b"-ERR %s\r\n" % str(value).encode()
+    return b"+%s\r\n" % str(value).encode()
+
+
+class RespStubHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        self.data: RespStubData = self.server.data
+        self.watched = {}
+        self.queue = None
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            if not args:
+                continue
+            name = args[0].upper().decode()
+            try:
+                reply = self.dispatch(name, args[1:])
+            except Exception as e:
+                reply = e
+            self.wfile.write(encode(reply))
+
+    def dispatch(self, name, args):
+        if self.queue is not None and name not in ("EXEC", "DISCARD", "MULTI", "WATCH"):
+            self.queue.append((name, args))
+            return "QUEUED"
+        if name == "MULTI":
+            self.queue = []
+            return "OK"
+        if name == "DISCARD":
+            self.queue, self.watched = None, {}
+            return "OK"
+        if name == "WATCH":
+            with self.data.lock:
+                for key in args:
+                    self.watched[key] = self.data.revisions.get(key, 0)
+            return "OK"
+        if name == "UNWATCH":
+            self.watched = {}
+            return "OK"
+        if name == "EXEC":
+            if self.queue is None:
+                raise ValueError("EXEC without MULTI")
+            queue, watched = self.queue, self.watched
+            self.queue, self.watched = None, {}
+            with self.data.lock:
+                if any(self.data.revisions.get(key, 0) != revision for key, revision in watched.items()):
+                    return None
+                return [self.execute(command, command_args) for command, command_args in queue]
+        with self.data.lock:
+            return self.execute(name, args)
+
+    # 데이터 락을 잡은 상태에서 호출
+    def execute(self, name, args):
+        data = self.data
+        if name == "PING":
+            return "PONG"
+        if name == "SELECT":
+            return "OK"
+        if name == "GET":
+            return data.values.get(args[0])
+        if name == "SET":
+            data.values[args[0]] = args[1]
+            data.touch(args[0])
+            return "OK"
+        if name == "GETRANGE":
+            value = data.values.get(args[0], b"")
+            start, end = int(args[1]), int(args[2])
+            end = len(value) + end if end < 0 else end
+            return value[start:end + 1]
+        if name == "DEL":
+            removed = 0
+            for key in args:
+                if data.values.pop(key, None) is not None:
+                    data.touch(key)
+                    removed += 1
+            return removed
+        if name == "EXISTS":
+            return sum(1 for key in args if key in data.values)
+        raise ValueError(f"unknown command '{name}'")
+
+
+class RespStubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.data = RespStubData()
+        super().__init__((host, port), RespStubHandler)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    # 백그라운드 스레드에서 실행 (테스트용)
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    with RespStubServer(args.host, args.port) as server:
+        print(f"RESP stub listening on {server.url}")
+        server.serve_forever()
@@ -0,0 +1,315 @@
+"""
+Versioned game-state stores shared by every worker process.
+
+    GAME_STATE_STORE: "" (default, state stays in the worker's memory only), "memory",
+                      "sqlite:///games.db" (relative path), "sqlite:////var/lib/games.db"
+                      (absolute path) or "redis://host:port/db"
+
+Each entry is an opaque byte string with a version number. save() is a
+compare-and-set on the version: it succeeds only when the stored version is
+still the one the caller loaded (0 for a game that is not stored yet) and
+raises StaleStateError otherwise, so two workers can never silently overwrite
+each other's changes to the same game.
+"""
+from abc import ABC, abstractmethod
+import os
+import socket
+import sqlite3
+import struct
+import threading
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GAME_STATE_STORE = os.environ.get('GAME_STATE_STORE', "")
+# 다른 프로세스가 쓰는 동안 SQLite 잠금을 기다리는 시간 (초)
+SQLITE_TIMEOUT = float(os.environ.get('GAME_STATE_SQLITE_TIMEOUT', 30))
+# Redis 키 접두사와 연결 대기 시간 (초)
+REDIS_KEY_PREFIX = os.environ.get('GAME_STATE_REDIS_PREFIX', "game:")
+REDIS_TIMEOUT = float(os.environ.get('GAME_STATE_REDIS_TIMEOUT', 5))
+
+
+class StaleStateError(Exception):
+    """The stored game was changed by another writer since it was loaded."""
+
+    def __init__(self, game_no, expected_version, actual_version):
+        super().__init__(
+            f"Game {game_no} was modified concurrently "
+            f"(expected version {expected_version}, found {actual_version})"
+        )
+        self.game_no = game_no
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+
+
+class StateStore(ABC):
+    name = "abstract"
+
+    @abstractmethod
+    def version(self, game_no) -> int | None:
+        """Returns the stored version, or None if the game is not stored."""
+
+    @abstractmethod
+    def load(self, game_no) -> tuple[int, bytes] | None:
+        """Returns (version, data), or None if the game is not stored."""
+
+    @abstractmethod
+    def save(self, game_no, data: bytes, expected_version: int) -> int:
+        """Stores data if the stored version is expected_version and returns the new version."""
+
+    @abstractmethod
+    def delete(self, game_no):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryStateStore(StateStore):
+    """Process-local store; only shared by the GameService instances of one worker."""
+    name = "memory"
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def version(self, game_no):
+        entry = self._entries.get(game_no)
+        return entry[0] if entry is not None else None
+
+    def load(self, game_no):
+        return self._entries.get(game_no)
+
+    def save(self, game_no, data, expected_version):
+        with self._lock:
+            entry = self._entries.get(game_no)
+            current = entry[0] if entry is not None else 0
+            if current != expected_version:
+                raise StaleStateError(game_no, expected_version, current)
+            self._entries[game_no] = (current + 1, bytes(data))
+            return current + 1
+
+    def delete(self, game_no):
+        with self._lock:
+            self._entries.pop(game_no, None)
+
+
+class SQLiteStateStore(StateStore):
+    """Single-file store for several workers on one host (WAL mode)."""
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = sqlite3.connect(path, timeout=SQLITE_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS game_states ("
+                "game_no INTEGER PRIMARY KEY, version INTEGER NOT NULL, data BLOB NOT NULL)"
+            )
+
+    def version(self, game_no):
+        with self._lock:
+            row = self._connection.execute("SELECT version FROM game_states WHERE game_no = ?", (game_no,)).fetchone()
+        return row[0] if row is not None else None
+
+    def load(self, game_no):
+        with self._lock:
+            row = self._connection.execute("SELECT version, data FROM game_states WHERE game_no = ?", (game_no,)).fetchone()
+        return (row[0], bytes(row[1])) if row is not None else None
+
+    def save(self, game_no, data, expected_version):
+        with self._lock:
+            if expected_version == 0:
+                try:
+                    self._connection.execute(
+                        "INSERT INTO game_states (game_no, version, data) VALUES (?, 1, ?)", (game_no, data)
+                    )
+                    return 1
+                except sqlite3.IntegrityError:
+                    pass
+            else:
+                cursor = self._connection.execute(
+                    "UPDATE game_states SET version = version + 1, data = ? WHERE game_no = ? AND version = ?",
+                    (data, game_no, expected_version),
+                )
+                if cursor.rowcount == 1:
+                    return expected_version + 1
+            row = self._connection.execute("SELECT version FROM game_states WHERE game_no = ?", (game_no,)).fetchone()
+        raise StaleStateError(game_no, expected_version, row[0] if row is not None else 0)
+
+    def delete(self, game_no):
+        with self._lock:
+            self._connection.execute("DELETE FROM game_states WHERE game_no = ?", (game_no,))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class RespError(Exception):
+    pass
+
+
+class RespConnection:
+    """Minimal RESP2 client connection (enough for GET/SET/DEL and WATCH/MULTI/EXEC)."""
+
+    def __init__(self, host, port, db=0, timeout=REDIS_TIMEOUT):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        if db:
+            self.execute("SELECT", db)
+
+    def send(self, *args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self.sock.sendall(b"".join(parts))
+
+    def read_reply(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by the server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RespError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [self.read_reply() for _ in range(length)]
+        raise RespError(f"Unexpected reply: {line!r}")
+
+    def execute(self, *args):
+        self.send(*args)
+        return self.read_reply()
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisStateStore(StateStore):
+    """
+    Store on a Redis-protocol server. Each game is one string key holding an
+    8-byte big-endian version followed by the data; save() uses WATCH/MULTI/EXEC.
+    """
+    name = "redis"
+    HEADER = struct.Struct(">Q")
+
+    def __init__(self, host="localhost", port=6379, db=0, prefix=REDIS_KEY_PREFIX, max_idle=8):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.prefix = prefix
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def key(self, game_no):
+        return f"{self.prefix}{game_no}"
+
+    # 커넥션 풀 (WATCH는 커넥션 단위이므로 한 번의 연산 동안 커넥션 하나를 독점)
+    def _acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return RespConnection(self.host, self.port, self.db)
+
+    def _release(self, connection, healthy=True):
+        if healthy:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(connection)
+                    return
+        connection.close()
+
+    def _run(self, operation):
+        connection = self._acquire()
+        try:
+            result = operation(connection)
+        except StaleStateError:
+            # 응답을 모두 읽은 상태이므로 커넥션 재사용 가능
+            self._release(connection)
+            raise
+        except BaseException:
+            # 응답을 다 읽었는지 알 수 없으므로 커넥션을 재사용하지 않음
+            self._release(connection, healthy=False)
+            raise
+        self._release(connection)
+        return result
+
+    def version(self, game_no):
+        header = self._run(lambda connection: connection.execute("GETRANGE", self.key(game_no), 0, self.HEADER.size - 1))
+        return self.HEADER.unpack(header)[0] if header else None
+
+    def load(self, game_no):
+        value = self._run(lambda connection: connection.execute("GET", self.key(game_no)))
+        if value is None:
+            return None
+        return self.HEADER.unpack_from(value)[0], value[self.HEADER.size:]
+
+    def save(self, game_no, data, expected_version):
+        key = self.key(game_no)
+
+        def compare_and_set(connection):
+            connection.execute("WATCH", key)
+            header = connection.execute("GETRANGE", key, 0, self.HEADER.size - 1)
+            current = self.HEADER.unpack(header)[0] if header else 0
+            if current != expected_version:
+                connection.execute("UNWATCH")
+                raise StaleStateError(game_no, expected_version, current)
+            connection.execute("MULTI")
+            connection.execute("SET", key, self.HEADER.pack(expected_version + 1) + data)
+            if connection.execute("EXEC") is None:
+                raise StaleStateError(game_no, expected_version, self.version(game_no))
+            return expected_version + 1
+
+        return self._run(compare_and_set)
+
+    def delete(self, game_no):
+        self._run(lambda connection: connection.execute("DEL", self.key(game_no)))
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+def create_state_store(url=None) -> StateStore | None:
+    """
+    Creates the store described by url (GAME_STATE_STORE by default); None when empty.
+    """
+    url = GAME_STATE_STORE if url is None else url
+    if not url:
+        return None
+    if url == "memory":
+        return MemoryStateStore()
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        return SQLiteStateStore(parsed.path[1:] or ":memory:")
+    if parsed.scheme == "redis":
+        db = int(parsed.path.lstrip("/") or 0)
+        return RedisStateStore(parsed.hostname or "localhost", parsed.port or 6379, db)
+    raise ValueError(f"Unknown game state store: {url}")
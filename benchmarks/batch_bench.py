@@ -0,0 +1,89 @@
+"""
+One request per game vs. the batch endpoints.
+
+Starts --games games through /api/v2/new-game/start one at a time and
+through /start-batch in batches of --batch-size, then reads every game's
+status through /status and /status-batch. Requests go in-process through
+httpx.ASGITransport (FastAPI routing, validation and serialization
+included, no sockets), so the saving over a real network is larger than
+shown here.
+
+Usage (from the repository root):
+    python -m benchmarks.batch_bench --games 500 --batch-size 100
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+import httpx
+
+from app.api.v2 import new_game_router
+from app.services.game_service import GameService
+from app.services.session_registry import SessionRegistry
+
+CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오", "소피아", "마르코", "알렉스"]
+
+
+def make_app():
+    app = FastAPI()
+    app.include_router(new_game_router.router)
+    app.state.game_service = GameService(SessionRegistry())
+    app.state.shard = None
+    return app
+
+
+def start_request(game_no):
+    characters = [{"npcName": name, "npcJob": "Murderer" if name == "짠짠영" else "Resident"} for name in CHARACTERS]
+    return {"gameNo": game_no, "language": "ko", "characters": characters}
+
+
+async def run(args):
+    app = make_app()
+    transport = httpx.ASGITransport(app=app)
+    game_nos = list(range(args.games))
+    batches = [game_nos[index:index + args.batch_size] for index in range(0, len(game_nos), args.batch_size)]
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for game_no in game_nos:
+            (await client.post("/api/v2/new-game/start", json=start_request(game_no))).raise_for_status()
+        results["start"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for batch in batches:
+            response = await client.post("/api/v2/new-game/start-batch", json={"games": [start_request(game_no) for game_no in batch]})
+            assert all("answer" in result for result in response.json()["games"])
+        results["start-batch"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for game_no in game_nos:
+            (await client.post("/api/v2/new-game/status", json={"gameNo": game_no})).raise_for_status()
+        results["status"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for batch in batches:
+            response = await client.post("/api/v2/new-game/status-batch", json={"gameNos": batch})
+            assert len(response.json()["games"]) == len(batch)
+        results["status-batch"] = time.perf_counter() - start
+    return results
+
+
+def main(args):
+    # 요청마다 남는 httpx 로그가 단건 요청 쪽 시간에 섞이지 않도록 끔
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = asyncio.run(run(args))
+    print(f"{args.games} games, batch size {args.batch_size}")
+    for name, seconds in results.items():
+        print(f"{name:13} {seconds:7.3f} s {seconds / args.games * 1e6:8.1f} us/game")
+    print(f"speedup: start {results['start'] / results['start-batch']:.1f}x, "
+          f"status {results['status'] / results['status-batch']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    main(args)
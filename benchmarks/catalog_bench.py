@@ -0,0 +1,84 @@
+"""
+Benchmark for game creation: per-game JSON reloads vs the shared game catalog.
+
+"legacy" reproduces the previous GameManagement behaviour (eight JSON files
+parsed per game, weapons and places parsed a second time in initialize_game);
+"catalog" uses the process-wide frozen catalog. Reports the time to create and
+initialize one game and the memory retained per live game.
+
+Usage (from the repository root):
+    python -m benchmarks.catalog_bench --games 2000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from app.services.game_management import GameManagement
+from app.utils import data_loader
+from app.utils.catalog import GameCatalog, CATALOG_FILES, get_catalog
+
+CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오", "소피아", "마르코", "알렉스"]
+
+
+class LegacyCatalog:
+    """Plain per-game copy of the data, loaded the way GameManagement used to."""
+
+    def __init__(self):
+        for name in CATALOG_FILES:
+            setattr(self, name, getattr(data_loader, f"load_{name}_data")()[name])
+        # initialize_game이 무기와 장소를 한 번 더 읽던 비용
+        data_loader.load_weapons_data()
+        data_loader.load_places_data()
+
+
+def create_game(mode):
+    if mode == "legacy":
+        legacy = LegacyCatalog()
+        # 게임별 사본이므로 freeze 없이 GameCatalog 인터페이스만 맞춤
+        catalog = object.__new__(GameCatalog)
+        for name in CATALOG_FILES:
+            object.__setattr__(catalog, name, getattr(legacy, name))
+        game_management = GameManagement(catalog)
+    else:
+        game_management = GameManagement()
+    game_management.initialize_game("ko", CHARACTERS, "짠짠영")
+    return game_management
+
+
+def measure_time(mode, games):
+    start = time.perf_counter()
+    for _ in range(games):
+        create_game(mode)
+    return (time.perf_counter() - start) / games
+
+
+def measure_memory(mode, games):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    live_games = [create_game(mode) for _ in range(games)]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del live_games
+    return retained / games
+
+
+def main(games):
+    get_catalog()
+    results = {}
+    for mode in ("legacy", "catalog"):
+        results[mode] = (measure_time(mode, games), measure_memory(mode, min(games, 500)))
+
+    for mode, (per_game, memory) in results.items():
+        print(f"{mode:8} create+initialize: {per_game * 1e6:8.1f} us/game, retained: {memory / 1024:7.1f} KiB/game")
+    legacy, catalog = results["legacy"], results["catalog"]
+    print(f"speedup: {legacy[0] / catalog[0]:.1f}x, memory saved: {(legacy[1] - catalog[1]) / 1024:.1f} KiB/game")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.games)
@@ -0,0 +1,318 @@
+"""
+Load test for the v2 game loop.
+
+Drives complete games through the real FastAPI app against the stub LLM
+backend (app.utils.llm_stub) with simulated latency, and reports throughput,
+p50/p95/p99 latency per endpoint, event-loop lag and RSS growth.
+
+Each game runs:
+    new-game/start -> generate-scenario -> generate-chief-letter
+    -> (generate-questions -> generate-answer) x --questions
+    -> interrogation/new -> interrogation/conversation x --turns
+    -> next_day x --days
+
+By default the app runs in-process through httpx.ASGITransport, so event-loop
+lag and RSS are the server's own. With --base-url the games are sent to a
+running server instead (start it with LLM_PROVIDER=stub or LLM_BASE_URL
+pointing at a standalone stub); lag and RSS then describe the load generator.
+
+Usage (from the repository root):
+    python -m benchmarks.game_loop_bench --games 200 --concurrency 50 --latency lognormal:0.5,0.4
+    python -m benchmarks.game_loop_bench --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오", "소피아", "마르코", "알렉스"]
+MURDERER = "짠짠영"
+KEYWORD = "Axe"
+GAME_NO_OFFSET = 100000
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(values):
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else None,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+
+def current_rss():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # /proc가 없는 환경에서는 최대 RSS로 대체 (macOS는 byte, Linux는 KB 단위)
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if platform.system() == "Darwin" else maxrss * 1024
+
+
+class LoopMonitor:
+    """Samples event-loop lag (sleep overshoot) and RSS in the background."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.lags = []
+        self.rss_start = current_rss()
+        self.rss_peak = self.rss_start
+        self._task = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+            self.rss_peak = max(self.rss_peak, current_rss())
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        rss_end = current_rss()
+        return {
+            "lag": summarize(self.lags),
+            "rss": {
+                "start": self.rss_start,
+                "end": rss_end,
+                "peak": max(self.rss_peak, rss_end),
+                "growth": rss_end - self.rss_start,
+            },
+        }
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def post(self, client, endpoint, payload):
+        start = time.perf_counter()
+        try:
+            response = await client.post(endpoint, json=payload)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if not ok:
+            self.errors[endpoint] += 1
+            return None
+        return response.json()
+
+
+async def play_game(client, recorder, game_no, args):
+    characters = [
+        {"npcName": name, "npcJob": "Murderer" if name == MURDERER else "Resident"}
+        for name in CHARACTERS
+    ]
+    start = await recorder.post(client, "/api/v2/new-game/start",
+                                {"gameNo": game_no, "language": args.language, "characters": characters})
+    if start is None:
+        return False
+    victim = start["answer"]["victim"]
+    game = {"gameNo": game_no}
+
+    await recorder.post(client, "/api/v2/new-game/generate-scenario", game)
+    await recorder.post(client, "/api/v2/new-game/generate-chief-letter", game)
+
+    # 범인은 게임 도중 사망하지 않으므로 질문/취조 대상으로 사용
+    question = {"gameNo": game_no, "npcName": MURDERER, "keyWord": KEYWORD, "keyWordType": "weapon"}
+    for round_index in range(args.questions):
+        await recorder.post(client, "/api/v2/in-game/generate-questions", question)
+        await recorder.post(client, "/api/v2/in-game/generate-answer",
+                            {**question, "questionIndex": round_index % 3 + 1})
+
+    await recorder.post(client, "/api/v2/interrogation/new",
+                        {"gameNo": game_no, "npcName": MURDERER, "weapon": KEYWORD})
+    for _ in range(args.turns):
+        await recorder.post(client, "/api/v2/interrogation/conversation",
+                            {"gameNo": game_no, "npcName": MURDERER, "content": "어젯밤에 어디 있었어?"})
+
+    dead = {victim}
+    for _ in range(args.days):
+        living = [
+            {"name": name, "job": "Murderer" if name == MURDERER else "Resident",
+             "status": "DEAD" if name in dead else "ALIVE"}
+            for name in CHARACTERS
+        ]
+        result = await recorder.post(client, "/api/v2/new-game/next_day",
+                                     {"gameNo": game_no, "livingCharacters": living})
+        if isinstance(result, dict) and isinstance(result.get("answer"), dict) and result["answer"].get("victim"):
+            dead.add(result["answer"]["victim"])
+    return True
+
+
+def make_client(args):
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+    if args.base_url:
+        return httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=timeout)
+
+    # 스냅샷과 저널을 작업 트리가 아닌 임시 디렉터리에 쓰도록 app을 import하기 전에 설정
+    state_dir = tempfile.mkdtemp(prefix="game_loop_bench-")
+    atexit.register(shutil.rmtree, state_dir, ignore_errors=True)
+    os.environ["GAME_SNAPSHOT_DIR"] = state_dir
+    os.environ["GAME_JOURNAL_PATH"] = os.path.join(state_dir, "journal.log")
+
+    from app.main import app
+    from app.utils import llm_backend, llm_stub
+
+    # 외부 네트워크 없이 프로세스 내부 stub으로 LLM 호출을 처리
+    llm_backend.LLM_PROVIDER = "stub"
+    llm_backend.LLM_BASE_URL = None
+    llm_stub.configure_stub(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                             limits=limits, timeout=timeout)
+
+
+async def run(args):
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    completed = 0
+
+    async with make_client(args) as client:
+        monitor = LoopMonitor()
+        monitor.start()
+
+        async def limited(game_no):
+            nonlocal completed
+            async with semaphore:
+                if await play_game(client, recorder, game_no, args):
+                    completed += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(limited(GAME_NO_OFFSET + i) for i in range(args.games)))
+        elapsed = time.perf_counter() - start
+        loop_stats = await monitor.stop()
+
+    if not args.base_url:
+        from app.utils import gpt_helper, llm_stub
+        await gpt_helper.close_client()
+        stub_stats = llm_stub.get_stub_stats()
+    else:
+        stub_stats = None
+
+    total_requests = sum(len(v) for v in recorder.latencies.values())
+    return {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "environment": environment(),
+        "summary": {
+            "elapsed": elapsed,
+            "games": args.games,
+            "completedGames": completed,
+            "requests": total_requests,
+            "errors": sum(recorder.errors.values()),
+            "gamesPerSecond": completed / elapsed,
+            "requestsPerSecond": total_requests / elapsed,
+        },
+        "endpoints": {
+            endpoint: {**summarize(values), "errors": recorder.errors[endpoint]}
+            for endpoint, values in recorder.latencies.items()
+        },
+        "eventLoopLag": loop_stats["lag"],
+        "rss": loop_stats["rss"],
+        "llmStub": stub_stats,
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "platform": platform.platform(), "commit": commit or None}
+
+
+def ms(value):
+    return f"{value * 1000:9.1f}" if value is not None else f"{'-':>9}"
+
+
+def print_report(result, baseline=None):
+    summary = result["summary"]
+    print(f"games: {summary['completedGames']}/{summary['games']} in {summary['elapsed']:.2f}s "
+          f"({summary['gamesPerSecond']:.2f} games/s, {summary['requestsPerSecond']:.1f} req/s, "
+          f"{summary['errors']} errors)")
+    if baseline:
+        ratio = summary["requestsPerSecond"] / baseline["summary"]["requestsPerSecond"]
+        print(f"throughput vs baseline: {ratio:.2f}x")
+    print()
+    header = f"{'endpoint':45} {'count':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    if baseline:
+        header += f" {'Δp50 ms':>9} {'Δp95 ms':>9}"
+    print(header)
+    for endpoint, stats in result["endpoints"].items():
+        line = (f"{endpoint:45} {stats['count']:6d} {stats['errors']:4d} "
+                f"{ms(stats['p50'])} {ms(stats['p95'])} {ms(stats['p99'])} {ms(stats['max'])}")
+        before = baseline["endpoints"].get(endpoint) if baseline else None
+        if before:
+            line += f" {ms(stats['p50'] - before['p50'])} {ms(stats['p95'] - before['p95'])}"
+        print(line)
+    lag = result["eventLoopLag"]
+    rss = result["rss"]
+    print()
+    print(f"event-loop lag: p50 {ms(lag['p50']).strip()} ms, p99 {ms(lag['p99']).strip()} ms, "
+          f"max {ms(lag['max']).strip()} ms")
+    print(f"rss: start {rss['start'] / 2**20:.1f} MiB, end {rss['end'] / 2**20:.1f} MiB, "
+          f"peak {rss['peak'] / 2**20:.1f} MiB, growth {rss['growth'] / 2**20:+.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=50, help="total number of games to play")
+    parser.add_argument("--concurrency", type=int, default=10, help="games played at the same time")
+    parser.add_argument("--questions", type=int, default=2, help="question/answer rounds per game")
+    parser.add_argument("--turns", type=int, default=2, help="interrogation conversation turns per game")
+    parser.add_argument("--days", type=int, default=1, help="next_day calls per game")
+    parser.add_argument("--language", default="ko", choices=["ko", "en"])
+    parser.add_argument("--latency", default="lognormal:0.5,0.4", help="stub LLM latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stub LLM error rate")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="stub LLM malformed JSON rate")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--base-url", default=None, help="send games to a running server instead of in-process")
+    parser.add_argument("--output", default=None, help="write machine-readable results (JSON) to this path")
+    parser.add_argument("--compare", default=None, help="baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+    print_report(result, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
@@ -0,0 +1,99 @@
+"""
+Memory benchmark for the per-game state: the previous nested dict vs GameState.
+
+"legacy" rebuilds the dict GameManagement.initialize_game used to return (suspects
+and npcs aliases, murderer / murdered_npc NPC references, the catalog's places and
+weapons, an alive dict per NPC) with a full copy of every selected NPC record;
+"slots" keeps the GameState returned today, whose NPCs are overlays on the shared
+catalog records. The catalog itself is shared and not counted. Reports the bytes
+retained per live game after the game start and after a few simulated days of play.
+
+Usage (from the repository root):
+    python -m benchmarks.game_state_bench --games 2000
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+
+from app.services.game_management import GameManagement
+from app.utils.catalog import get_catalog, thaw
+
+CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오", "소피아", "마르코", "알렉스"]
+
+
+def legacy_state(game_state):
+    # 게임별 NPC 사본 (카탈로그 레코드 전체 + 선호 무기/장소 목록)
+    npcs = [{key: thaw(value) for key, value in npc.items()} for npc in game_state.npcs]
+    return {
+        "language": game_state.language,
+        "suspects": npcs,
+        "murderer": npcs[game_state.murderer_index],
+        "murdered_npc": npcs[game_state.victim_index],
+        "murder_weapon": game_state.murder_weapon,
+        "murder_location": game_state.murder_location,
+        "conversations_left": 5,
+        "npcs": npcs,
+        "places": game_state.places,
+        "weapons": game_state.weapons,
+        "conversations": [],
+        "current_day": 1,
+        "alive": {npc["name"]: game_state.is_alive(npc["name"]) for npc in npcs},
+        "murdered_npcs": list(game_state.murdered_npcs),
+        "interrogation": None,
+    }
+
+
+def play_days(state, days):
+    # select_new_victim / update_game_state_with_murder가 하는 상태 변경만 재현
+    for _ in range(days):
+        murderer_id = state["murderer"]["name"]
+        victims = [npc for npc in state["npcs"] if npc["name"] != murderer_id and state["alive"][npc["name"]]]
+        victim = random.choice(victims)
+        if isinstance(state, dict):
+            state["alive"][victim["name"]] = False
+            victim["alive"] = False
+        else:
+            state.set_alive(victim["name"], False)
+        state["murdered_npc"] = victim
+        state["murdered_npcs"].append({"name": victim["name"], "day": state["current_day"] + 1})
+        state.setdefault("murder_weapons", []).append(random.choice(state["murderer"]["preferredWeapons"]))
+        state.setdefault("murder_locations", []).append(random.choice(state["murderer"]["preferredLocations"]))
+        state["current_day"] += 1
+
+
+def create_state(mode, days):
+    game_state = GameManagement().initialize_game("ko", CHARACTERS, "짠짠영")
+    state = legacy_state(game_state) if mode == "legacy" else game_state
+    play_days(state, days)
+    return state
+
+
+def measure(mode, games, days):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    live_states = [create_state(mode, days) for _ in range(games)]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del live_states
+    return retained / games
+
+
+def main(games, days):
+    get_catalog()
+    random.seed(0)
+    for played in (0, days):
+        results = {mode: measure(mode, games, played) for mode in ("legacy", "slots")}
+        saved = results["legacy"] - results["slots"]
+        print(f"after {played} day(s): legacy {results['legacy']:8.0f} B/game, slots {results['slots']:8.0f} B/game, "
+              f"saved {saved:6.0f} B/game ({saved / results['legacy']:.0%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=3)
+    args = parser.parse_args()
+    main(args.games, args.days)
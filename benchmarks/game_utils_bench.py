@@ -0,0 +1,57 @@
+"""
+Microbenchmark for the catalog lookups in app/utils/game_utils.
+
+"linear" passes the catalog as plain lists, which take the linear next(...)
+scan path the helpers used before; "indexed" passes the shared catalog tuples,
+which use the precomputed (id, language) indexes.
+
+Usage (from the repository root):
+    python -m benchmarks.game_utils_bench --rounds 20000
+"""
+import argparse
+import timeit
+
+from app.services.game_management import GameManagement
+from app.utils.catalog import get_catalog, thaw
+from app.utils.game_utils import create_context
+
+CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오", "소피아", "마르코", "알렉스"]
+
+
+def make_game(catalog_view):
+    game_management = GameManagement(catalog_view)
+    game_management.initialize_game("ko", CHARACTERS, "짠짠영")
+    return game_management
+
+
+def linear_view(catalog):
+    # 카탈로그를 리스트로 풀어 선형 탐색 경로를 사용하게 함
+    view = object.__new__(type(catalog))
+    for name in type(catalog).__slots__:
+        value = getattr(catalog, name)
+        object.__setattr__(view, name, thaw(value) if isinstance(value, tuple) and name != "mtimes" else value)
+    return view
+
+
+def main(rounds):
+    catalog = get_catalog()
+    games = {"linear": make_game(linear_view(catalog)), "indexed": make_game(catalog)}
+    results = {}
+    for mode, game in games.items():
+        state = game.game_state
+        context = timeit.timeit(
+            lambda: create_context(state, game.personalities, game.features, game.weapons, game.places, game.names),
+            number=rounds)
+        status = timeit.timeit(game.get_game_status, number=rounds)
+        results[mode] = (context / rounds, status / rounds)
+        print(f"{mode:8} create_context: {context / rounds * 1e6:7.2f} us, get_game_status: {status / rounds * 1e6:7.2f} us")
+
+    linear, indexed = results["linear"], results["indexed"]
+    print(f"speedup: create_context {linear[0] / indexed[0]:.1f}x, get_game_status {linear[1] / indexed[1]:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.rounds)
@@ -0,0 +1,129 @@
+"""
+Journal write overhead per game-state mutation.
+
+Starts games and applies the mutations the LLM endpoints make (alibis and
+witness, NPC answers, next day, interrogation turns) directly to the game
+state, then persists each one through GameService.save_session with:
+
+    none       no persistence (memory only)
+    journal    the mutation journal, fsync batched every --fsync-interval seconds
+    fsync      the mutation journal, fsync after every record
+    snapshot   a full snapshot file written after every mutation (the alternative to a journal)
+
+and reports the time per mutation, journal bytes per record, the number of
+fsyncs, and the time to replay the journal after a crash.
+
+Usage (from the repository root):
+    python -m benchmarks.journal_bench --games 200 --turns 20
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.schemas.game_schema import GameStartRequest
+from app.services.game_journal import GameJournal
+from app.services.game_service import GameService
+from app.services.game_snapshot import SnapshotDirectory
+from app.services.game_state import InterrogationState
+from app.services.session_registry import SessionRegistry
+
+CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오", "소피아", "마르코", "알렉스"]
+SENTENCE = "어젯밤 마을 광장 근처에서 수상한 발자국 소리를 들었고, 새벽까지 불이 켜진 집이 하나 있었어요. "
+
+
+def mutations(game_state, turns, rng):
+    """
+    Yields (op, apply) pairs in the order a game makes them.
+    """
+    def alibis():
+        game_state["alibis"] = {npc["name"]: SENTENCE * rng.randint(1, 3) for npc in game_state.npcs}
+        game_state["witness"] = {"name": game_state.npcs[0]["name"], "information": SENTENCE * 2}
+
+    def answer():
+        game_state.conversations.append({"npc": rng.choice(CHARACTERS), "question": SENTENCE, "answer": SENTENCE * 2})
+        game_state.conversations_left = max(game_state.conversations_left - 1, 0)
+
+    def next_day():
+        game_state.current_day += 1
+        game_state.conversations_left = 5
+        game_state["scenario"] = {"description": SENTENCE * 6}
+
+    def interrogation():
+        if game_state.interrogation is None:
+            game_state.interrogation = InterrogationState(80, "짠짠영", "Axe", "도끼")
+        game_state.interrogation.conversation_history.append({"role": "user", "content": "어젯밤에 어디 있었어?"})
+        game_state.interrogation.conversation_history.append({"role": "짠짠영", "content": SENTENCE})
+
+    yield "generate_alibis_and_witness", alibis
+    for turn in range(turns):
+        if turn % 8 == 7:
+            yield "proceed_to_next_day", next_day
+        elif turn % 3 == 2:
+            yield "generate_interrogation_response", interrogation
+        else:
+            yield "talk_to_npc", answer
+
+
+def run(mode, games, turns, fsync_interval, directory):
+    snapshots = SnapshotDirectory(directory)
+    journal = None
+    if mode in ("journal", "fsync"):
+        interval = 0 if mode == "fsync" else fsync_interval
+        journal = GameJournal(os.path.join(directory, "journal.log"), fsync_interval=interval, compact_bytes=1 << 40)
+    game_service = GameService(SessionRegistry(), snapshots=snapshots, journal=journal)
+    characters = [{"npcName": name, "npcJob": "Murderer" if name == "짠짠영" else "Resident"} for name in CHARACTERS]
+    for game_no in range(games):
+        game_service.initialize_new_game(GameStartRequest(gameNo=game_no, characters=characters))
+
+    rng = random.Random(0)
+    sessions = [game_service.get_session(game_no) for game_no in range(games)]
+    plans = [list(mutations(session.game_state, turns, rng)) for session in sessions]
+    count = 0
+    elapsed = 0.0
+    # 게임들이 번갈아 가며 변경되는 순서로 실행
+    for step in range(turns + 1):
+        for session, plan in zip(sessions, plans):
+            op, apply = plan[step]
+            apply()
+            start = time.perf_counter()
+            if mode == "snapshot":
+                game_service.snapshot_session(session)
+            else:
+                game_service.save_session(session, op)
+            elapsed += time.perf_counter() - start
+            count += 1
+
+    result = {"mode": mode, "per_mutation": elapsed / count, "mutations": count}
+    if journal is not None:
+        journal.sync()
+        result.update(journal.stats())
+        restarted = GameService(SessionRegistry(), snapshots=snapshots, journal=GameJournal(journal.path))
+        start = time.perf_counter()
+        recovered = restarted.recover_journal()
+        result["replay"] = time.perf_counter() - start
+        assert recovered["games"] == games
+        journal.close()
+    return result
+
+
+def main(games, turns, fsync_interval):
+    print(f"{games} games, {turns + 1} mutations each (after start), fsync interval {fsync_interval}s")
+    print(f"{'mode':>8} {'us/mutation':>12} {'bytes/record':>13} {'fsyncs':>7} {'replay s':>9}")
+    for mode in ("none", "journal", "fsync", "snapshot"):
+        with tempfile.TemporaryDirectory() as directory:
+            result = run(mode, games, turns, fsync_interval, directory)
+        per_record = f"{result['bytes'] / result['records']:.0f}" if "records" in result else "-"
+        fsyncs = result.get("fsyncs", "-")
+        replay = f"{result['replay']:.2f}" if "replay" in result else "-"
+        print(f"{mode:>8} {result['per_mutation'] * 1e6:12.1f} {per_record:>13} {fsyncs:>7} {replay:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--fsync-interval", type=float, default=0.05)
+    args = parser.parse_args()
+    main(args.games, args.turns, args.fsync_interval)
@@ -0,0 +1,70 @@
+"""
+Benchmark for QuestionGeneration.generate_questions: sequential vs concurrent.
+
+The LLM is replaced by a stub that sleeps for an injected latency, so the
+result only reflects how the three completions are scheduled.
+
+Usage (from the repository root):
+    python -m benchmarks.question_generation_bench --latency 0.5 --rounds 5
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.services import question_generation
+from app.services.game_management import GameManagement
+from app.services.question_generation import QuestionGeneration
+
+CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오", "소피아", "마르코", "알렉스"]
+
+
+def make_stub_llm(latency, jitter):
+    async def stub_gpt_response(prompt, max_tokens=100, timeout=None):
+        await asyncio.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+        return "stub question?"
+    return stub_gpt_response
+
+
+def make_question_generation():
+    game_management = GameManagement()
+    game_state = game_management.initialize_game("ko", CHARACTERS, "짠짠영")
+    return QuestionGeneration(
+        game_state,
+        game_management.personalities,
+        game_management.features,
+        game_management.weapons,
+        game_management.places,
+        game_management.names
+    )
+
+
+async def measure(question_gen, concurrent, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await question_gen.generate_questions("박동식", "Axe", "weapon", concurrent=concurrent)
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings)
+
+
+async def main(latency, jitter, rounds):
+    question_generation.get_gpt_response = make_stub_llm(latency, jitter)
+    question_gen = make_question_generation()
+
+    sequential = await measure(question_gen, False, rounds)
+    concurrent = await measure(question_gen, True, rounds)
+
+    print(f"injected latency: {latency:.3f}s (+/- {jitter:.3f}s), rounds: {rounds}")
+    print(f"sequential: {sequential:.3f}s per request")
+    print(f"concurrent: {concurrent:.3f}s per request")
+    print(f"speedup:    {sequential / concurrent:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="mean stub completion latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.1, help="uniform latency jitter in seconds")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.jitter, args.rounds))
@@ -0,0 +1,134 @@
+"""
+Throughput scaling of the sharded multi-process mode (app.core.sharding).
+
+For each worker count, starts that many app workers behind a ShardDispatcher
+(all against the stub LLM, sharing a temporary snapshot directory) and plays
+the game loop of benchmarks.game_loop_bench through the dispatcher. A single
+plain uvicorn process without the dispatcher is measured first as the
+baseline. With --rebalance, one more worker is added after each run and every
+game's /status is checked through the dispatcher, measuring the hand-off.
+
+Scaling is bounded by the CPU cores of the machine; the dispatcher itself is
+one process.
+
+Usage (from the repository root):
+    python -m benchmarks.shard_bench --workers 1 2 4 --games 200 --concurrency 50 --latency fixed:0.05
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from app.core.sharding import start_worker, stop_workers, wait_until_ready
+from benchmarks import game_loop_bench
+
+DISPATCHER_PORT = 7790
+WORKER_PORT = 7800
+
+
+def server_env(args, snapshot_dir):
+    return {
+        "LLM_PROVIDER": "stub",
+        "LLM_STUB_LATENCY": args.latency,
+        "GAME_SNAPSHOT_DIR": snapshot_dir,
+        "GAME_JOURNAL_PATH": os.path.join(snapshot_dir, "journal.log"),
+        "GAME_STATE_STORE": "",
+    }
+
+
+def play(args, base_url):
+    bench_args = argparse.Namespace(
+        games=args.games, concurrency=args.concurrency, questions=args.questions, turns=args.turns,
+        days=args.days, language="ko", latency=args.latency, error_rate=0.0, malformed_rate=0.0,
+        seed=0, timeout=120.0, base_url=base_url, output=None, compare=None,
+    )
+    return asyncio.run(game_loop_bench.run(bench_args))["summary"]
+
+
+def run_plain(args):
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        env = {**os.environ, **server_env(args, snapshot_dir)}
+        url = f"http://127.0.0.1:{WORKER_PORT}"
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(WORKER_PORT), "--log-level", "warning"],
+            env=env,
+        )
+        try:
+            wait_until_ready([url])
+            return play(args, url)
+        finally:
+            stop_workers([process])
+
+
+def run_sharded(args, workers):
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        env = server_env(args, snapshot_dir)
+        dispatcher = subprocess.Popen(
+            [sys.executable, "-m", "app.core.sharding", "--workers", str(workers), "--host", "127.0.0.1",
+             "--port", str(DISPATCHER_PORT), "--worker-port", str(WORKER_PORT)],
+            env={**os.environ, **env},
+        )
+        extra = []
+        try:
+            url = f"http://127.0.0.1:{DISPATCHER_PORT}"
+            wait_until_ready([url])
+            summary = play(args, url)
+            if args.rebalance:
+                summary["rebalance"] = rebalance(url, workers, args.games, env, extra)
+            return summary
+        finally:
+            stop_workers(extra)
+            stop_workers([dispatcher])
+
+
+def rebalance(url, workers, games, env, processes):
+    nodes = httpx.get(f"{url}/shards").json()["nodes"]
+    node = f"http://127.0.0.1:{WORKER_PORT + workers}"
+    processes.append(start_worker(node, nodes + [node], workers, env))
+    wait_until_ready([node])
+    result = httpx.post(f"{url}/shards", json={"add": node}, timeout=120).json()
+
+    start = time.perf_counter()
+    failed = 0
+    with httpx.Client(base_url=url, timeout=30) as client:
+        for index in range(game_loop_bench.GAME_NO_OFFSET, game_loop_bench.GAME_NO_OFFSET + games):
+            if client.post("/api/v2/new-game/status", json={"gameNo": index}).status_code != 200:
+                failed += 1
+    return {"moved": sum(result["moved"].values()), "seconds": result["seconds"],
+            "statusFailures": failed, "checkSeconds": time.perf_counter() - start}
+
+
+def main(args):
+    print(f"{args.games} games, concurrency {args.concurrency}, stub latency {args.latency}, {os.cpu_count()} CPUs")
+    print(f"{'setup':>14} {'games/s':>8} {'req/s':>8} {'errors':>7} {'speedup':>8}")
+    baseline = run_plain(args)
+    rows = [("1 (no dispatcher)", baseline)]
+    for workers in args.workers:
+        rows.append((f"{workers} shards", run_sharded(args, workers)))
+    for name, summary in rows:
+        speedup = summary["gamesPerSecond"] / baseline["gamesPerSecond"]
+        print(f"{name:>14} {summary['gamesPerSecond']:8.2f} {summary['requestsPerSecond']:8.1f} "
+              f"{summary['errors']:7d} {speedup:8.2f}")
+        if "rebalance" in summary:
+            rebalance_result = summary["rebalance"]
+            print(f"{'':>14} +1 shard: moved {rebalance_result['moved']} games in {rebalance_result['seconds']:.2f}s, "
+                  f"{rebalance_result['statusFailures']} status failures afterwards")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=2)
+    parser.add_argument("--turns", type=int, default=2)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--latency", default="fixed:0.05", help="stub LLM latency distribution")
+    parser.add_argument("--rebalance", action="store_true", help="add a worker after each run and re-check every game")
+    args = parser.parse_args()
+    main(args)
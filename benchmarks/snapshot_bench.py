@@ -0,0 +1,103 @@
+"""
+Snapshot size and time per game.
+
+Creates games with the state a game accumulates after a couple of days (scenario
+text, alibis, witness, generated questions, an interrogation history), then
+measures for each zlib level: snapshot bytes per game, encode and decode time,
+and the time to write all snapshots to a directory and restore them lazily
+through GameService (one first access per game).
+
+Usage (from the repository root):
+    python -m benchmarks.snapshot_bench --games 1000
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from app.services import game_state as game_state_module
+from app.services.game_management import GameManagement
+from app.services.game_service import GameService
+from app.services.game_snapshot import SnapshotDirectory
+from app.services.game_state import GameState, InterrogationState
+from app.services.session_registry import SessionRegistry
+from app.utils.catalog import get_catalog
+from app.utils.game_utils import get_name
+
+CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오", "소피아", "마르코", "알렉스"]
+SENTENCE = "어젯밤 마을 광장 근처에서 수상한 발자국 소리를 들었고, 새벽까지 불이 켜진 집이 하나 있었어요. "
+
+
+def played_game(rng):
+    game_management = GameManagement()
+    game_state = game_management.initialize_game("ko", CHARACTERS, "짠짠영")
+    names = [get_name(npc["name"], "ko", game_management.names) for npc in game_state.npcs]
+    game_state["first_blood"] = {"victim": names[game_state.victim_index]}
+    game_state["scenario"] = {"description": SENTENCE * 6}
+    game_state["scenarios"] = [SENTENCE * 5 for _ in range(2)]
+    game_state["alibis"] = {name: SENTENCE * rng.randint(1, 3) for name in names}
+    game_state["witness"] = {"name": names[0], "information": SENTENCE * 2}
+    game_state["current_questions"] = [{"question": SENTENCE, "keyWord": "Axe"} for _ in range(3)]
+    for day in range(2):
+        victim = rng.choice([npc for npc in game_state.npcs if game_state.is_alive(npc["name"]) and npc is not game_state.murderer])
+        game_state.set_alive(victim["name"], False)
+        game_state["murdered_npc"] = victim
+        game_state.murdered_npcs.append({"name": victim["name"], "day": day + 2})
+        game_state.current_day += 1
+    interrogation = InterrogationState(80, "짠짠영", "Axe", "도끼")
+    for _ in range(4):
+        interrogation.conversation_history.append({"role": "user", "content": "어젯밤에 어디 있었어?"})
+        interrogation.conversation_history.append({"role": "짠짠영", "content": SENTENCE})
+    game_state["interrogation"] = interrogation
+    return game_state
+
+
+def measure_codec(games, level, catalog):
+    start = time.perf_counter()
+    snapshots = [game.to_bytes(level) for game in games]
+    encode = (time.perf_counter() - start) / len(games)
+    start = time.perf_counter()
+    for data in snapshots:
+        GameState.from_bytes(data, catalog)
+    decode = (time.perf_counter() - start) / len(games)
+    return sum(len(data) for data in snapshots) / len(games), encode, decode
+
+
+def measure_disk(games, level):
+    with tempfile.TemporaryDirectory() as directory:
+        snapshots = SnapshotDirectory(directory)
+        start = time.perf_counter()
+        for game_no, game in enumerate(games):
+            snapshots.write(game_no, game.to_bytes(level))
+        write = (time.perf_counter() - start) / len(games)
+
+        # 재시작한 서버처럼 빈 세션 저장소에서 첫 접근 시 복원
+        game_service = GameService(SessionRegistry(), snapshots=snapshots)
+        start = time.perf_counter()
+        for game_no in range(len(games)):
+            game_service.get_session(game_no)
+        restore = (time.perf_counter() - start) / len(games)
+    return write, restore
+
+
+def main(games_count, levels):
+    catalog = get_catalog()
+    rng = random.Random(0)
+    games = [played_game(rng) for _ in range(games_count)]
+    raw = sum(len(game.to_bytes(0)) for game in games) / games_count
+    codec = "orjson" if game_state_module.orjson is not None else "json"
+    print(f"{games_count} games, {codec}, uncompressed snapshot {raw:.0f} B/game")
+    print(f"{'level':>5} {'bytes/game':>10} {'ratio':>6} {'encode us':>10} {'decode us':>10} {'write us':>9} {'lazy restore us':>16}")
+    for level in levels:
+        size, encode, decode = measure_codec(games, level, catalog)
+        write, restore = measure_disk(games, level)
+        print(f"{level:5d} {size:10.0f} {raw / size:6.2f} {encode * 1e6:10.1f} {decode * 1e6:10.1f} "
+              f"{write * 1e6:9.1f} {restore * 1e6:16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--levels", type=int, nargs="+", default=[0, 1, 6, 9], help="zlib levels to compare")
+    args = parser.parse_args()
+    main(args.games, args.levels)
@@ -0,0 +1,75 @@
+"""
+Cost of one /api/v2/new-game/status poll.
+
+"rebuild" is GameManagement.get_game_status plus JSON encoding, what every
+poll did before the status view. "changed" is a version bump published by
+GameStatusView (dynamic fields rebuilt from the cached profiles, then
+encoded; save_session does this once per committed change) plus one poll.
+"unchanged" is a poll between changes, which reuses the published body. The 304 path skips even that. "delta" is a
+/status/changes poll one version behind (an alibi and a witness changed).
+Response sizes are printed for the full and delta bodies.
+
+Usage (from the repository root):
+    python -m benchmarks.status_view_bench --rounds 20000
+"""
+import argparse
+import timeit
+
+from app.services.game_management import GameManagement
+from app.services.game_state import dumps
+from app.services.status_view import GameStatusView
+
+CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오", "소피아", "마르코", "알렉스"]
+
+
+def make_game():
+    game_management = GameManagement()
+    game_state = game_management.initialize_game("ko", CHARACTERS, "짠짠영")
+    game_state["alibis"] = {"짠짠영": "집에 있었어요.", "박동식": "광장에 있었어요."}
+    game_state["witness"] = {"name": "테오", "information": "봤어요."}
+    return game_management
+
+
+def main(rounds):
+    game_management = make_game()
+    game_state = game_management.game_state
+    view = GameStatusView(game_management)
+
+    def changed():
+        game_state.status_version += 1
+        view.publish()
+        return view.body()
+
+    def rebuild():
+        status = game_management.get_game_status()
+        status["alive"] = dict(status["alive"])
+        return dumps(status)
+
+    game_state.status_version += 1
+    game_state["alibis"] = {**game_state["alibis"], "테오": "숲에 있었어요."}
+    game_state["witness"] = {"name": "박동식", "information": "봤어요."}
+    view.record_change()
+    since = game_state.status_version - 1
+
+    cases = {
+        "rebuild": rebuild,
+        "unchanged": view.body,
+        "delta": lambda: dumps(view.changes(since)),
+        # 마지막에 실행 (변경 기록 없이 버전만 올리므로 이후의 delta는 전체 상태가 됨)
+        "changed": changed,
+    }
+    results = {}
+    view.body()
+    print(f"full body {len(view.body())} B, delta body {len(dumps(view.changes(since)))} B")
+    for name, case in cases.items():
+        results[name] = timeit.timeit(case, number=rounds) / rounds
+        print(f"{name:10} {results[name] * 1e6:8.2f} us/poll")
+    print(f"speedup: changed {results['rebuild'] / results['changed']:.1f}x, "
+          f"unchanged {results['rebuild'] / results['unchanged']:.1f}x, delta {results['rebuild'] / results['delta']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.rounds)
@@ -0,0 +1,58 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from app.services.game_management import GameManagement
+from app.utils import catalog
+from tests.conftest import CHARACTERS, MURDERER
+
+
+def test_games_share_frozen_catalog_with_separate_npcs():
+    first, second = GameManagement(), GameManagement()
+    first_state = first.initialize_game("ko", CHARACTERS, MURDERER)
+    second_state = second.initialize_game("ko", CHARACTERS, MURDERER)
+
+    assert first.catalog is second.catalog
+    assert first.weapons is second.weapons
+
+    with pytest.raises(TypeError):
+        first.npcs[0]["age"] = 0
+    with pytest.raises(AttributeError):
+        first.catalog.npcs = ()
+
+    # 게임별 NPC는 카탈로그와 다른 게임에 영향을 주지 않음
+    first_state["npcs"][0]["alive"] = False
+    assert "alive" not in second_state["npcs"][0]
+    assert "preferredWeapons" not in first.npcs[0]
+
+
+def test_catalog_reloads_atomically_on_change(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    shutil.copytree(os.path.join("resources", "data"), data_dir)
+    monkeypatch.setattr(catalog, "CATALOG_DATA_DIR", str(data_dir))
+    monkeypatch.setattr(catalog, "CATALOG_RELOAD_INTERVAL", 0)
+    catalog.reset_catalog()
+    try:
+        old = catalog.get_catalog()
+        assert catalog.get_catalog() is old
+
+        weapons_path = data_dir / "weapons.json"
+        weapons = json.loads(weapons_path.read_text(encoding="utf-8"))
+        weapons["weapons"] = weapons["weapons"][:5]
+        weapons_path.write_text(json.dumps(weapons, ensure_ascii=False), encoding="utf-8")
+        os.utime(weapons_path, ns=(old.mtimes[0] + 10**9, old.mtimes[0] + 10**9))
+
+        new = catalog.get_catalog()
+        assert new is not old
+        assert new.version == old.version + 1
+        assert len(new.weapons) == 5
+        assert len(old.weapons) > 5
+
+        # 파일이 깨진 경우 이전 버전을 유지
+        weapons_path.write_text("{", encoding="utf-8")
+        os.utime(weapons_path, ns=(old.mtimes[0] + 2 * 10**9, old.mtimes[0] + 2 * 10**9))
+        assert catalog.get_catalog() is new
+    finally:
+        catalog.reset_catalog()
@@ -0,0 +1,61 @@
+import asyncio
+
+from fastapi import FastAPI
+import httpx
+import pytest
+
+from app.api.v1 import etc_router
+from app.langchain import chains
+from app.langchain.prompt import prompts_scenario
+from app.utils import llm_backend
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(llm_backend, "LLM_PROVIDER", "stub")
+    monkeypatch.setattr(llm_backend, "LLM_BASE_URL", None)
+    pool = chains.LLMChainPool(max_size=2)
+    monkeypatch.setattr(chains, "chain_pool", pool)
+    return pool
+
+
+def test_same_key_prompt_and_model_reuse_the_chain(pool):
+    first = chains.define_llm_chain("sk-a", prompts_scenario.generate_victim_prompt)
+    assert chains.define_llm_chain("sk-a", prompts_scenario.generate_victim_prompt) is first
+    assert pool.stats() == {"size": 1, "maxSize": 2, "hits": 1, "misses": 1, "evictions": 0}
+
+    # 다른 키, 다른 프롬프트, 다른 모델은 새 체인을 만듦
+    assert chains.define_llm_chain("sk-b", prompts_scenario.generate_victim_prompt) is not first
+    assert chains.define_llm_chain("sk-a", prompts_scenario.final_words_prompt) is not first
+    assert pool.get("sk-a", prompts_scenario.generate_victim_prompt, model="gpt-4o-mini") is not first
+    assert pool.stats()["misses"] == 4 and pool.stats()["hits"] == 1
+
+
+def test_least_recently_used_chain_is_evicted(pool):
+    victim = chains.define_llm_chain("sk-a", prompts_scenario.generate_victim_prompt)
+    final_words = chains.define_llm_chain("sk-a", prompts_scenario.final_words_prompt)
+    # victim 체인을 다시 사용했으므로 가득 찬 상태에서는 final_words 체인이 제거됨
+    assert chains.define_llm_chain("sk-a", prompts_scenario.generate_victim_prompt) is victim
+    chains.define_llm_chain("sk-a", prompts_scenario.intro_prompt)
+
+    assert pool.stats() == {"size": 2, "maxSize": 2, "hits": 1, "misses": 3, "evictions": 1}
+    assert chains.define_llm_chain("sk-a", prompts_scenario.generate_victim_prompt) is victim
+    assert chains.define_llm_chain("sk-a", prompts_scenario.final_words_prompt) is not final_words
+
+
+def test_stats_route_reports_the_pool(pool):
+    chains.define_llm_chain("sk-a", prompts_scenario.generate_victim_prompt)
+    chains.define_llm_chain("sk-a", prompts_scenario.generate_victim_prompt)
+    chains.define_llm_chain("sk-b", prompts_scenario.generate_victim_prompt)
+
+    app = FastAPI()
+    app.include_router(etc_router.router)
+    response = asyncio.run(get(app, "/api/v1/etc/llm-chain-pool"))
+    assert response.status_code == 200
+    assert response.json() == {"size": 2, "maxSize": 2, "hits": 1, "misses": 2, "evictions": 0}
+
+
+async def get(app, path):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path)
@@ -0,0 +1,37 @@
+import pytest
+
+from app.schemas.game_schema import GameStartRequest, LivingNPCInfo
+from app.services import game_journal, game_snapshot
+from app.utils import state_store
+
+# 테스트에서 함께 쓰는 게임 참가자 (MURDERER가 범인)
+CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오", "소피아", "마르코", "알렉스"]
+MURDERER = "짠짠영"
+
+
+@pytest.fixture(autouse=True)
+def no_default_persistence(monkeypatch):
+    # 환경 변수와 관계없이 GameService()가 작업 디렉터리에 스냅샷/저널을 쓰거나 외부 저장소를 쓰지 않도록 함
+    # (스냅샷/저널/저장소를 다루는 테스트는 tmp_path 또는 저장소를 직접 넘김)
+    monkeypatch.setattr(game_snapshot, "GAME_SNAPSHOT_DIR", "")
+    monkeypatch.setattr(game_journal, "GAME_JOURNAL_PATH", "")
+    monkeypatch.setattr(state_store, "GAME_STATE_STORE", "")
+
+
+# /api/v2/new-game/start 요청 본문
+def game_request(game_no=1, language="ko", characters=CHARACTERS, murderer=MURDERER):
+    return {
+        "gameNo": game_no,
+        "language": language,
+        "characters": [{"npcName": name, "npcJob": "Murderer" if name == murderer else "Resident"} for name in characters],
+    }
+
+
+# 게임을 시작하고 게임 상태를 반환
+def start_game(game_service, game_no=1, language="ko"):
+    return game_service.initialize_new_game(GameStartRequest(**game_request(game_no, language)))
+
+
+# 모든 참가자가 살아 있는 next_day 요청의 livingCharacters
+def living():
+    return [LivingNPCInfo(name=name, status="ALIVE", job="Murderer" if name == MURDERER else "Resident") for name in CHARACTERS]
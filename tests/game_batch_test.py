@@ -0,0 +1,84 @@
+import asyncio
+
+from fastapi import FastAPI
+import httpx
+
+from app.api.v2 import new_game_router
+from app.core.sharding import ShardConfig, ShardDispatcher
+from app.services.game_service import GameService
+from app.services.session_registry import SessionRegistry
+from tests.conftest import MURDERER, game_request
+
+NODES = ["http://worker-a", "http://worker-b", "http://worker-c"]
+
+
+def worker_app(shard=None):
+    app = FastAPI()
+    app.include_router(new_game_router.router)
+    app.state.game_service = GameService(SessionRegistry())
+    app.state.shard = shard
+    return app
+
+
+def test_start_batch_reports_errors_per_game():
+    app = worker_app()
+    asyncio.run(check_batches(app, app.state.game_service))
+
+
+async def check_batches(app, game_service):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        games = [
+            game_request(1), game_request(2, "en"), game_request(1), game_request(3, "fr"),
+            game_request(4, characters=["없는사람", MURDERER]), game_request(5, murderer=None),
+        ]
+        response = await client.post("/api/v2/new-game/start-batch", json={"games": games})
+        assert response.status_code == 200
+        results = response.json()["games"]
+        assert [result["gameNo"] for result in results] == [1, 2, 1, 3, 4, 5]
+        assert [("answer" in result) for result in results] == [True, True, False, False, False, False]
+        assert "more than once" in results[2]["error"] and "Invalid language" in results[3]["error"]
+        assert "없는사람" in results[4]["error"] and "Murderer" in results[5]["error"]
+        assert sorted(session.game_no for session in game_service.sessions.values()) == [1, 2]
+
+        response = await client.post("/api/v2/new-game/status-batch", json={"gameNos": [2, 404, 1]})
+        results = response.json()["games"]
+        assert results[0] == {"gameNo": 2, "status": game_service.get_game_status(2)}
+        assert results[1] == {"gameNo": 404, "error": "Game ID 404 not found"}
+        assert results[2]["status"]["statusVersion"] == game_service.get_session(1).game_state.status_version
+
+        response = await client.post("/api/v2/new-game/status-batch", json={"gameNos": list(range(1001))})
+        assert response.status_code == 400
+
+
+class NodeTransport(httpx.AsyncBaseTransport):
+    # 워커 URL별로 다른 ASGI 앱에 전달
+    def __init__(self, apps):
+        self.transports = {node: httpx.ASGITransport(app=app) for node, app in apps.items()}
+
+    async def handle_async_request(self, request):
+        return await self.transports[f"http://{request.url.host}"].handle_async_request(request)
+
+
+def test_dispatcher_splits_batches_by_owner():
+    apps = {node: worker_app(ShardConfig(node, NODES)) for node in NODES}
+    asyncio.run(check_dispatcher(apps))
+
+
+async def check_dispatcher(apps):
+    dispatcher = ShardDispatcher(NODES)
+    dispatcher.client = httpx.AsyncClient(transport=NodeTransport(apps))
+    transport = httpx.ASGITransport(app=dispatcher)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/v2/new-game/start-batch", json={"games": [game_request(game_no) for game_no in range(30)]})
+        assert [result["gameNo"] for result in response.json()["games"]] == list(range(30))
+        assert all("answer" in result for result in response.json()["games"])
+        for node, app in apps.items():
+            owned = sorted(session.game_no for session in app.state.game_service.sessions.values())
+            assert owned == [game_no for game_no in range(30) if dispatcher.ring.node_for(game_no) == node]
+
+        response = await client.post("/api/v2/new-game/status-batch", json={"gameNos": [29, 3, 404]})
+        results = response.json()["games"]
+        assert [result["gameNo"] for result in results] == [29, 3, 404]
+        assert "status" in results[0] and "status" in results[1] and "error" in results[2]
+    await dispatcher.client.aclose()
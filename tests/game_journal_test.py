@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from app.services.game_journal import GameJournal, apply_record, encode_fields, mutation_record
+from app.services.game_service import GameService
+from app.services.game_snapshot import SnapshotDirectory
+from app.services.game_state import loads
+from app.utils import gpt_helper, llm_backend, llm_stub
+from tests.conftest import MURDERER, living, start_game
+
+
+@pytest.fixture
+def stub_backend(monkeypatch):
+    monkeypatch.setattr(llm_backend, "LLM_PROVIDER", "stub")
+    monkeypatch.setattr(llm_backend, "LLM_BASE_URL", None)
+    monkeypatch.setattr(gpt_helper, "_client", None)
+    monkeypatch.setattr(gpt_helper, "_client_loop", None)
+    yield llm_stub.configure_stub(latency="fixed:0.2", seed=0)
+    llm_stub.configure_stub()
+
+
+def worker(tmp_path, **journal_options):
+    journal = GameJournal(str(tmp_path / "journal.log"), fsync_interval=0, **journal_options)
+    return GameService(snapshots=SnapshotDirectory(tmp_path), journal=journal)
+
+
+def test_records_contain_only_changed_fields():
+    before = {"current_day": 1, "conversations": [{"npc": "a"}], "alibis": {"a": "x"}}
+    after = {"current_day": 2, "conversations": [{"npc": "a"}, {"npc": "b"}], "alibis": {"a": "x"}}
+
+    record = loads(mutation_record(1, "talk_to_npc", encode_fields(before), encode_fields(after)))
+    assert record == {"game": 1, "op": "talk_to_npc", "set": {"current_day": 2}, "append": {"conversations": [{"npc": "b"}]}}
+    assert apply_record(before, record) == after
+    assert mutation_record(1, "talk_to_npc", encode_fields(after), encode_fields(after)) is None
+
+
+def test_crashed_worker_games_are_recovered_from_the_journal(tmp_path):
+    game_service = worker(tmp_path)
+    start_game(game_service, 1)
+    start_game(game_service, 2)
+    session = game_service.get_session(1)
+    session.game_state["alibis"] = {MURDERER: "집에 있었어요."}
+    game_service.save_session(session, "generate_alibis_and_witness")
+    game_service.new_interrogation(1, MURDERER, "Axe")
+    game_service.remove_game(2)
+    status = game_service.get_game_status(1)
+    # 스냅샷 없이 종료된 워커
+    assert SnapshotDirectory(tmp_path).game_numbers() == []
+
+    restarted = worker(tmp_path)
+    assert restarted.recover_journal()["games"] == 1
+    assert restarted.journal.size == 0
+    assert restarted.get_game_status(1) == status
+    assert restarted.get_session(1).game_state["alibis"] == {MURDERER: "집에 있었어요."}
+    assert restarted.get_session(1).game_state["interrogation"].suspect_name == MURDERER
+    assert 2 not in restarted.sessions and SnapshotDirectory(tmp_path).game_numbers() == [1]
+
+
+def test_journal_is_compacted_into_snapshots(tmp_path):
+    game_service = worker(tmp_path, compact_bytes=1)
+    start_game(game_service, 1)
+
+    # 압축 후에는 스냅샷 표시만 남음
+    assert [record["op"] for record in game_service.journal.records()] == ["snapshot"]
+    assert game_service.snapshots.game_numbers() == [1]
+    game_service.new_interrogation(1, "박동식", None)
+    game_service.journal.close()
+
+    restarted = worker(tmp_path)
+    restarted.recover_journal()
+    assert restarted.get_session(1).game_state["interrogation"].suspect_name == "박동식"
+
+
+def test_compaction_waits_for_a_game_between_two_of_its_saves(tmp_path, stub_backend):
+    game_service = worker(tmp_path)
+    start_game(game_service, 1)
+    start_game(game_service, 2)
+    asyncio.run(compact_during_next_day(game_service))
+    game_state = game_service.get_session(1).game_state
+    murdered = [(npc["name"], npc["day"]) for npc in game_state["murdered_npcs"]]
+    assert len(murdered) == len(set(murdered)) == 3
+    game_service.journal.close()
+
+    restarted = worker(tmp_path)
+    restarted.recover_journal()
+    assert restarted.get_session(1).game_state.to_dict() == game_state.to_dict()
+
+
+async def compact_during_next_day(game_service):
+    # 게임 1이 LLM 응답을 기다리는 동안 게임 2의 저장이 압축을 시작
+    next_day = asyncio.create_task(game_service.proceed_to_next_day(1, living()))
+    await asyncio.sleep(0.05)
+    game_service.journal.compact_bytes = 1
+    async with game_service.locks(2):
+        game_service.new_interrogation(2, MURDERER, None)
+    await asyncio.sleep(0)
+    assert not next_day.done() and not game_service.compaction.done()
+
+    # 압축은 게임 1의 작업이 끝난 뒤의 상태를 저장하고, 다음 저장은 그 상태와 비교
+    await next_day
+    await game_service.compaction
+    assert game_service.journal.compacting_games == set()
+    assert game_service.snapshots.game_numbers() == [1, 2]
+    game_service.journal.compact_bytes = 1 << 30
+    await game_service.proceed_to_next_day(1, living())
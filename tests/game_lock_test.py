@@ -0,0 +1,149 @@
+import asyncio
+
+from fastapi import FastAPI
+import httpx
+import pytest
+
+from app.api.v2 import new_game_router
+from app.services.game_service import GameService
+from app.services.question_generation import QuestionGeneration
+from app.services.scenario_generation import ScenarioGeneration
+from app.services.session_registry import SessionRegistry
+from app.utils import gpt_helper, llm_backend, llm_stub
+from tests.conftest import MURDERER, living, start_game
+
+
+@pytest.fixture
+def stub_backend(monkeypatch):
+    monkeypatch.setattr(llm_backend, "LLM_PROVIDER", "stub")
+    monkeypatch.setattr(llm_backend, "LLM_BASE_URL", None)
+    monkeypatch.setattr(gpt_helper, "_client", None)
+    monkeypatch.setattr(gpt_helper, "_client_loop", None)
+    yield llm_stub.configure_stub(latency="uniform:0.001,0.01", seed=0)
+    llm_stub.configure_stub()
+
+
+@pytest.fixture
+def timeline(monkeypatch):
+    # 게임 상태를 바꾸는 작업의 시작/끝을 (gameNo 대신 game_state id로) 기록
+    events = []
+
+    def record(method):
+        async def wrapper(self, *args, **kwargs):
+            events.append((id(self.game_state), "start"))
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                events.append((id(self.game_state), "end"))
+        return wrapper
+
+    monkeypatch.setattr(QuestionGeneration, "talk_to_npc", record(QuestionGeneration.talk_to_npc))
+    monkeypatch.setattr(ScenarioGeneration, "proceed_to_next_day", record(ScenarioGeneration.proceed_to_next_day))
+    return events
+
+
+def test_requests_for_one_game_run_one_at_a_time(stub_backend, timeline):
+    game_service = GameService(SessionRegistry())
+    start_game(game_service, 1)
+    talks, days = 24, 3
+
+    async def hammer():
+        await game_service.generate_npc_questions(1, MURDERER, "Axe", "weapon")
+        await asyncio.gather(*(
+            game_service.proceed_to_next_day(1, living()) if index % 8 == 0
+            else game_service.talk_to_npc(1, MURDERER, index % 3 + 1, "Axe", "weapon")
+            for index in range(talks)
+        ))
+
+    asyncio.run(hammer())
+
+    # 한 게임의 작업은 겹치지 않음 (start 다음에는 항상 같은 작업의 end)
+    kinds = [kind for _, kind in timeline]
+    assert kinds == ["start", "end"] * talks
+    game_state = game_service.get_session(1).game_state
+    assert game_state["conversations_left"] == 5 - (talks - days)
+    assert game_state["current_day"] == 1 + days
+    assert len(game_state["murdered_npcs"]) == 1 + days
+    assert game_service.locks.stats()["waits"] > 0
+
+
+def test_different_games_never_wait_for_each_other(stub_backend, timeline):
+    game_service = GameService(SessionRegistry())
+    games = 20
+    for game_no in range(games):
+        start_game(game_service, game_no)
+
+    async def play():
+        await asyncio.gather(*(game_service.generate_npc_questions(game_no, MURDERER, "Axe", "weapon") for game_no in range(games)))
+        await asyncio.gather(*(game_service.talk_to_npc(game_no, MURDERER, 1, "Axe", "weapon") for game_no in range(games)))
+
+    asyncio.run(play())
+
+    # 모든 게임의 대화가 시작된 뒤에야 첫 대화가 끝남 (서로 기다리지 않고 LLM 응답을 함께 기다림)
+    kinds = [kind for _, kind in timeline]
+    assert kinds == ["start"] * games + ["end"] * games
+    assert game_service.locks.stats()["waits"] == 0
+    assert game_service.locks.stats()["activeKeys"] == 0
+
+
+def test_status_polls_do_not_wait_for_the_next_day_llm_call(stub_backend):
+    llm_stub.configure_stub(latency="fixed:0.2", seed=0)
+    app = FastAPI()
+    app.include_router(new_game_router.router)
+    app.state.game_service = game_service = GameService(SessionRegistry())
+    app.state.shard = None
+    start_game(game_service, 1)
+    asyncio.run(check_status_during_next_day(app, game_service))
+
+
+async def check_status_during_next_day(app, game_service):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        before = (await client.post("/api/v2/new-game/status", json={"gameNo": 1})).json()
+        next_day = asyncio.create_task(game_service.proceed_to_next_day(1, living()))
+        await asyncio.sleep(0.05)
+
+        # 다음 날 진행이 락을 잡고 LLM 응답을 기다리는 동안에도 마지막으로 저장된 상태를 바로 반환
+        response = await client.post("/api/v2/new-game/status", json={"gameNo": 1})
+        changes = await client.post(f"/api/v2/new-game/status/changes?since={before['statusVersion']}", json={"gameNo": 1})
+        batch = await client.post("/api/v2/new-game/status-batch", json={"gameNos": [1]})
+        assert not next_day.done()
+        assert response.json() == before and response.json()["current_day"] == 1
+        assert changes.json() == {"statusVersion": before["statusVersion"], "full": False, "changes": {}}
+        assert batch.json()["games"][0]["status"] == before
+
+        await next_day
+        after = (await client.post("/api/v2/new-game/status", json={"gameNo": 1})).json()
+        assert after["statusVersion"] == before["statusVersion"] + 1 and after["current_day"] == 2
+
+
+def test_end_game_stream_builds_letters_after_waiting_for_the_lock(stub_backend):
+    game_service = GameService(SessionRegistry())
+    start_game(game_service, 1)
+    start_game(game_service, 2)
+    asyncio.run(check_end_game_stream(game_service))
+
+
+async def check_end_game_stream(game_service):
+    async def consume(gameNo):
+        return [event async for event in game_service.stream_end_game(gameNo, "WIN")]
+
+    # 스트림을 만든 뒤 앞선 요청이 락을 잡고 생존자를 바꾸면 편지는 바뀐 상태로 구성됨
+    async with game_service.locks(1):
+        stream = asyncio.create_task(consume(1))
+        await asyncio.sleep(0)
+        game_state = game_service.get_session(1).game_state
+        victim = next(npc for npc in game_service.get_session(1).resolver.living_npcs() if npc is not game_state.murderer)
+        game_state.set_alive(victim["name"], False)
+        survivors = len(game_service.get_session(1).resolver.living_npcs()) - 1
+    events = await stream
+    assert events[0] == {"type": "result", "result": "WIN", "letters": 2 + survivors}
+    assert victim["name"] not in [event.get("name") for event in events]
+    assert 1 not in game_service.sessions
+
+    # 락을 기다리는 동안 게임이 제거되면 오류 이벤트 하나로 끝남
+    async with game_service.locks(2):
+        stream = asyncio.create_task(consume(2))
+        await asyncio.sleep(0)
+        game_service.remove_game(2)
+    assert await stream == [{"type": "error", "error": "Game ID 2 not found"}]
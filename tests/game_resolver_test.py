@@ -0,0 +1,86 @@
+import pytest
+
+from app.services.game_service import GameService
+from tests.conftest import start_game
+
+
+def started_game_service(game_no=1):
+    game_service = GameService()
+    start_game(game_service, game_no)
+    return game_service
+
+
+def test_resolver_is_shared_by_game_services():
+    game_service = started_game_service()
+    resolver = game_service.get_session(1).scenario_generation.resolver
+
+    assert game_service.get_session(1).question_generation.resolver is resolver
+    assert game_service.get_session(1).interrogation.resolver is resolver
+    assert game_service.get_session(1).hint_investigation.resolver is resolver
+
+    npc = resolver.npc("박동식")
+    assert any(npc is record for record in game_service.get_session(1).game_state["npcs"])
+    assert resolver.npc("ParkDongSik", "en") is npc
+    assert resolver.npc("아무개") is None
+
+
+def test_resolver_tracks_deaths():
+    game_service = started_game_service()
+    game_state = game_service.get_session(1).game_state
+    resolver = game_service.get_session(1).scenario_generation.resolver
+    npc = next(npc for npc in resolver.living_npcs() if npc is not game_state["murderer"])
+    alive_before = len(resolver.living_npcs())
+
+    resolver.set_alive(npc["name"], False)
+
+    assert game_state["alive"][npc["name"]] is False
+    assert npc["alive"] is False
+    assert npc not in resolver.living_npcs()
+    assert len(resolver.living_npcs()) == alive_before - 1
+
+
+def test_hint_investigation_filters_by_resolved_names():
+    game_service = started_game_service()
+    game_state = game_service.get_session(1).game_state
+    hint = game_service.get_session(1).hint_investigation
+    murderer = game_state["murderer"]
+    weapons, places = hint.weapons, hint.places
+
+    weapon_name = next(w["weapon"]["ko"] for w in weapons if w["id"] == murderer["preferredWeapons"][0])
+    place_name = next(p["place"]["ko"] for p in places if p["id"] == murderer["preferredLocations"][0])
+
+    assert murderer in hint.filter_suspects(weapon_name, place_name)
+    assert weapon_name in hint.find_item(weapon_name)
+    assert hint.filter_suspects("없는 무기", place_name) == []
+
+
+def test_multi_criteria_filter_matches_linear_scan():
+    game_service = started_game_service()
+    game_state = game_service.get_session(1).game_state
+    hint = game_service.get_session(1).hint_investigation
+    resolver = hint.resolver
+    npcs = game_state["npcs"]
+    weapon_ids = sorted({npcs[0]["preferredWeapons"][0], npcs[1]["preferredWeapons"][0]})
+    location_ids = sorted({npcs[0]["preferredLocations"][0], npcs[2]["preferredLocations"][0]})
+    weapon_names = [w["weapon"]["ko"] for w in hint.weapons if w["id"] in weapon_ids]
+    place_names = [p["place"]["ko"] for p in hint.places if p["id"] in location_ids]
+
+    victim = next(npc for npc in npcs if npc is not game_state["murderer"])
+    resolver.set_alive(victim["name"], False)
+    excluded = npcs[3]
+
+    expected = [
+        npc for npc in npcs
+        if set(weapon_ids) & set(npc["preferredWeapons"])
+        and set(location_ids) & set(npc["preferredLocations"])
+        and game_state["alive"][npc["name"]]
+        and npc is not excluded
+    ]
+    excluded_name = next(n["name"]["ko"] for n in resolver.names if n["id"] == excluded["name"])
+    assert hint.filter_suspects_by(weapon_names, place_names, True, [excluded_name]) == expected
+
+    suspects = game_service.filter_game_suspects_by(1, weapon_names, [], alive_only=False)
+    assert len(suspects) == sum(1 for npc in npcs if set(weapon_ids) & set(npc["preferredWeapons"]))
+
+    with pytest.raises(ValueError):
+        hint.filter_suspects_by(["없는 무기"], [])
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from app.services.game_service import GameService
+from app.services.game_snapshot import SnapshotDirectory
+from app.services.game_state import GameState, SNAPSHOT_MAGIC
+from app.services.session_registry import SessionRegistry
+from app.utils import catalog, gpt_helper, llm_backend, llm_stub
+from tests.conftest import MURDERER, living, start_game
+
+
+@pytest.fixture
+def stub_backend(monkeypatch):
+    monkeypatch.setattr(llm_backend, "LLM_PROVIDER", "stub")
+    monkeypatch.setattr(llm_backend, "LLM_BASE_URL", None)
+    monkeypatch.setattr(gpt_helper, "_client", None)
+    monkeypatch.setattr(gpt_helper, "_client_loop", None)
+    yield llm_stub.configure_stub(latency="fixed:0.2", seed=0)
+    llm_stub.configure_stub()
+
+
+def test_snapshot_round_trip(tmp_path):
+    game_service = GameService(snapshots=SnapshotDirectory(tmp_path))
+    start_game(game_service)
+    game_state = game_service.get_session(1).game_state
+    game_state["alibis"] = {MURDERER: "집에 있었어요."}
+    game_service.new_interrogation(1, MURDERER, "Axe")
+
+    data = game_state.to_bytes()
+    assert data.startswith(SNAPSHOT_MAGIC)
+    assert len(data) < len(game_state.to_bytes(compression_level=0))
+    assert GameState.from_bytes(data).to_dict() == game_state.to_dict()
+
+    with pytest.raises(ValueError):
+        GameState.from_bytes(b"JUNK" + data[4:])
+
+
+def test_games_are_restored_from_snapshots_on_first_access(tmp_path):
+    game_service = GameService(snapshots=SnapshotDirectory(tmp_path))
+    start_game(game_service, 1)
+    start_game(game_service, 2)
+    assert game_service.save_game_progress(1)["bytes"] > 0
+    status = game_service.get_game_status(1)
+
+    # 재시작한 서버: 메모리는 비어 있고 스냅샷만 남아 있음
+    restarted = GameService(snapshots=SnapshotDirectory(tmp_path))
+    assert 1 not in restarted.sessions
+    assert restarted.get_game_status(1) == status
+    with pytest.raises(ValueError):
+        restarted.get_game_status(2)
+
+    restarted.remove_game(1)
+    assert SnapshotDirectory(tmp_path).game_numbers() == []
+
+
+def test_evicted_sessions_are_snapshotted(tmp_path):
+    game_service = GameService(SessionRegistry(max_sessions=1), snapshots=SnapshotDirectory(tmp_path))
+    start_game(game_service, 1)
+    start_game(game_service, 2)
+
+    assert 1 not in game_service.sessions
+    assert game_service.snapshots.game_numbers() == [1]
+    assert game_service.get_session(1).game_state.language == "ko"
+
+
+def test_snapshot_all_and_restore_all(tmp_path):
+    game_service = GameService(snapshots=SnapshotDirectory(tmp_path))
+    for game_no in range(3):
+        start_game(game_service, game_no)
+    assert asyncio.run(game_service.snapshot_all())["games"] == 3
+
+    restarted = GameService(snapshots=SnapshotDirectory(tmp_path))
+    assert asyncio.run(restarted.restore_all())["games"] == 3
+    assert len(restarted.sessions) == 3
+
+
+def test_snapshot_all_waits_for_the_operation_in_flight(tmp_path, stub_backend):
+    game_service = GameService(snapshots=SnapshotDirectory(tmp_path))
+    start_game(game_service, 1)
+    start_game(game_service, 2)
+    asyncio.run(snapshot_all_during_next_day(game_service))
+
+    restarted = GameService(snapshots=SnapshotDirectory(tmp_path))
+    assert restarted.get_game_status(1) == game_service.get_game_status(1)
+
+
+async def snapshot_all_during_next_day(game_service):
+    next_day = asyncio.create_task(game_service.proceed_to_next_day(1, living()))
+    await asyncio.sleep(0.05)
+    snapshot_all = asyncio.create_task(game_service.snapshot_all())
+    await asyncio.sleep(0.05)
+    # 다음 날 진행이 LLM 응답을 기다리는 동안에는 그 게임을 저장하지 않음
+    assert not snapshot_all.done() and 1 not in game_service.snapshots.game_numbers()
+
+    await next_day
+    assert (await snapshot_all)["games"] == 2
+    assert game_service.get_game_status(1)["current_day"] == 2
+
+
+def test_games_referring_to_removed_npcs_fail_with_a_value_error(tmp_path, monkeypatch):
+    game_service = GameService(snapshots=SnapshotDirectory(tmp_path))
+    start_game(game_service, 1)
+    start_game(game_service, 2)
+    asyncio.run(game_service.snapshot_all())
+
+    # 핫 리로드된 카탈로그에서 게임의 NPC 하나가 빠짐
+    current = catalog.get_catalog()
+    removed = game_service.get_session(1).game_state.npcs[0]["name"]
+    data = {name: catalog.thaw(getattr(current, name)) for name in catalog.CATALOG_FILES}
+    data["npcs"] = [npc for npc in data["npcs"] if npc["name"] != removed]
+    monkeypatch.setattr(catalog, "_catalog", catalog.GameCatalog(current.version + 1, current.mtimes, **data))
+    monkeypatch.setattr(catalog, "_catalog_checked_at", float("inf"))
+
+    restarted = GameService(snapshots=SnapshotDirectory(tmp_path))
+    with pytest.raises(ValueError, match=removed):
+        restarted.get_session(1)
+    assert asyncio.run(restarted.restore_all()) == {"games": 0, "failed": 2, "seconds": pytest.approx(0, abs=1)}
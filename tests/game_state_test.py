@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from app.services.game_management import GameManagement
+from app.services.game_state import GameState, InterrogationState
+from tests.conftest import CHARACTERS, MURDERER
+
+
+def test_game_state_keeps_dict_access():
+    game_management = GameManagement()
+    game_state = game_management.initialize_game("ko", CHARACTERS, MURDERER)
+
+    assert game_state["suspects"] is game_state["npcs"]
+    assert game_state["murderer"]["name"] == "ZzanZzanYoung"
+    assert game_state["places"] is game_management.catalog.places
+    assert game_state["alive"][game_state["murdered_npc"]["name"]] is False
+    assert sum(game_state["alive"].values()) == len(CHARACTERS) - 1
+
+    assert "scenario" not in game_state
+    assert game_state.get("alibis", {}) == {}
+    game_state.update({"witness": {"name": "x", "information": "y"}})
+    assert game_state["witness"]["name"] == "x"
+    game_state["conversations_left"] -= 1
+    assert game_state.conversations_left == 4
+
+    with pytest.raises(TypeError):
+        game_state["alive"]["ZzanZzanYoung"] = False
+    with pytest.raises(KeyError):
+        game_state["unknown"] = 1
+
+
+def test_game_state_round_trips_through_json():
+    game_state = GameManagement().initialize_game("ko", CHARACTERS, MURDERER)
+    victim = next(npc for npc in game_state.npcs if npc is not game_state.murderer and game_state.is_alive(npc["name"]))
+    game_state.set_alive(victim["name"], False)
+    game_state["murdered_npc"] = victim
+    game_state.setdefault("scenarios", []).append("day 2")
+    game_state["interrogation"] = InterrogationState(80, MURDERER, "Axe", "도끼")
+
+    restored = GameState.from_dict(json.loads(json.dumps(game_state.to_dict())), game_state.catalog)
+
+    assert restored.to_dict() == game_state.to_dict()
+    assert restored["murdered_npc"]["name"] == victim["name"]
+    assert dict(restored["alive"]) == dict(game_state["alive"])
+    assert restored["interrogation"].weapon_name == "도끼"
+    assert "scenario" not in restored
+
+
+def test_npc_overlays_share_catalog_records():
+    first = GameManagement()
+    second = GameManagement()
+    first_state = first.initialize_game("ko", CHARACTERS, MURDERER)
+    second_state = second.initialize_game("ko", CHARACTERS, MURDERER)
+    first_npc, second_npc = first_state.npcs[0], second_state.npcs[0]
+
+    assert first_npc.base is second_npc.base
+    assert first_npc is not second_npc and first_npc != second_npc
+
+    first_npc["preferredLocations"] = ("Park",)
+    first_state.set_alive(first_npc["name"], False)
+    assert second_npc["preferredLocations"] != ("Park",) and "alive" not in second_npc
+    assert first_npc.base["preferredLocations"] != ("Park",)
+    assert dict(first_npc)["age"] == first_npc.base["age"]
+
+    with pytest.raises(TypeError):
+        first_npc["age"] = 0
+    assert set(first_state.to_dict()["npcs"][0]) == {"name", "preferredWeapons", "preferredLocations", "alive"}
@@ -0,0 +1,48 @@
+from app.utils import game_utils
+from app.utils.catalog import get_catalog, thaw
+from app.utils.game_utils import (
+    get_by_id,
+    get_feature_detail,
+    get_location_id,
+    get_location_name,
+    get_name,
+    get_npc_id,
+    get_personality_detail,
+    get_weapon_id,
+    get_weapon_name,
+)
+
+
+def test_indexed_lookups_match_linear_scans():
+    catalog = get_catalog()
+    lookups = [
+        (get_name, catalog.names),
+        (get_weapon_name, catalog.weapons),
+        (get_location_name, catalog.places),
+        (get_personality_detail, catalog.personalities),
+        (get_feature_detail, catalog.features),
+    ]
+    for lookup, entities in lookups:
+        for entity in entities:
+            for lang in ("ko", "en"):
+                if lookup is get_name:
+                    assert lookup(entity["id"], lang, entities) == lookup(entity["id"], lang, thaw(entities))
+                else:
+                    assert lookup(entity["id"], entities, lang) == lookup(entity["id"], thaw(entities), lang)
+        assert game_utils.get_index(entities) is not None
+        assert game_utils.get_index(thaw(entities)) is None
+
+
+def test_reverse_lookups_and_missing_ids():
+    catalog = get_catalog()
+    weapon = catalog.weapons[0]
+    place = catalog.places[0]
+
+    assert get_npc_id("박동식", "ko", catalog.names) == get_npc_id("박동식", "ko", thaw(catalog.names)) is not None
+    assert get_weapon_id(weapon["weapon"]["ko"], "ko", catalog.weapons) == weapon["id"]
+    assert get_location_id(place["place"]["en"], "en", catalog.places) == place["id"]
+    assert get_by_id(weapon["id"], catalog.weapons) is weapon
+
+    assert get_name("Nobody", "ko", catalog.names) == "Nobody"
+    assert get_npc_id("아무개", "ko", catalog.names) is None
+    assert get_by_id("Nothing", catalog.weapons) is None
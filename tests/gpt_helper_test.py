@@ -0,0 +1,115 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from app.utils import gpt_helper, llm_backend, llm_stub
+
+
+@pytest.fixture
+def stub_backend(monkeypatch):
+    monkeypatch.setattr(llm_backend, "LLM_PROVIDER", "stub")
+    monkeypatch.setattr(llm_backend, "LLM_BASE_URL", None)
+    monkeypatch.setattr(gpt_helper, "_client", None)
+    monkeypatch.setattr(gpt_helper, "_client_loop", None)
+    yield llm_stub.configure_stub(seed=0)
+    llm_stub.configure_stub()
+
+
+@pytest.fixture
+def sent_timeouts(monkeypatch, stub_backend):
+    # stub transport로 보낸 요청마다 httpx 타임아웃 설정을 기록
+    timeouts = []
+
+    async def record(request):
+        timeouts.append(request.extensions["timeout"])
+        return await handle_request_async(request)
+
+    handle_request_async = llm_stub.handle_request_async
+    monkeypatch.setattr(llm_stub, "handle_request_async", record)
+    return timeouts
+
+
+def test_client_is_shared_within_a_loop_and_rebuilt_for_a_new_loop(stub_backend):
+    async def clients():
+        first = gpt_helper.get_client()
+        answers = await asyncio.gather(*(gpt_helper.get_gpt_response(f"질문 {index}") for index in range(5)))
+        assert all(answers)
+        return first, gpt_helper.get_client()
+
+    first, second = asyncio.run(clients())
+    assert first is second
+    third, _ = asyncio.run(clients())
+    assert third is not first
+
+    asyncio.run(gpt_helper.close_client())
+    assert gpt_helper._client is None and gpt_helper._client_loop is None
+
+
+def test_client_of_a_previous_loop_is_closed(stub_backend):
+    async def first_client():
+        await gpt_helper.get_gpt_response("질문")
+        return gpt_helper.get_client()
+
+    async def second_client():
+        client = gpt_helper.get_client()
+        # 이전 클라이언트는 새 루프에서 닫힘
+        await asyncio.sleep(0)
+        await gpt_helper.get_gpt_response("질문")
+        return client
+
+    first = asyncio.run(first_client())
+    second = asyncio.run(second_client())
+    assert first.is_closed() and not second.is_closed()
+    asyncio.run(gpt_helper.close_client())
+    assert second.is_closed()
+
+
+def test_client_of_a_loop_running_in_another_thread_is_closed_on_that_loop(stub_backend):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        first = asyncio.run_coroutine_threadsafe(get_client_async(), loop).result()
+        second = asyncio.run(get_client_async())
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), loop).result()
+        assert first.is_closed() and second is not first
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        asyncio.run(gpt_helper.close_client())
+
+
+async def get_client_async():
+    return gpt_helper.get_client()
+
+
+def test_pool_limits_and_default_timeout(monkeypatch):
+    monkeypatch.setattr(llm_backend, "LLM_PROVIDER", "openai")
+    monkeypatch.setattr(gpt_helper, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(gpt_helper, "_client", None)
+    monkeypatch.setattr(gpt_helper, "_client_loop", None)
+    monkeypatch.setattr(gpt_helper, "LLM_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(gpt_helper, "LLM_MAX_KEEPALIVE_CONNECTIONS", 3)
+
+    async def build():
+        client = gpt_helper.get_client()
+        await gpt_helper.close_client()
+        return client
+
+    http_client = asyncio.run(build())._client
+    pool = http_client._transport._pool
+    assert (pool._max_connections, pool._max_keepalive_connections) == (7, 3)
+    assert http_client.timeout == httpx.Timeout(gpt_helper.LLM_TIMEOUT, connect=gpt_helper.LLM_CONNECT_TIMEOUT)
+
+
+def test_per_call_timeout_reaches_the_transport(sent_timeouts):
+    async def ask():
+        await gpt_helper.get_gpt_response("질문")
+        await gpt_helper.get_gpt_response("질문", timeout=2.5)
+
+    asyncio.run(ask())
+    assert sent_timeouts[0]["read"] == gpt_helper.LLM_TIMEOUT
+    assert sent_timeouts[1]["read"] == 2.5
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.langchain import generator
+from app.langchain.prompt import prompts_schema
+from app.utils import gpt_helper, llm_backend, llm_stub
+from tests.scenario_generation_test import make_scenario_generation
+
+
+@pytest.fixture
+def stub_backend(monkeypatch):
+    monkeypatch.setattr(llm_backend, "LLM_PROVIDER", "stub")
+    monkeypatch.setattr(llm_backend, "LLM_BASE_URL", None)
+    monkeypatch.setattr(gpt_helper, "_client", None)
+    monkeypatch.setattr(gpt_helper, "_client_loop", None)
+    yield llm_stub.configure_stub(seed=0)
+    llm_stub.configure_stub()
+
+
+def test_batch_alibis_from_stub(stub_backend):
+    scenario_gen = make_scenario_generation()
+    result = asyncio.run(scenario_gen.generate_alibis_and_witness(mode="batch"))
+
+    alive = [npc for npc in scenario_gen.game_state["npcs"] if scenario_gen.game_state["alive"][npc["name"]]]
+    assert len(result["alibis"]) == len(alive)
+    assert all(result["alibis"].values())
+
+
+def test_malformed_batch_alibis_are_regenerated(stub_backend):
+    llm_stub.configure_stub(malformed_rate=1.0, seed=0)
+    requests_before = llm_stub.get_stub_stats()["requests"]
+    scenario_gen = make_scenario_generation()
+    result = asyncio.run(scenario_gen.generate_alibis_and_witness(mode="batch"))
+
+    # 배치 응답이 깨지면 NPC별 평문 요청으로 모두 재생성
+    assert llm_stub.get_stub_stats()["requests"] - requests_before == 1 + len(result["alibis"])
+    assert all(result["alibis"].values())
+
+
+def test_langchain_schema_payload_from_stub(stub_backend):
+    answer, tokens, execution_time = generator.generate_victim("sk-stub", "input")
+
+    assert isinstance(answer, prompts_schema.GenerateVictimSchema)
+    assert answer.alibis
+    assert tokens["totalTokens"] == tokens["promptTokens"] + tokens["completionTokens"] > 0
+
+
+def test_stub_error_and_invalid_key():
+    llm_stub.configure_stub(error_rate=1.0, error_status=429, invalid_keys=["sk-revoked"])
+    try:
+        status, payload, _ = llm_stub.route("POST", "/v1/chat/completions", {}, b"{}")
+        assert status == 429 and "error" in payload
+        status, _, _ = llm_stub.route("GET", "/v1/models", {"authorization": "Bearer sk-revoked"}, b"")
+        assert status == 401
+    finally:
+        llm_stub.configure_stub()
@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+from app.services import question_generation
+from app.services.game_management import GameManagement
+from app.services.question_generation import QuestionGeneration, FALLBACK_QUESTIONS
+from tests.conftest import CHARACTERS, MURDERER
+
+
+def make_question_generation():
+    game_management = GameManagement()
+    game_state = game_management.initialize_game("ko", CHARACTERS, MURDERER)
+    return QuestionGeneration(
+        game_state,
+        game_management.personalities,
+        game_management.features,
+        game_management.weapons,
+        game_management.places,
+        game_management.names
+    )
+
+
+def test_generate_questions_runs_concurrently_in_order(monkeypatch):
+    # 마지막 프롬프트가 가장 빨리 끝나도 결과는 프롬프트 순서를 유지해야 함
+    async def stub_gpt_response(prompt, max_tokens=100, timeout=None):
+        if "alibi" in prompt:
+            await asyncio.sleep(0.3)
+            return "alibi"
+        if "weapon" in prompt:
+            await asyncio.sleep(0.2)
+            return "weapon"
+        await asyncio.sleep(0.1)
+        return "location"
+
+    monkeypatch.setattr(question_generation, "get_gpt_response", stub_gpt_response)
+    question_gen = make_question_generation()
+
+    start = time.perf_counter()
+    questions = asyncio.run(question_gen.generate_questions("박동식", "Axe", "weapon"))
+    elapsed = time.perf_counter() - start
+
+    assert [q["question"] for q in questions] == ["alibi", "weapon", "location"]
+    assert elapsed < 0.5
+
+
+def test_generate_questions_retries_only_failed_slot(monkeypatch):
+    calls = {"alibi": 0, "weapon": 0, "location": 0}
+
+    async def stub_gpt_response(prompt, max_tokens=100, timeout=None):
+        slot = "alibi" if "alibi" in prompt else "weapon" if "weapon" in prompt else "location"
+        calls[slot] += 1
+        if slot == "weapon" and calls[slot] == 1:
+            raise TimeoutError("stub timeout")
+        return slot
+
+    monkeypatch.setattr(question_generation, "get_gpt_response", stub_gpt_response)
+    questions = asyncio.run(make_question_generation().generate_questions("박동식", "Axe", "weapon"))
+
+    assert [q["question"] for q in questions] == ["alibi", "weapon", "location"]
+    assert calls == {"alibi": 1, "weapon": 2, "location": 1}
+
+
+def test_generate_questions_returns_partial_result(monkeypatch):
+    async def stub_gpt_response(prompt, max_tokens=100, timeout=None):
+        if "weapon" in prompt:
+            raise TimeoutError("stub timeout")
+        return "ok"
+
+    monkeypatch.setattr(question_generation, "get_gpt_response", stub_gpt_response)
+    questions = asyncio.run(make_question_generation().generate_questions("박동식", "Axe", "weapon"))
+
+    assert [q["number"] for q in questions] == [1, 2, 3]
+    assert questions[0]["question"] == "ok"
+    assert questions[1]["question"] == FALLBACK_QUESTIONS["ko"][1]
+    assert questions[2]["question"] == "ok"
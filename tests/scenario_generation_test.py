@@ -0,0 +1,105 @@
+import asyncio
+import json
+import random
+import time
+
+from app.services import scenario_generation
+from app.services.game_management import GameManagement
+from app.services.scenario_generation import ScenarioGeneration
+from tests.conftest import CHARACTERS, MURDERER
+
+
+def make_scenario_generation():
+    game_management = GameManagement()
+    game_state = game_management.initialize_game("ko", CHARACTERS, MURDERER)
+    return ScenarioGeneration(
+        game_state,
+        game_management.personalities,
+        game_management.features,
+        game_management.weapons,
+        game_management.places,
+        game_management.names
+    )
+
+
+def test_generate_alibis_and_witness_concurrently(monkeypatch):
+    in_flight = {"now": 0, "max": 0}
+
+    async def stub_gpt_response(prompt, max_tokens=100, timeout=None):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(random.uniform(0.05, 0.15))
+        in_flight["now"] -= 1
+        return prompt.split("named ")[-1].split(" ")[0] if "named " in prompt else "account"
+
+    monkeypatch.setattr(scenario_generation, "get_gpt_response", stub_gpt_response)
+    scenario_gen = make_scenario_generation()
+    game_state = scenario_gen.game_state
+
+    start = time.perf_counter()
+    result = asyncio.run(scenario_gen.generate_alibis_and_witness(max_concurrency=4))
+    elapsed = time.perf_counter() - start
+
+    alive_names = [npc["name"] for npc in game_state["npcs"] if game_state["alive"][npc["name"]]]
+    expected_order = [next(n["name"]["ko"] for n in scenario_gen.names if n["id"] == name) for name in alive_names]
+
+    assert list(result["alibis"]) == expected_order
+    assert in_flight["max"] == 4
+    assert elapsed < 0.15 * len(alive_names)
+    assert game_state["witness"] == result["witness"]
+    assert result["alibis"][result["witness"]["name"]] == result["witness"]["information"]
+
+
+def test_generate_alibis_batch_regenerates_only_bad_entries(monkeypatch):
+    scenario_gen = make_scenario_generation()
+    game_state = scenario_gen.game_state
+    alive_names = [
+        next(n["name"]["ko"] for n in scenario_gen.names if n["id"] == npc["name"])
+        for npc in game_state["npcs"] if game_state["alive"][npc["name"]]
+    ]
+    missing_name, malformed_name = alive_names[0], alive_names[1]
+    prompts = []
+
+    async def stub_gpt_response(prompt, max_tokens=100, timeout=None):
+        prompts.append(prompt)
+        if '"alibis"' in prompt:
+            alibis = {name: f"batch {name}" for name in alive_names[2:]}
+            alibis[malformed_name] = {"alibi": "wrong shape"}
+            return "```json\n" + json.dumps({"alibis": alibis}, ensure_ascii=False) + "\n```"
+        return "single"
+
+    monkeypatch.setattr(scenario_generation, "get_gpt_response", stub_gpt_response)
+    result = asyncio.run(scenario_gen.generate_alibis_and_witness(mode="batch"))
+
+    assert len(prompts) == 3
+    assert list(result["alibis"]) == alive_names
+    assert result["alibis"][missing_name] == "single"
+    assert result["alibis"][malformed_name] == "single"
+    assert all(result["alibis"][name] == f"batch {name}" for name in alive_names[2:])
+    assert scenario_generation.get_alibi_generation_stats()["batch"]["regenerated"] >= 2
+
+
+def test_end_game_letters_fall_back_after_deadline(monkeypatch):
+    async def stub_gpt_response(prompt, max_tokens=100, timeout=None):
+        # 범인의 편지만 마감 시간을 넘김
+        if "murderer" in prompt:
+            await asyncio.sleep(5)
+        await asyncio.sleep(0.1)
+        return "generated"
+
+    monkeypatch.setattr(scenario_generation, "get_gpt_response", stub_gpt_response)
+    scenario_gen = make_scenario_generation()
+
+    start = time.perf_counter()
+    result = asyncio.run(scenario_gen.generate_end_game_letters("WIN", deadline=0.5))
+    elapsed = time.perf_counter() - start
+
+    survivors = [npc for npc in scenario_gen.game_state["npcs"]
+                 if scenario_gen.game_state["alive"][npc["name"]] and npc != scenario_gen.game_state["murderer"]]
+
+    assert elapsed < 1
+    assert list(result) == ["result", "chiefLetter", "murdererLetter", "survivorsLetters"]
+    assert result["chiefLetter"]["content"] == "generated\n"
+    assert result["murdererLetter"]["content"] == scenario_generation.FALLBACK_LETTERS["murderer_win"]["ko"] + "\n"
+    assert len(result["survivorsLetters"]) == len(survivors)
+    assert all(letter["letter"]["content"] == "generated\n" for letter in result["survivorsLetters"])
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+from fastapi import FastAPI
+import httpx
+
+from app.api.v1 import scenario_router
+from app.langchain import generator
+from app.langchain.prompt.prompts_schema import AlibisSchema, GenerateVictimSchema
+
+LIVING_CHARACTERS = ["김쿵야", "박동식", "짠짠영", "태근티비", "박윤주", "테오"]
+
+
+def victim_request():
+    return {
+        "gameNo": 1,
+        "secretKey": "sk-test",
+        "day": 2,
+        "murderer": "짠짠영",
+        "livingCharacters": [{"name": name, "gameNpcNo": index} for index, name in enumerate(LIVING_CHARACTERS)],
+        "previousStory": "",
+    }
+
+
+def test_secondary_options_run_two_victims_concurrently(monkeypatch):
+    # 두 체인이 동시에 실행되어야 둘 다 barrier를 통과함
+    barrier = threading.Barrier(2, timeout=5)
+    inputs = []
+
+    async def stub_check(secret_key):
+        return secret_key
+
+    def stub_generate_victim(api_key, input_data):
+        inputs.append(input_data)
+        barrier.wait()
+        information = input_data.information
+        answer = GenerateVictimSchema(
+            eyewitnessInformation=f"{information.witness}가 봤어요.",
+            dailySummary=f"{information.victim} 살해됨",
+            alibis=[AlibisSchema(name=character.name, alibi="집에 있었어요.") for character in information.livingCharacters],
+        )
+        tokens = {"totalTokens": 3, "promptTokens": 2, "completionTokens": 1}
+        return answer, tokens, 0.0
+
+    monkeypatch.setattr(scenario_router, "check_openai_api_key", stub_check)
+    monkeypatch.setattr(generator, "generate_victim", stub_generate_victim)
+
+    app = FastAPI()
+    app.include_router(scenario_router.router)
+    response = asyncio.run(post(app, "/api/v1/scenario/victim/secondary-options", victim_request()))
+
+    assert response.status_code == 200
+    body = response.json()
+    plan_a, plan_b = body["answer"]["planA"], body["answer"]["planB"]
+    # 서로 다른 피해자를 미리 골라 각 체인에 넘기고, 결과는 같은 계획 자리에 들어감
+    assert plan_a["victim"] != plan_b["victim"]
+    assert {plan_a["victim"], plan_b["victim"]} <= set(LIVING_CHARACTERS) - {"짠짠영"}
+    assert {plan_a["victim"], plan_b["victim"]} == {input_data.information.victim for input_data in inputs}
+    assert plan_a["dailySummary"] == f"{plan_a['victim']} 살해됨"
+    assert plan_b["dailySummary"] == f"{plan_b['victim']} 살해됨"
+    # plan B의 생존자 목록에는 plan A의 피해자가 없음
+    assert plan_a["victim"] not in [alibi["name"] for alibi in plan_b["alibis"]]
+    assert body["tokens"] == {"totalTokens": 6, "promptTokens": 4, "completionTokens": 2}
+
+
+def test_secondary_options_need_two_possible_victims(monkeypatch):
+    async def stub_check(secret_key):
+        return secret_key
+
+    monkeypatch.setattr(scenario_router, "check_openai_api_key", stub_check)
+    request = {**victim_request(), "livingCharacters": [{"name": "짠짠영", "gameNpcNo": 0}, {"name": "테오", "gameNpcNo": 1}]}
+
+    app = FastAPI()
+    app.include_router(scenario_router.router)
+    response = asyncio.run(post(app, "/api/v1/scenario/victim/secondary-options", request))
+    assert response.status_code == 404
+
+
+async def post(app, path, body):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(path, json=body)
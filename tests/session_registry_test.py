@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from app.services.game_service import GameService
+from app.services.session_registry import GameSession, SessionRegistry
+from tests.conftest import start_game
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_session(game_no):
+    return GameSession(game_no, None, None, None, None, None, None, None)
+
+
+def test_sessions_are_evicted_when_idle_or_over_capacity():
+    clock = FakeClock()
+    registry = SessionRegistry(idle_ttl=60, max_sessions=2, clock=clock)
+    evicted = []
+    registry.add_eviction_hook(lambda session, reason: evicted.append((session.game_no, reason)))
+
+    registry.add(make_session(1))
+    clock.now = 10
+    registry.add(make_session(2))
+    clock.now = 20
+    assert registry.get(1) is not None  # 1이 최근 사용으로 이동
+    clock.now = 30
+    registry.add(make_session(3))
+    assert evicted == [(2, "capacity")]
+
+    clock.now = 85
+    assert registry.get(1) is None
+    assert evicted[-1] == (1, "idle")
+    assert 3 in registry
+
+    assert registry.remove(3).game_no == 3
+    assert len(evicted) == 2
+    stats = registry.stats()
+    assert stats["liveSessions"] == 0
+    assert stats["evictions"] == {"idle": 1, "capacity": 1}
+    assert stats["ended"] == 1
+
+
+def test_failing_eviction_hook_does_not_break_registry():
+    clock = FakeClock()
+    registry = SessionRegistry(idle_ttl=0, max_sessions=1, clock=clock)
+    registry.add_eviction_hook(lambda session, reason: 1 / 0)
+
+    registry.add(make_session(1))
+    registry.add(make_session(2))
+
+    assert 1 not in registry and registry.get(2) is not None
+
+
+def test_game_service_rejects_unknown_game():
+    game_service = GameService(SessionRegistry(max_sessions=1))
+    with pytest.raises(ValueError):
+        game_service.get_game_status(404)
+
+
+def test_sessions_in_use_are_evicted_after_they_are_released():
+    clock = FakeClock()
+    registry = SessionRegistry(idle_ttl=60, max_sessions=2, clock=clock)
+    in_use = {1}
+    registry.set_in_use_check(in_use.__contains__)
+    evicted = []
+    registry.add_eviction_hook(lambda session, reason: evicted.append((session.game_no, reason)))
+
+    registry.add(make_session(1))
+    registry.add(make_session(2))
+    registry.add(make_session(3))
+    # 가장 오래된 1은 사용 중이므로 다음으로 오래된 2를 제거
+    assert evicted == [(2, "capacity")] and 1 in registry
+
+    clock.now = 70
+    registry.add(make_session(4))
+    assert evicted[1:] == [(3, "idle")] and 1 in registry
+
+    in_use.clear()
+    registry.evict_expired()
+    assert evicted[2:] == [(1, "idle")] and 1 not in registry
+
+
+def test_game_service_keeps_sessions_whose_game_lock_is_held():
+    game_service = GameService(SessionRegistry(max_sessions=1))
+
+    async def start_while_game_one_is_busy():
+        start_game(game_service, 1)
+        async with game_service.locks(1):
+            start_game(game_service, 2)
+            assert 1 in game_service.sessions and 2 in game_service.sessions
+        game_service.sessions.evict_expired()
+
+    asyncio.run(start_while_game_one_is_busy())
+    assert 1 not in game_service.sessions and 2 in game_service.sessions
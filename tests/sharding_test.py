@@ -0,0 +1,102 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.sharding import ShardAffinityMiddleware, ShardConfig
+from app.services.game_service import GameService
+from app.services.game_snapshot import SnapshotDirectory
+from app.utils import gpt_helper, llm_backend, llm_stub
+from app.utils.hash_ring import HashRing
+from tests.conftest import living, start_game
+
+@pytest.fixture
+def stub_backend(monkeypatch):
+    monkeypatch.setattr(llm_backend, "LLM_PROVIDER", "stub")
+    monkeypatch.setattr(llm_backend, "LLM_BASE_URL", None)
+    monkeypatch.setattr(gpt_helper, "_client", None)
+    monkeypatch.setattr(gpt_helper, "_client_loop", None)
+    yield llm_stub.configure_stub(latency="fixed:0.2", seed=0)
+    llm_stub.configure_stub()
+
+
+NODES = ["http://worker-a", "http://worker-b", "http://worker-c"]
+
+
+def test_adding_a_node_only_moves_games_to_it():
+    before = HashRing(NODES)
+    after = HashRing(NODES + ["http://worker-d"])
+    owners = [(before.node_for(game_no), after.node_for(game_no)) for game_no in range(4000)]
+
+    moved = [new for old, new in owners if old != new]
+    assert set(moved) == {"http://worker-d"}
+    assert 0.15 < len(moved) / len(owners) < 0.35
+    assert {old for old, _ in owners} == set(NODES)
+
+
+async def echo_app(scope, receive, send):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+def test_middleware_only_serves_games_owned_by_this_worker():
+    shard = ShardConfig(NODES[0], NODES)
+    own = next(game_no for game_no in range(100) if shard.owns(game_no))
+    other = next(game_no for game_no in range(100) if not shard.owns(game_no))
+    asyncio.run(check_affinity(shard, own, other))
+
+
+async def check_affinity(shard, own, other):
+    transport = httpx.ASGITransport(app=ShardAffinityMiddleware(echo_app, shard))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/v2/new-game/status", json={"gameNo": own})
+        assert response.status_code == 200 and response.json() == {"gameNo": own}
+        assert response.headers["x-game-shard"] == NODES[0]
+
+        response = await client.post("/api/v2/new-game/status", json={"gameNo": other})
+        assert response.status_code == 421
+        assert response.headers["x-game-shard"] == shard.owner(other)
+
+        response = await client.post("/api/v2/new-game/status", json={"gameNo": own}, headers={"X-Game-No": str(other)})
+        assert response.status_code == 421
+
+
+def test_handed_off_games_are_restored_by_the_new_owner(tmp_path):
+    old_owner = GameService(snapshots=SnapshotDirectory(tmp_path))
+    for game_no in range(6):
+        start_game(old_owner, game_no)
+    status = old_owner.get_game_status(3)
+
+    assert asyncio.run(old_owner.hand_off(lambda game_no: game_no % 2 == 0)) == 3
+    assert sorted(session.game_no for session in old_owner.sessions.values()) == [0, 2, 4]
+
+    new_owner = GameService(snapshots=SnapshotDirectory(tmp_path))
+    assert new_owner.get_game_status(3) == status
+
+
+def test_hand_off_waits_for_the_operation_in_flight(tmp_path, stub_backend):
+    old_owner = GameService(snapshots=SnapshotDirectory(tmp_path))
+    start_game(old_owner, 1)
+    asyncio.run(hand_off_during_next_day(old_owner))
+
+    new_owner = GameService(snapshots=SnapshotDirectory(tmp_path))
+    assert new_owner.get_game_status(1)["current_day"] == 2
+
+
+async def hand_off_during_next_day(old_owner):
+    next_day = asyncio.create_task(old_owner.proceed_to_next_day(1, living()))
+    await asyncio.sleep(0.05)
+    hand_off = asyncio.create_task(old_owner.hand_off(lambda game_no: False))
+    await asyncio.sleep(0.05)
+    # 다음 날 진행이 LLM 응답을 기다리는 동안에는 게임을 넘기지 않음
+    assert not hand_off.done() and 1 in old_owner.sessions
+
+    await next_day
+    assert await hand_off == 1
+    assert 1 not in old_owner.sessions
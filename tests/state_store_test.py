@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.game_service import GameService
+from app.utils.resp_stub import RespStubServer
+from app.utils.state_store import MemoryStateStore, StaleStateError, create_state_store
+from tests.conftest import MURDERER, start_game
+
+
+@pytest.fixture
+def resp_server():
+    server = RespStubServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = create_state_store("memory")
+    elif request.param == "sqlite":
+        store = create_state_store(f"sqlite:///{tmp_path / 'games.db'}")
+    else:
+        store = create_state_store(request.getfixturevalue("resp_server").url)
+    yield store
+    store.close()
+
+
+def test_store_compare_and_set(store):
+    assert store.version(1) is None and store.load(1) is None
+
+    assert store.save(1, b"first", 0) == 1
+    assert store.save(1, b"second", 1) == 2
+    assert store.load(1) == (2, b"second")
+
+    with pytest.raises(StaleStateError):
+        store.save(1, b"lost update", 1)
+    with pytest.raises(StaleStateError):
+        store.save(1, b"duplicate start", 0)
+    assert store.load(1) == (2, b"second")
+
+    store.delete(1)
+    assert store.version(1) is None
+
+
+def test_workers_share_games_through_the_store(store):
+    first_worker = GameService(store=store)
+    second_worker = GameService(store=store)
+    start_game(first_worker)
+
+    # 다른 워커가 저장소에서 게임을 읽어 진행
+    assert second_worker.get_game_status(1) == first_worker.get_game_status(1)
+    second_worker.new_interrogation(1, MURDERER, "Axe")
+
+    # 첫 번째 워커는 더 새로운 버전을 감지하고 다시 읽음
+    assert first_worker.get_session(1).game_state["interrogation"].suspect_name == MURDERER
+
+    # 같은 버전에서 두 워커가 동시에 변경하면 나중에 저장하는 쪽이 실패
+    first_session = first_worker.get_session(1)
+    second_worker.new_interrogation(1, "박동식", None)
+    with pytest.raises(StaleStateError):
+        first_worker.save_session(first_session)
+    assert first_worker.get_session(1).game_state["interrogation"].suspect_name == "박동식"
+
+    first_worker.remove_game(1)
+    with pytest.raises(ValueError):
+        second_worker.get_game_status(1)
+
+
+class SlowStore(MemoryStateStore):
+    # 네트워크 저장소처럼 조회마다 시간이 걸리는 저장소
+    def version(self, game_no):
+        time.sleep(0.1)
+        return super().version(game_no)
+
+
+def test_store_io_does_not_block_the_event_loop():
+    game_service = GameService(store=SlowStore())
+    start_game(game_service)
+
+    async def poll():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await game_service.run_sync(game_service.get_game_status, 1)
+        task.cancel()
+        return ticks
+
+    # 저장소를 기다리는 동안에도 다른 코루틴이 실행됨
+    assert asyncio.run(poll()) >= 5
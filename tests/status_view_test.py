@@ -0,0 +1,164 @@
+import asyncio
+
+from fastapi import FastAPI
+import httpx
+
+from app.api.v2 import new_game_router
+from app.services.game_service import GameService
+from app.services.session_registry import SessionRegistry
+from app.services.status_view import etag_matches
+from tests.conftest import MURDERER, start_game
+
+
+def test_cached_status_matches_the_full_rebuild():
+    game_service = GameService(SessionRegistry())
+    for language in ("ko", "en"):
+        start_game(game_service, 1, language)
+        session = game_service.get_session(1)
+        game_state = session.game_state
+        game_state["alibis"] = {status["name"]: "집에 있었어요." for status in game_service.get_game_status(1)["suspects"][:3]}
+        game_state["witness"] = {"name": "테오", "information": "봤어요."}
+        game_state.set_alive(game_state.npcs[4]["name"], False)
+        game_service.save_session(session, "generate_alibis_and_witness")
+
+        status = dict(game_service.get_game_status(1))
+        assert status.pop("statusVersion") == game_state.status_version
+        expected = session.game_management.get_game_status()
+        expected["alive"] = dict(expected["alive"])
+        assert status == expected
+
+
+def test_status_is_rebuilt_only_when_its_version_changes():
+    game_service = GameService(SessionRegistry())
+    start_game(game_service)
+    session = game_service.get_session(1)
+    version = session.game_state.status_version
+    status = game_service.get_game_status(1)
+
+    session.game_state["current_questions"] = ["질문"]
+    game_service.save_session(session, "generate_questions")
+    assert game_service.get_game_status(1) is status
+
+    session.game_state["current_day"] = 2
+    game_service.save_session(session, "proceed_to_next_day")
+    assert session.game_state.status_version == version + 1
+    assert game_service.get_game_status(1)["current_day"] == 2
+
+    # 같은 gameNo로 다시 시작해도 버전은 줄어들지 않음
+    start_game(game_service)
+    assert game_service.get_session(1).game_state.status_version > version + 1
+
+
+def test_status_route_returns_304_until_the_game_changes():
+    app = FastAPI()
+    app.include_router(new_game_router.router)
+    app.state.game_service = game_service = GameService(SessionRegistry())
+    start_game(game_service)
+    asyncio.run(check_etags(app, game_service))
+
+
+async def check_etags(app, game_service):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/v2/new-game/status", json={"gameNo": 1})
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert response.json()["statusVersion"] == game_service.get_session(1).game_state.status_version
+
+        response = await client.post("/api/v2/new-game/status", json={"gameNo": 1}, headers={"If-None-Match": etag})
+        assert response.status_code == 304 and response.content == b""
+
+        session = game_service.get_session(1)
+        session.game_state["alibis"] = {MURDERER: "집에 있었어요."}
+        game_service.save_session(session, "generate_alibis_and_witness")
+        response = await client.post("/api/v2/new-game/status", json={"gameNo": 1}, headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.headers["etag"] != etag
+        assert "집에 있었어요." in [suspect["alibi"] for suspect in response.json()["suspects"]]
+
+        response = await client.post("/api/v2/new-game/status", json={"gameNo": 404})
+        assert response.status_code == 400
+
+
+def test_if_none_match_accepts_lists_and_weak_etags():
+    assert etag_matches('"1-ko-5", W/"1-ko-6"', '"1-ko-6"')
+    assert etag_matches("*", '"1-ko-6"')
+    assert not etag_matches('"1-ko-5"', '"1-ko-6"')
+    assert not etag_matches(None, '"1-ko-6"')
+
+
+def kill(game_service, session, npc_id, day):
+    game_state = session.game_state
+    game_state.set_alive(npc_id, False)
+    game_state["murdered_npcs"].append({"name": npc_id, "day": day})
+    game_state["current_day"] = day
+    game_service.save_session(session, "proceed_to_next_day")
+
+
+# 아직 살아 있는 범인 외의 NPC (게임 시작 시 무작위로 고른 첫 피해자는 제외)
+def living_victim(session):
+    murderer = session.game_state.murderer
+    return next(npc for npc in session.resolver.living_npcs() if npc is not murderer)["name"]
+
+
+def test_changes_since_a_version_contain_only_what_changed():
+    game_service = GameService(SessionRegistry())
+    start_game(game_service)
+    session = game_service.get_session(1)
+    since = session.game_state.status_version
+    victim = living_victim(session)
+
+    kill(game_service, session, victim, 2)
+    session.game_state["alibis"] = {MURDERER: "집에 있었어요."}
+    session.game_state["witness"] = {"name": "테오", "information": "봤어요."}
+    game_service.save_session(session, "generate_alibis_and_witness")
+
+    result = game_service.get_status_changes(1, since)
+    assert result == {
+        "statusVersion": since + 2,
+        "full": False,
+        "changes": {
+            "current_day": 2,
+            "alive": {victim: False},
+            "murdered_npcs": [{"name": victim, "day": 2}],
+            "alibis": {MURDERER: "집에 있었어요."},
+            "witness": "테오",
+            "eyewitnessInformation": "봤어요.",
+        },
+    }
+    assert game_service.get_status_changes(1, since + 1)["changes"].keys() == {"alibis", "witness", "eyewitnessInformation"}
+    assert game_service.get_status_changes(1, since + 2)["changes"] == {}
+
+
+def test_versions_outside_the_change_log_get_the_full_status():
+    game_service = GameService(SessionRegistry())
+    start_game(game_service)
+    session = game_service.get_session(1)
+    since = session.game_state.status_version
+    for day in range(2, 2 + 70):
+        kill(game_service, session, session.game_state.npcs[day % 9]["name"], day)
+
+    assert game_service.get_status_changes(1, since)["full"] is True
+    assert game_service.get_status_changes(1, since + 69)["full"] is False
+    assert game_service.get_status_changes(1, 0)["status"] == game_service.get_game_status(1)
+    assert game_service.get_status_changes(1, since + 1000)["full"] is True
+
+
+def test_status_changes_route():
+    app = FastAPI()
+    app.include_router(new_game_router.router)
+    app.state.game_service = game_service = GameService(SessionRegistry())
+    start_game(game_service)
+    asyncio.run(check_changes(app, game_service))
+
+
+async def check_changes(app, game_service):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        since = (await client.post("/api/v2/new-game/status", json={"gameNo": 1})).json()["statusVersion"]
+        session = game_service.get_session(1)
+        kill(game_service, session, living_victim(session), 2)
+
+        response = await client.post(f"/api/v2/new-game/status/changes?since={since}", json={"gameNo": 1})
+        assert response.status_code == 200
+        assert response.json()["changes"]["murdered_npcs"][-1]["day"] == 2
+        assert len(response.content) < len((await client.post("/api/v2/new-game/status", json={"gameNo": 1})).content) / 10
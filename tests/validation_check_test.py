@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+from app.lib import validation_check
+
+
+def check(api_key):
+    return asyncio.run(validation_check.check_openai_api_key(api_key))
+
+
+def test_check_openai_api_key_caches_and_coalesces(monkeypatch):
+    calls = []
+
+    def stub_validate(api_key):
+        calls.append(api_key)
+        time.sleep(0.1)
+        return api_key == "sk-valid"
+
+    monkeypatch.setattr(validation_check, "validate_openai_api_key", stub_validate)
+    validation_check.clear_key_validation_cache()
+
+    async def check_concurrently():
+        return await asyncio.gather(*(validation_check.check_openai_api_key("sk-valid") for _ in range(10)))
+
+    # 같은 루프에서 동시에 들어온 요청은 한 번의 검증 결과를 함께 기다림
+    assert asyncio.run(check_concurrently()) == ["sk-valid"] * 10
+    assert calls == ["sk-valid"]
+    assert all("sk-valid" not in key for key in validation_check._validation_cache)
+
+    assert check("sk-invalid") is None
+    assert check("sk-invalid") is None
+    assert calls == ["sk-valid", "sk-invalid"]
+
+    validation_check.invalidate_openai_api_key("sk-valid")
+    assert check("sk-valid") == "sk-valid"
+    assert calls == ["sk-valid", "sk-invalid", "sk-valid"]
+
+
+def test_check_openai_api_key_negative_ttl_expires(monkeypatch):
+    calls = []
+
+    def stub_validate(api_key):
+        calls.append(api_key)
+        return False
+
+    monkeypatch.setattr(validation_check, "validate_openai_api_key", stub_validate)
+    monkeypatch.setattr(validation_check, "KEY_VALIDATION_NEGATIVE_TTL", 0.05)
+    validation_check.clear_key_validation_cache()
+
+    assert check("sk-revoked") is None
+    assert check("sk-revoked") is None
+    time.sleep(0.06)
+    assert check("sk-revoked") is None
+    assert len(calls) == 2
+
+
+def test_waiters_share_a_failed_validation(monkeypatch):
+    calls = []
+
+    def stub_validate(api_key):
+        calls.append(api_key)
+        time.sleep(0.05)
+        raise RuntimeError("OpenAI is down")
+
+    monkeypatch.setattr(validation_check, "validate_openai_api_key", stub_validate)
+    validation_check.clear_key_validation_cache()
+
+    async def check_concurrently():
+        return await asyncio.gather(*(validation_check.check_openai_api_key("sk-failing") for _ in range(3)), return_exceptions=True)
+
+    # 기다리던 요청도 "잘못된 키"(None)가 아니라 같은 오류를 받고, 결과는 캐시하지 않음
+    results = asyncio.run(check_concurrently())
+    assert [str(result) for result in results] == ["OpenAI is down"] * 3
+    assert calls == ["sk-failing"]
+    assert not validation_check._validation_cache and not validation_check._validation_in_flight
+
+
+def test_waiters_validate_again_when_the_leading_request_is_cancelled(monkeypatch):
+    calls = []
+
+    def stub_validate(api_key):
+        calls.append(api_key)
+        time.sleep(0.05)
+        return True
+
+    monkeypatch.setattr(validation_check, "validate_openai_api_key", stub_validate)
+    validation_check.clear_key_validation_cache()
+
+    async def cancel_leader():
+        leader = asyncio.create_task(validation_check.check_openai_api_key("sk-valid"))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(validation_check.check_openai_api_key("sk-valid"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await waiter, leader.cancelled()
+
+    assert asyncio.run(cancel_leader()) == ("sk-valid", True)
+    assert calls == ["sk-valid", "sk-valid"]